@@ -0,0 +1,38 @@
+"""Covering indexes for lookup of toolkit_trafficlightsobjects by number and ip_adress
+
+Revision ID: 2f6c1d9a4b10
+Revises:
+Create Date: 2026-10-18 12:00:00.000000
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+
+
+revision: str = '2f6c1d9a4b10'
+down_revision: Union[str, None] = None
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    op.create_index(
+        'ix_toolkit_trafficlightsobjects_number',
+        'toolkit_trafficlightsobjects',
+        ['number'],
+        postgresql_include=['ip_adress', 'type_controller', 'address', 'description'],
+        if_not_exists=True
+    )
+    op.create_index(
+        'ix_toolkit_trafficlightsobjects_ip_adress',
+        'toolkit_trafficlightsobjects',
+        ['ip_adress'],
+        postgresql_include=['number', 'type_controller', 'address', 'description'],
+        if_not_exists=True
+    )
+
+
+def downgrade() -> None:
+    op.drop_index('ix_toolkit_trafficlightsobjects_ip_adress', 'toolkit_trafficlightsobjects', if_exists=True)
+    op.drop_index('ix_toolkit_trafficlightsobjects_number', 'toolkit_trafficlightsobjects', if_exists=True)
@@ -2,7 +2,9 @@ from fastapi import APIRouter
 
 from core.settings import settings
 from .controller_management.views import router as intersections_router
+from .conflicts.views import router as conflicts_router
 
 router = APIRouter()
 # router.include_router(router=intersections_router, prefix='/traffic-lights')
 router.include_router(router=intersections_router, prefix=settings.traffic_lights_prefix)
+router.include_router(router=conflicts_router, prefix=settings.conflicts_prefix)
@@ -0,0 +1,45 @@
+from typing import Annotated, Literal
+
+from annotated_types import MaxLen, MinLen
+from pydantic import BaseModel, field_validator
+
+from core.settings import settings
+from sdp_lib.conflicts.batch import ConflictsJob
+from sdp_lib.management_controllers.constants import AllowedControllers
+
+
+class ConflictsJobFields(BaseModel):
+    stages: Annotated[dict[str, str], MinLen(1)]
+    path_to_src_config: str | None = None
+    type_controller: Literal[AllowedControllers.SWARCO, AllowedControllers.PEEK] | None = None
+
+    @field_validator('path_to_src_config', mode='after')
+    @classmethod
+    def resolve_path_to_src_config(cls, path_to_src_config: str | None) -> str | None:
+        """
+        Разрешает путь к исходному конфигу относительно settings.conflicts_batch.configs_dir.
+        Пути вне каталога configs_dir(абсолютные, с '..', через симлинки) не допускаются.
+        :param path_to_src_config: Путь к исходному конфигу из задания.
+        :return: Абсолютный путь к исходному конфигу.
+        """
+        if path_to_src_config is None:
+            return None
+        configs_dir = settings.conflicts_batch.configs_dir.resolve()
+        path = (configs_dir / path_to_src_config).resolve()
+        if not path.is_relative_to(configs_dir):
+            raise ValueError(f'Путь к исходному конфигу должен находиться в каталоге {configs_dir}')
+        return str(path)
+
+    def get_job(self) -> ConflictsJob:
+        return ConflictsJob(
+            stages=self.stages,
+            path_to_src_config=self.path_to_src_config,
+            type_controller=None if self.type_controller is None else str(self.type_controller)
+        )
+
+
+class FieldsConflictsBatch(BaseModel):
+    jobs: Annotated[list[ConflictsJobFields], MinLen(1), MaxLen(settings.conflicts_batch.max_jobs)]
+
+    def get_jobs(self) -> list[ConflictsJob]:
+        return [job.get_job() for job in self.jobs]
@@ -0,0 +1,32 @@
+from fastapi import APIRouter
+from fastapi.responses import StreamingResponse
+
+from api_v1.conflicts.schemas import FieldsConflictsBatch
+from api_v1.streaming import StreamFormat, encode_stream, stream_media_types
+from core.settings import settings
+from sdp_lib.conflicts.batch import ConflictsBatch
+
+
+router = APIRouter()
+
+conflicts_batch = ConflictsBatch(
+    max_workers=settings.conflicts_batch.max_workers,
+    results_cache_dir=settings.conflicts_batch.results_cache_dir
+)
+
+
+@router.post('/batch', tags=[settings.conflicts_tag])
+async def calculate_conflicts_batch(
+        data: FieldsConflictsBatch,
+        stream_format: StreamFormat = StreamFormat.ndjson
+) -> StreamingResponse:
+    """
+    Расчёт конфликтов и формирование конфигов .PTC2/.DAT для списка заданий.
+    Задания выполняются в пуле процессов, результат каждого задания
+    (ошибки, путь к созданному конфигу) отправляется по мере выполнения.
+    path_to_src_config заданий - путь относительно каталога settings.conflicts_batch.configs_dir.
+    """
+    return StreamingResponse(
+        encode_stream(conflicts_batch.run_async(data.get_jobs()), stream_format),
+        media_type=stream_media_types[stream_format]
+    )
@@ -6,10 +6,12 @@ from typing import Any, TypeVar, Type
 from sqlalchemy.ext.asyncio import AsyncSession
 
 from core.models import db_helper, TrafficLightsObjects
-from sqlalchemy import select, or_, Select
+from sqlalchemy import select, or_, any_, bindparam, Select, Text
+from sqlalchemy.dialects.postgresql import ARRAY
 from sqlalchemy.engine.row import RowMapping
 
 from api_v1.controller_management.checkers.checkers import AfterSearchInDbChecker
+from api_v1.controller_management.crud.registry import HostsRegistry, hosts_registry
 from api_v1.controller_management.host_entity import BaseDataHosts
 from api_v1.controller_management.schemas import (
     TrafficLightsObjectsTableFields,
@@ -34,6 +36,18 @@ async def search_hosts_base_properties(query) -> list[RowMapping]:
         result = await conn.execute(query)
         return result.mappings().all()
 
+async def get_all_hosts_for_polling() -> list[RowMapping]:
+    """
+    Осуществляет запрос всех хостов из БД для фонового опроса состояний.
+    :return: list с найденными записями RowMapping.
+    """
+    query = select(
+        TrafficLightsObjects.number,
+        TrafficLightsObjects.ip_adress,
+        TrafficLightsObjects.type_controller
+    )
+    return await search_hosts_base_properties(query)
+
 async def get_controller_management_options(session: AsyncSession):
     columns = (
         ControllerManagementOptions.type_controller,
@@ -82,15 +96,21 @@ class SearchHostsByIpOrNumQuery:
     ) -> Select[tuple[TrafficLightsObjects]]:
         """
         Формирует сущность запроса поиска записей в БД для каждого хоста из hosts.
+        Запрос имеет одинаковый вид для любого количества хостов:
+        WHERE number = ANY($1::TEXT[]) OR ip_adress = ANY($2::TEXT[]),
+        что позволяет asyncpg использовать кэш подготовленных выражений.
         :param hosts_models: Список вида с объектами моделей, в которых содержаться
                               данные для поиска. Например:
                               [BaseSearchHostsInDb(ip_or_name_from_user='10.45.154.16',
                               search_in_db_field='ip_adress'), BaseSearchHostsInDb(ip_or_name_from_user='3245']
         :return: Select[tuple[TrafficLightsObjects]]
         """
+        values = {field: [] for field in self.matches}
+        for ip_or_name_from_user, data_hots in hosts_models.items():
+            values[data_hots.search_in_db_field].append(ip_or_name_from_user)
         query = (
-            self.matches.get(data_hots.search_in_db_field) == ip_or_name_from_user
-            for ip_or_name_from_user, data_hots in hosts_models.items()
+            column == any_(bindparam(f'{field}_values', values[field], type_=ARRAY(Text)))
+            for field, column in self.matches.items()
         )
         if self.all_columns:
             return select(TrafficLightsObjects).where(or_(*query))
@@ -117,6 +137,7 @@ class SearchHostsByIpOrNumQuery:
 class SearchDb:
 
     search_in_db_class = SearchHostsByIpOrNumQuery
+    registry: HostsRegistry = hosts_registry
 
     def __init__(self, src_data: BaseFieldsSearchInDb):
         # super().__init__(src_data)
@@ -176,10 +197,29 @@ class SearchDb:
         self._processed_hosts_data[key].db_records.append(found_record)
         return key
 
+    def _search_hosts_in_registry(self) -> dict[str, SearchinDbFields]:
+        """
+        Добавляет в db_records записи хостов, найденные в реестре хостов.
+        :return: Словарь хостов, которые не найдены в реестре и должны быть найдены в БД.
+        """
+        if not self.registry.loaded:
+            return self._processed_hosts_data
+        hosts_for_search_in_db = {}
+        for ip_or_name, data_host in self._processed_hosts_data.items():
+            records = self.registry.find(ip_or_name, data_host.search_in_db_field)
+            if records:
+                data_host.db_records.extend(records)
+            else:
+                hosts_for_search_in_db[ip_or_name] = data_host
+        return hosts_for_search_in_db
+
     async def search_hosts_and_processing(self):
-        self._hosts_after_search = await search_hosts_base_properties(
-            self.db.get_query_where(self._processed_hosts_data)
-        )
+        hosts_for_search_in_db = self._search_hosts_in_registry()
+        self._hosts_after_search = []
+        if hosts_for_search_in_db:
+            self._hosts_after_search = await search_hosts_base_properties(
+                self.db.get_query_where(hosts_for_search_in_db)
+            )
         self._process_data_hosts_after_request()
         print(f'self.hosts_data: {self._processed_hosts_data}')
         return self._processed_hosts_data
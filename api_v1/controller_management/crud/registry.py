@@ -0,0 +1,130 @@
+import asyncio
+import logging
+from datetime import datetime
+from typing import Any
+
+from sqlalchemy import select, func
+
+from api_v1.controller_management.schemas import TrafficLightsObjectsTableFields
+from core.models import db_helper, TrafficLightsObjects
+from core.settings import settings
+
+
+logger = logging.getLogger(__name__)
+
+
+class HostsRegistry:
+    """
+    Копия таблицы toolkit_trafficlightsobjects в памяти с индексами по номеру
+    и ip_adress. Таблица перечитывается целиком только при изменении водяного знака
+    (max(time_update), count(*)), который проверяется с периодичностью refresh_interval.
+    """
+
+    def __init__(self, *, refresh_interval: float):
+        self._refresh_interval = refresh_interval
+        self._by_number: dict[str, list[dict[str, Any]]] = {}
+        self._by_ip: dict[str, list[dict[str, Any]]] = {}
+        self._watermark: tuple[datetime | None, int] | None = None
+        self._task: asyncio.Task | None = None
+
+    def __len__(self):
+        return sum(len(records) for records in self._by_number.values())
+
+    @property
+    def loaded(self) -> bool:
+        return self._watermark is not None
+
+    @property
+    def columns(self) -> tuple:
+        return (
+            TrafficLightsObjects.number,
+            TrafficLightsObjects.ip_adress,
+            TrafficLightsObjects.type_controller,
+            TrafficLightsObjects.address,
+            TrafficLightsObjects.description
+        )
+
+    @property
+    def matches(self) -> dict[str, dict[str, list[dict[str, Any]]]]:
+        return {
+            TrafficLightsObjectsTableFields.NUMBER: self._by_number,
+            TrafficLightsObjectsTableFields.IP_ADDRESS: self._by_ip,
+        }
+
+    async def _get_watermark(self, conn) -> tuple[datetime | None, int]:
+        result = await conn.execute(
+            select(func.max(TrafficLightsObjects.time_update), func.count())
+        )
+        return tuple(result.one())
+
+    async def load(self) -> None:
+        """
+        Загружает все записи таблицы и перестраивает индексы.
+        """
+        async with db_helper.engine.connect() as conn:
+            watermark = await self._get_watermark(conn)
+            records = (await conn.execute(select(*self.columns))).mappings().all()
+        by_number, by_ip = {}, {}
+        for record in records:
+            record = dict(record)
+            number = record[TrafficLightsObjectsTableFields.NUMBER]
+            ip = record[TrafficLightsObjectsTableFields.IP_ADDRESS]
+            if number is not None:
+                by_number.setdefault(str(number), []).append(record)
+            if ip is not None:
+                by_ip.setdefault(ip, []).append(record)
+        self._by_number, self._by_ip, self._watermark = by_number, by_ip, watermark
+        logger.debug(f'Реестр хостов загружен, записей: {len(records)}')
+
+    async def refresh(self) -> bool:
+        """
+        Перечитывает таблицу, если водяной знак изменился.
+        :return: True, если реестр был перезагружен, иначе False.
+        """
+        async with db_helper.engine.connect() as conn:
+            watermark = await self._get_watermark(conn)
+        if watermark == self._watermark:
+            return False
+        await self.load()
+        return True
+
+    def find(self, ip_or_name: str, search_in_db_field: str) -> list[dict[str, Any]]:
+        """
+        Ищет записи хоста в реестре.
+        :param ip_or_name: ipv4 или номер дк.
+        :param search_in_db_field: Поле поиска(number или ip_adress).
+        :return: Список копий найденных записей. Пустой список, если записей нет.
+        """
+        return [dict(record) for record in self.matches[search_in_db_field].get(ip_or_name, [])]
+
+    def get_all_records(self) -> list[dict[str, Any]]:
+        """
+        Возвращает копии всех записей реестра.
+        """
+        return [dict(record) for records in self._by_number.values() for record in records]
+
+    async def _run(self) -> None:
+        while True:
+            await asyncio.sleep(self._refresh_interval)
+            try:
+                await self.refresh()
+            except Exception as exc:
+                logger.exception(f'Ошибка обновления реестра хостов: {exc}')
+
+    def start(self) -> asyncio.Task:
+        if self._task is None or self._task.done():
+            self._task = asyncio.create_task(self._run(), name='hosts_registry')
+        return self._task
+
+    async def stop(self) -> None:
+        if self._task is None:
+            return
+        self._task.cancel()
+        try:
+            await self._task
+        except asyncio.CancelledError:
+            pass
+        self._task = None
+
+
+hosts_registry = HostsRegistry(refresh_interval=settings.hosts_registry.refresh_interval)
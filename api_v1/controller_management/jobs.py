@@ -0,0 +1,212 @@
+import asyncio
+import logging
+import time
+import uuid
+
+import aiohttp
+
+from api_v1.controller_management import services
+from api_v1.controller_management.available_services import AllowedManagementSources
+from api_v1.controller_management.schemas import (
+    AllowedControllers,
+    FieldsManagementBatch,
+    JobStatus,
+    ManagementFields,
+    ResponseBatchJob
+)
+from core.settings import settings
+from sdp_lib.management_controllers.fields_names import FieldsNames
+
+
+logger = logging.getLogger(__name__)
+
+
+class ManagementBatch(services.Management):
+    """
+    Отправка команд большому количеству хостов с ограничением количества
+    одновременных запросов для каждого протокола(snmp, http, ssh).
+    Ошибка запроса к одному хосту не прерывает отправку команд остальным хостам.
+    """
+
+    def __init__(
+            self,
+            *,
+            income_data,
+            search_in_db: bool,
+            session: aiohttp.ClientSession = None,
+            semaphores: dict[str, asyncio.Semaphore]
+    ):
+        super().__init__(income_data=income_data, search_in_db=search_in_db, session=session)
+        self._semaphores = semaphores
+        # Количество хостов, которым отправляются команды. None - хосты ещё не проверены
+        self.dispatched: int | None = None
+        self.completed = 0
+
+    @staticmethod
+    def get_protocol(data_host: ManagementFields) -> str:
+        """
+        Возвращает протокол, по которому будет отправлена команда хосту.
+        """
+        match (data_host.type_controller, data_host.source):
+            case (AllowedControllers.SWARCO, AllowedManagementSources.man):
+                return str(FieldsNames.protocol_ssh)
+            case (AllowedControllers.PEEK, None):
+                return str(FieldsNames.protocol_http)
+        return str(FieldsNames.protocol_snmp)
+
+    async def _request(self, ip_v4: str, data_host: ManagementFields) -> None:
+        try:
+            async with self._semaphores[self.get_protocol(data_host)]:
+                instance = await self.get_coro(ip_v4, data_host)
+            self.add_response_to_data_host(ip_v4, instance)
+        except Exception as exc:
+            logger.exception(f'Ошибка отправки команды {ip_v4}: {exc}')
+            data_host.response = {str(FieldsNames.errors): [str(exc)]}
+        finally:
+            self.completed += 1
+
+    async def _create_tasks(self, hosts_for_request: dict) -> None:
+        async with asyncio.TaskGroup() as tg:
+            self.result_tasks = [
+                tg.create_task(self._request(ip_v4, data_host), name=ip_v4)
+                for ip_v4, data_host in hosts_for_request.items()
+            ]
+
+    async def _make_request(self):
+        hosts_for_request = self._get_hosts_for_request()
+        self.dispatched = len(hosts_for_request)
+        if self._session is None:
+            async with aiohttp.ClientSession() as self._session:
+                await self._create_tasks(hosts_for_request)
+        else:
+            await self._create_tasks(hosts_for_request)
+        return self.result_tasks
+
+    def add_response_to_data_hosts(self):
+        """ Ответы добавляются по мере выполнения запросов в _request. """
+
+
+class ManagementJob:
+    """
+    Задание на отправку команд хостам из FieldsManagementBatch.
+    """
+
+    def __init__(self, data: FieldsManagementBatch, management: ManagementBatch):
+        self.job_id = uuid.uuid4().hex
+        self.status = JobStatus.pending
+        self._hosts_count = len(data.hosts)
+        self.management = management
+        self.start_time = time.time()
+        self.finish_time: float | None = None
+        self.task: asyncio.Task | None = None
+
+    @property
+    def total(self) -> int:
+        """
+        Количество хостов задания. После проверки хостов - количество хостов,
+        которым отправляются команды: хосты, отклонённые при проверке или
+        поиске в БД, не учитываются, иначе completed никогда не достигнет total.
+        """
+        if self.management.dispatched is None:
+            return self._hosts_count
+        return self.management.dispatched
+
+    @property
+    def completed(self) -> int:
+        return self.management.completed
+
+    async def run(self) -> None:
+        self.status = JobStatus.running
+        try:
+            await self.management.compose_request()
+            self.status = JobStatus.done
+        except Exception as exc:
+            logger.exception(f'Ошибка выполнения задания {self.job_id}: {exc}')
+            self.status = JobStatus.failed
+        finally:
+            self.finish_time = time.time()
+
+    def get_results(self) -> dict | None:
+        if self.management.allowed_to_request_hosts is None:
+            return None
+        return self.management.get_all_hosts_as_dict()
+
+    def get_response_as_model(self, with_results: bool = True) -> ResponseBatchJob:
+        return ResponseBatchJob(
+            job_id=self.job_id,
+            status=self.status,
+            total=self.total,
+            completed=self.completed,
+            time_execution=(self.finish_time or time.time()) - self.start_time,
+            results=self.get_results() if with_results else None
+        )
+
+
+class ManagementJobs:
+    """
+    Реестр заданий пакетной отправки команд. Ограничения количества одновременных
+    запросов по протоколам общие для всех заданий. Завершённые задания удаляются
+    из реестра через jobs_ttl секунд после завершения.
+    """
+
+    def __init__(
+            self,
+            *,
+            snmp_concurrency: int,
+            http_concurrency: int,
+            ssh_concurrency: int,
+            jobs_ttl: float
+    ):
+        self._semaphores = {
+            str(FieldsNames.protocol_snmp): asyncio.Semaphore(snmp_concurrency),
+            str(FieldsNames.protocol_http): asyncio.Semaphore(http_concurrency),
+            str(FieldsNames.protocol_ssh): asyncio.Semaphore(ssh_concurrency),
+        }
+        self._jobs_ttl = jobs_ttl
+        self._jobs: dict[str, ManagementJob] = {}
+
+    def __len__(self):
+        return len(self._jobs)
+
+    def _remove_expired_jobs(self) -> None:
+        now = time.time()
+        for job_id, job in list(self._jobs.items()):
+            if job.finish_time is not None and now - job.finish_time >= self._jobs_ttl:
+                del self._jobs[job_id]
+
+    def _schedule_removal(self, task: asyncio.Task) -> None:
+        """
+        Планирует удаление завершённого задания из реестра через jobs_ttl секунд.
+        """
+        asyncio.get_running_loop().call_later(self._jobs_ttl, self._remove_expired_jobs)
+
+    def create(self, data: FieldsManagementBatch, session: aiohttp.ClientSession = None) -> ManagementJob:
+        """
+        Создаёт задание и запускает его в отдельной задаче.
+        :param data: Хосты и команды.
+        :param session: Http сессия для запросов к Peek.
+        :return: Созданное задание.
+        """
+        self._remove_expired_jobs()
+        job = ManagementJob(
+            data,
+            ManagementBatch(income_data=data, search_in_db=False, session=session, semaphores=self._semaphores)
+        )
+        job.task = asyncio.create_task(job.run(), name=f'management_job_{job.job_id}')
+        job.task.add_done_callback(self._schedule_removal)
+        self._jobs[job.job_id] = job
+        return job
+
+    def get(self, job_id: str) -> ManagementJob | None:
+        self._remove_expired_jobs()
+        return self._jobs.get(job_id)
+
+    async def close(self) -> None:
+        for job in self._jobs.values():
+            if job.task is not None and not job.task.done():
+                job.task.cancel()
+        await asyncio.gather(*(job.task for job in self._jobs.values() if job.task), return_exceptions=True)
+        self._jobs.clear()
+
+
+management_jobs = ManagementJobs(**settings.management_batch.model_dump())
@@ -0,0 +1,119 @@
+import asyncio
+import logging
+import time
+
+import aiohttp
+
+from api_v1.controller_management import services
+from api_v1.controller_management.crud import crud
+from api_v1.controller_management.crud.registry import hosts_registry
+from api_v1.controller_management.schemas import (
+    AllowedDataHostFields,
+    BaseFields,
+    TrafficLightsObjectsTableFields
+)
+from core.cache import StatesCache
+from core.shared import STATES_CACHE
+from sdp_lib.management_controllers.snmp.snmp_api import BulkSnmpSweeper
+
+
+logger = logging.getLogger(__name__)
+
+
+class StatesPoller:
+    """
+    Фоновый опрос состояний всех дк из toolkit_trafficlightsobjects.
+    С периодичностью interval опрашивает все хосты из БД и складывает
+    response_as_dict каждого хоста в кэш состояний. Snmp хосты опрашиваются
+    не более чем snmp_concurrency одновременно и не чаще subnet_rate запросов
+    в секунду к одной подсети /24.
+    """
+
+    def __init__(
+            self,
+            *,
+            interval: float,
+            session: aiohttp.ClientSession = None,
+            cache: StatesCache = STATES_CACHE,
+            snmp_concurrency: int = 100,
+            subnet_rate: float = 20
+    ):
+        self._interval = interval
+        self._session = session
+        self._cache = cache
+        # Один экземпляр на все опросы: ограничение частоты запросов к подсети
+        # учитывает запросы предыдущего опроса
+        self._sweeper = BulkSnmpSweeper(
+            engine=services.Controllers.snmp_engine,
+            max_concurrent=snmp_concurrency,
+            subnet_rate=subnet_rate
+        )
+        self._task: asyncio.Task | None = None
+        self.last_sweep_time: float | None = None
+
+    @property
+    def is_running(self) -> bool:
+        return self._task is not None and not self._task.done()
+
+    async def get_hosts(self) -> dict[str, BaseFields]:
+        """
+        Получает все хосты из реестра хостов, если он загружен, иначе из БД.
+        :return: Словарь вида {ipv4: BaseFields}.
+        """
+        if hosts_registry.loaded:
+            records = hosts_registry.get_all_records()
+        else:
+            records = await crud.get_all_hosts_for_polling()
+        hosts = {}
+        for record in records:
+            ip = record[TrafficLightsObjectsTableFields.IP_ADDRESS]
+            if not ip:
+                continue
+            hosts[ip] = BaseFields(**(dict(record) | {str(AllowedDataHostFields.errors): []}))
+        return hosts
+
+    async def sweep(self) -> None:
+        """
+        Опрашивает все хосты из БД и обновляет кэш состояний.
+        """
+        start_time = time.time()
+        states = services.StatesPolling(
+            income_data=await self.get_hosts(),
+            search_in_db=False,
+            session=self._session,
+            cache=self._cache,
+            sweeper=self._sweeper
+        )
+        await states.compose_request()
+        self.last_sweep_time = time.time() - start_time
+        logger.debug(f'Опрос состояний дк завершён за {self.last_sweep_time:.3f} c, в кэше: {len(self._cache)}')
+
+    async def _run(self) -> None:
+        while True:
+            start_time = time.time()
+            try:
+                await self.sweep()
+            except Exception as exc:
+                logger.exception(f'Ошибка фонового опроса состояний дк: {exc}')
+            await asyncio.sleep(max(self._interval - (time.time() - start_time), 0))
+
+    def start(self) -> asyncio.Task:
+        """
+        Запускает фоновый опрос в отдельной задаче.
+        """
+        if not self.is_running:
+            self._task = asyncio.create_task(self._run(), name='states_poller')
+        return self._task
+
+    async def stop(self) -> None:
+        """
+        Останавливает фоновый опрос.
+        """
+        if self._task is None:
+            return
+        self._task.cancel()
+        try:
+            await self._task
+        except asyncio.CancelledError:
+            pass
+        self._task = None
@@ -13,6 +13,7 @@ from pydantic import (
 from pydantic_core import ValidationError
 
 from api_v1.controller_management.available_services import AllowedManagementSources, AllowedManagementEntity
+from api_v1.streaming import StreamFormat
 from sdp_lib.management_controllers.constants import AllowedControllers
 
 # class AllowedControllers(StrEnum):
@@ -48,6 +49,13 @@ class AllowedProtocolsRequest(StrEnum):
     AUTO = 'auto'
 
 
+class JobStatus(StrEnum):
+    pending = 'pending'
+    running = 'running'
+    done = 'done'
+    failed = 'failed'
+
+
 class AllowedDataHostFields(StrEnum):
     errors = 'errors'
     host_id = 'host_id'
@@ -267,6 +275,13 @@ class FieldsManagementWithoutSearchInDb(BaseModel):
         }
 
 
+class FieldsManagementBatch(FieldsManagementWithoutSearchInDb):
+
+    hosts: Annotated[
+        dict[str, ManagementFields], MinLen(1), MaxLen(1000), SkipValidation
+    ]
+
+
 """ Response """
 
 
@@ -407,6 +422,17 @@ class ResponseGetState(BaseModel):
     )
 
 
+class ResponseBatchJob(BaseModel):
+    model_config = ConfigDict(extra='allow')
+
+    job_id: str
+    status: JobStatus
+    total: int
+    completed: Annotated[int, Field(default=0)]
+    time_execution: Annotated[float, Field(default=0)]
+    results: Annotated[dict[str, Any] | None, Field(default=None)]
+
+
 """ Проверка данных(свойств) определённого хоста """
 
 # T_PydanticModel = TypeVar(
@@ -1,7 +1,9 @@
 import abc
+import asyncio
 import logging
 import time
-from typing import Coroutine, Type, TypeVar
+from collections.abc import AsyncIterator
+from typing import Any, Coroutine, Type, TypeVar
 from asyncio import TaskGroup
 import aiohttp
 from pysnmp.entity.engine import SnmpEngine
@@ -27,7 +29,9 @@ from api_v1.controller_management.sorters.sorters_core import (
 #     HostSorterMonitoring,
 #     HostSorterManagement
 # )
-from core.shared import SWARCO_SSH_CONNECTIONS
+from core.cache import StatesCache
+from core.settings import settings
+from core.shared import SWARCO_SSH_SESSIONS, STATES_CACHE
 
 # from sdp_lib.management_controllers.snmp import snmp_api, snmp_core
 # from sdp_lib.management_controllers.http.peek.monitoring.main_page import MainPage as peek_MainPage
@@ -87,41 +91,55 @@ class Controllers:
     def get_coro(self, ip_v4: str, data_host: dict) -> Coroutine:
         ...
 
+    def _get_hosts_for_request(self) -> dict:
+        """
+        Возвращает хосты, к которым необходимо отправить запрос.
+        """
+        return self.allowed_to_request_hosts
+
     async def _make_request(self):
 
         self.result_tasks = []
+        hosts_for_request = self._get_hosts_for_request()
         if self._session is None:
             async with aiohttp.ClientSession() as self._session:
                 async with TaskGroup() as tg:
-                    for ip_v4, data_host in self.allowed_to_request_hosts.items():
+                    for ip_v4, data_host in hosts_for_request.items():
                         self.result_tasks.append(tg.create_task(
                             self.get_coro(ip_v4, data_host),
                             name=ip_v4
                         ))
         else:
             async with TaskGroup() as tg:
-                for ip_v4, data_host in self.allowed_to_request_hosts.items():
+                for ip_v4, data_host in hosts_for_request.items():
                     self.result_tasks.append(tg.create_task(
                         self.get_coro(ip_v4, data_host),
                         name=ip_v4
                     ))
         return self.result_tasks
 
-    async def compose_request(self):
-
-        start_time = time.time()
+    async def _get_data_hosts(self) -> S:
+        """
+        Формирует экземпляр сортировщика с данными хостов из income_data
+        или из БД, если search_in_db == True.
+        """
         if self.search_in_db:
             hosts_from_db: P = self._get_processor_class()(self.income_data)
             await hosts_from_db.search_hosts_and_processing()
-            data_hosts = self._get_sorter_class()(hosts_from_db.processed_data_hosts)
-        else:
-            data_hosts = self._get_sorter_class()(self.income_data.hosts)
+            return self._get_sorter_class()(hosts_from_db.processed_data_hosts)
+        return self._get_sorter_class()(self.income_data.hosts)
 
+    async def sort_data_hosts(self) -> None:
+        data_hosts = await self._get_data_hosts()
         data_hosts.sort()
 
         self.allowed_to_request_hosts = data_hosts.hosts_without_errors
         self.bad_hosts = data_hosts.hosts_with_errors
 
+    async def compose_request(self):
+
+        start_time = time.time()
+        await self.sort_data_hosts()
         await self._make_request()
         self.add_response_to_data_hosts()
         # for t in self.result_tasks:
@@ -133,11 +151,75 @@ class Controllers:
 
     def add_response_to_data_hosts(self):
         for t in self.result_tasks:
-            instance = t.result()
-            self.allowed_to_request_hosts[t.get_name()].response = instance.response_as_dict
-            # Заглушка, добавляет в шаренный словарь ssh соединение swarco
-            if isinstance(instance, ssh_core.SwarcoSSH):
-                SWARCO_SSH_CONNECTIONS[instance.ip_v4] = instance.driver
+            self.add_response_to_data_host(t.get_name(), t.result())
+
+    def add_response_to_data_host(self, ip_v4: str, instance) -> None:
+        """
+        Добавляет ответ хоста в данные хоста из allowed_to_request_hosts.
+        :param ip_v4: ipv4 хоста.
+        :param instance: Экземпляр хоста, которому был отправлен запрос.
+        :return: None
+        """
+        self.allowed_to_request_hosts[ip_v4].response = instance.response_as_dict
+
+    def add_error_to_data_host(self, ip_v4: str, exc: Exception) -> None:
+        """
+        Добавляет ошибку запроса в errors хоста из allowed_to_request_hosts.
+        :param ip_v4: ipv4 хоста.
+        :param exc: Исключение, которым завершился запрос к хосту.
+        :return: None
+        """
+        data_host = self.allowed_to_request_hosts[ip_v4]
+        data_host.errors = [*(getattr(data_host, 'errors', None) or []), repr(exc)]
+
+    async def _stream_responses(self, hosts_for_request: dict) -> AsyncIterator[dict[str, Any]]:
+        async def request(ip_v4: str, data_host) -> tuple[str, Any]:
+            try:
+                return ip_v4, await self.get_coro(ip_v4, data_host)
+            except Exception as exc:
+                return ip_v4, exc
+
+        tasks = [
+            asyncio.create_task(request(ip_v4, data_host), name=ip_v4)
+            for ip_v4, data_host in hosts_for_request.items()
+        ]
+        try:
+            for completed in asyncio.as_completed(tasks):
+                ip_v4, instance = await completed
+                if isinstance(instance, Exception):
+                    logger.warning(f'Ошибка запроса к хосту {ip_v4}: {instance!r}')
+                    self.add_error_to_data_host(ip_v4, instance)
+                else:
+                    self.add_response_to_data_host(ip_v4, instance)
+                yield {ip_v4: self.allowed_to_request_hosts[ip_v4]}
+        finally:
+            for task in tasks:
+                task.cancel()
+
+    async def stream_request(self) -> AsyncIterator[dict[str, Any]]:
+        """
+        Отдаёт данные каждого хоста по мере готовности: сначала хосты с ошибками
+        валидации, затем хосты, не требующие запроса(например, из кэша), затем
+        хосты в порядке получения ответа. Ошибка запроса к хосту отдаётся записью
+        этого хоста с ошибкой в errors и не прерывает поток.
+        Хосты сортируются, если sort_data_hosts не был вызван заранее.
+        :return: Асинхронный итератор словарей вида {ipv4: данные хоста}.
+        """
+        if self.allowed_to_request_hosts is None:
+            await self.sort_data_hosts()
+        for ip_or_name, bad_host in self.bad_hosts.items():
+            yield {ip_or_name: bad_host}
+        hosts_for_request = self._get_hosts_for_request()
+        for ip_v4, data_host in self.allowed_to_request_hosts.items():
+            if ip_v4 not in hosts_for_request:
+                yield {ip_v4: data_host}
+        if self._session is None:
+            async with aiohttp.ClientSession() as self._session:
+                async for host in self._stream_responses(hosts_for_request):
+                    yield host
+        else:
+            async for host in self._stream_responses(hosts_for_request):
+                yield host
 
 
 class StatesMonitoring(Controllers):
@@ -145,6 +227,24 @@ class StatesMonitoring(Controllers):
     sorter = HostSorterMonitoring
     processor = MonitoringProcessors
 
+    def __init__(
+            self,
+            *,
+            income_data,
+            search_in_db: bool,
+            session: aiohttp.ClientSession = None,
+            cache: StatesCache = STATES_CACHE
+    ):
+        super().__init__(income_data=income_data, search_in_db=search_in_db, session=session)
+        self._cache = cache
+
+    def add_response_to_data_host(self, ip_v4: str, instance) -> None:
+        super().add_response_to_data_host(ip_v4, instance)
+        # В кэш попадают только базовые состояния(без опций)
+        data_host = self.allowed_to_request_hosts[ip_v4]
+        if data_host.option is None:
+            data_host.response_timestamp = self._cache.add(ip_v4, data_host.response).timestamp
+
     def get_coro(
             self, ip: str,
             data_host: BaseFields
@@ -178,10 +278,140 @@ class StatesMonitoring(Controllers):
         raise TypeError('DEBUG')
 
 
+class CachedStatesMonitoring(StatesMonitoring):
+    """
+    Мониторинг с ответом из кэша состояний. Запрос к дк отправляется только
+    для хостов, которых нет в кэше или запись в кэше старше max_age.
+    По умолчанию max_age - settings.states_polling.max_age(несколько интервалов
+    фонового опроса), чтобы при остановленном или отстающем опросе не отдавать
+    устаревшие состояния. Если max_age None, возраст записи не проверяется.
+    """
+
+    def __init__(
+            self,
+            *,
+            income_data,
+            search_in_db: bool,
+            session: aiohttp.ClientSession = None,
+            cache: StatesCache = STATES_CACHE,
+            max_age: float | None = settings.states_polling.max_age
+    ):
+        super().__init__(income_data=income_data, search_in_db=search_in_db, session=session, cache=cache)
+        self._max_age = max_age
+
+    def _get_hosts_for_request(self) -> dict:
+        hosts_for_request = {}
+        for ip_v4, data_host in self.allowed_to_request_hosts.items():
+            cached = self._cache.get(ip_v4, self._max_age) if data_host.option is None else None
+            if cached is None:
+                hosts_for_request[ip_v4] = data_host
+            else:
+                data_host.response = cached.response
+                data_host.response_timestamp = cached.timestamp
+        return hosts_for_request
+
+
+class StatesPolling(StatesMonitoring):
+    """
+    Опрос состояний хостов, переданных в виде словаря {ipv4: BaseFields}.
+    Применяется для фонового обновления кэша состояний.
+    Ошибка запроса к одному хосту не прерывает опрос остальных: она записывается
+    в errors хоста, а запись хоста в кэше не обновляется.
+    Snmp хосты опрашиваются через BulkSnmpSweeper, который ограничивает количество
+    одновременных запросов и частоту запросов к каждой подсети.
+    """
+
+    def __init__(
+            self,
+            *,
+            income_data,
+            search_in_db: bool = False,
+            session: aiohttp.ClientSession = None,
+            cache: StatesCache = STATES_CACHE,
+            sweeper: snmp_api.BulkSnmpSweeper = None
+    ):
+        super().__init__(income_data=income_data, search_in_db=search_in_db, session=session, cache=cache)
+        self._sweeper = sweeper or snmp_api.BulkSnmpSweeper(engine=self.snmp_engine)
+        self._responses: dict[str, Any] = {}
+
+    async def _get_data_hosts(self) -> HostSorterMonitoring:
+        return self._get_sorter_class()(self.income_data)
+
+    def _is_snmp_host(self, data_host: BaseFields) -> bool:
+        return data_host.option is None and data_host.type_controller in self._sweeper.matches_controllers
+
+    async def _make_request(self):
+        self._responses = {}
+        hosts_for_request = self._get_hosts_for_request()
+        snmp_hosts = {ip_v4: data_host for ip_v4, data_host in hosts_for_request.items() if self._is_snmp_host(data_host)}
+        if self._session is None:
+            async with aiohttp.ClientSession() as self._session:
+                await self._request_hosts(hosts_for_request, snmp_hosts)
+        else:
+            await self._request_hosts(hosts_for_request, snmp_hosts)
+        return self._responses
+
+    async def _request_hosts(self, hosts_for_request: dict, snmp_hosts: dict) -> None:
+        async def request(ip_v4: str, data_host: BaseFields) -> None:
+            self._responses[ip_v4] = await self.get_coro(ip_v4, data_host)
+
+        async with TaskGroup() as tg:
+            tg.create_task(self._sweep_snmp_hosts(snmp_hosts))
+            for ip_v4, data_host in hosts_for_request.items():
+                if ip_v4 not in snmp_hosts:
+                    tg.create_task(request(ip_v4, data_host), name=ip_v4)
+
+    async def _sweep_snmp_hosts(self, snmp_hosts: dict) -> None:
+        """
+        Опрашивает snmp хосты через BulkSnmpSweeper. Ошибки запроса sweeper
+        записывает в ответ хоста.
+        """
+        instances = []
+        for ip_v4, data_host in snmp_hosts.items():
+            try:
+                instances.append(self._sweeper.create_host(data_host))
+            except Exception as exc:
+                logger.warning(f'Ошибка опроса состояния дк {ip_v4}: {exc!r}')
+                data_host.errors = [repr(exc)]
+        async for instance in self._sweeper.get_states(instances):
+            self._responses[instance.ip_v4] = instance
+
+    def add_response_to_data_hosts(self):
+        for ip_v4, instance in self._responses.items():
+            self.add_response_to_data_host(ip_v4, instance)
+
+    def get_coro(self, ip: str, data_host: BaseFields) -> Coroutine:
+        return self._request_host(ip, data_host)
+
+    async def _request_host(self, ip: str, data_host: BaseFields):
+        """
+        Отправляет запрос хосту.
+        :return: Экземпляр хоста или None, если запрос завершился исключением.
+        """
+        try:
+            return await super().get_coro(ip, data_host)
+        except Exception as exc:
+            logger.warning(f'Ошибка опроса состояния дк {ip}: {exc!r}')
+            data_host.errors = [repr(exc)]
+            return None
+
+    def add_response_to_data_host(self, ip_v4: str, instance) -> None:
+        if instance is not None:
+            super().add_response_to_data_host(ip_v4, instance)
+
+
 class Management(Controllers):
 
     sorter = HostSorterManagement
 
+    @staticmethod
+    async def set_stage_swarco_ssh(ip: str, value: int) -> ssh_core.SwarcoSSH:
+        """
+        Устанавливает фазу Swarco через ssh-сессию из пула SWARCO_SSH_SESSIONS.
+        """
+        async with SWARCO_SSH_SESSIONS.acquire(ip) as driver:
+            return await ssh_core.SwarcoSSH(ip=ip, driver=driver).set_stage(value)
+
     def get_coro(
             self, ip: str,
             data_host: ManagementFields
@@ -206,12 +436,6 @@ class Management(Controllers):
                 # print('fFF')
                 return snmp_api.PeekUg405(ipv4=ip, engine=self.snmp_engine).set_stage(value)
             case (AllowedControllers.SWARCO, AllowedManagementEntity.set_stage, AllowedManagementSources.man):
-                if ip in SWARCO_SSH_CONNECTIONS:
-                    print('case (AllowedControllers.SWARCO, Al')
-                    driver = SWARCO_SSH_CONNECTIONS.get(ip)
-                else:
-                    driver = ssh_core.SwarcoItcUserConnectionsSSH(ip)
-                    # return SWARCO_SSH_CONNECTIONS[ip].set_stage(value)
-                return ssh_core.SwarcoSSH(ip=ip, driver=driver).set_stage(value)
+                return self.set_stage_swarco_ssh(ip, value)
 
         raise TypeError('DEBUG')
\ No newline at end of file
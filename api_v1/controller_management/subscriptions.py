@@ -0,0 +1,342 @@
+import asyncio
+import json
+import logging
+from typing import Any
+
+import aiohttp
+from fastapi import WebSocket, WebSocketDisconnect
+from fastapi.encoders import jsonable_encoder
+from pydantic import ValidationError
+
+from api_v1.controller_management import services
+from api_v1.controller_management.schemas import BaseFields, BaseFieldsSearchInDb
+from core.cache import StatesCache
+from core.settings import settings
+from core.shared import HTTP_CLIENT_SESSIONS, STATES_CACHE
+from sdp_lib.management_controllers.fields_names import FieldsNames
+from sdp_lib.management_controllers.snmp.snmp_api import BulkSnmpSweeper
+
+
+logger = logging.getLogger(__name__)
+
+
+def get_tracked_fields(response: dict[str, Any]) -> dict[str, Any]:
+    """
+    Возвращает поля response_as_dict хоста, изменение которых отправляется подписчикам.
+    :param response: response_as_dict хоста.
+    :return: Словарь с текущей фазой, режимом и ошибками хоста.
+    """
+    data = response.get(str(FieldsNames.data)) or {}
+    return {
+        str(FieldsNames.curr_stage): data.get(str(FieldsNames.curr_stage)),
+        str(FieldsNames.curr_mode): data.get(str(FieldsNames.curr_mode)),
+        str(FieldsNames.errors): response.get(str(FieldsNames.errors)),
+    }
+
+
+class SubscriberQueue(asyncio.Queue):
+    """
+    Очередь сообщений подписчика. В stale хранятся ipv4 хостов, сообщения
+    которых были удалены из очереди при переполнении: такому подписчику
+    отправляется последний ответ хоста целиком.
+    """
+
+    def __init__(self, maxsize: int = 0):
+        super().__init__(maxsize)
+        self.stale: set[str] = set()
+
+
+def put_drop_oldest(queue: asyncio.Queue, message: Any) -> bool:
+    """
+    Кладёт сообщение в очередь подписчика. Если очередь заполнена(клиент не успевает
+    читать сообщения), из очереди удаляются самые старые сообщения. Для SubscriberQueue
+    ipv4 хостов из удалённых сообщений добавляются в stale.
+    :return: True, если из очереди были удалены сообщения, иначе False.
+    """
+    dropped = False
+    while True:
+        try:
+            queue.put_nowait(message)
+            return dropped
+        except asyncio.QueueFull:
+            dropped_message = queue.get_nowait()
+            dropped = True
+            if isinstance(queue, SubscriberQueue) and isinstance(dropped_message, dict):
+                queue.stale.update(dropped_message)
+
+
+def get_diff(previous: dict[str, Any] | None, current: dict[str, Any]) -> dict[str, Any]:
+    """
+    Возвращает поля current, значения которых отличаются от previous.
+    """
+    if previous is None:
+        return current
+    return {field: value for field, value in current.items() if previous.get(field) != value}
+
+
+class HostStatesWatcher:
+    """
+    Опрос состояния одного хоста, общий для всех подписчиков этого хоста.
+    Подписчикам отправляются только изменения текущей фазы, режима и ошибок.
+    Состояние берётся из кэша состояний(его обновляет StatesPoller и запросы
+    мониторинга), если запись в кэше не старше interval. Запрос к хосту
+    отправляется только при отсутствии такой записи.
+    """
+
+    def __init__(
+            self,
+            ip_v4: str,
+            data_host: BaseFields,
+            *,
+            interval: float,
+            session: aiohttp.ClientSession = None,
+            cache: StatesCache = STATES_CACHE,
+            sweeper: BulkSnmpSweeper = None
+    ):
+        self.ip_v4 = ip_v4
+        self._interval = interval
+        self._cache = cache
+        self._states = services.StatesPolling(
+            income_data={ip_v4: data_host},
+            search_in_db=False,
+            session=session,
+            cache=cache,
+            sweeper=sweeper
+        )
+        self._subscribers: set[asyncio.Queue] = set()
+        self._task: asyncio.Task | None = None
+        self.last_response: dict[str, Any] | None = None
+
+    @property
+    def subscribers(self) -> set[asyncio.Queue]:
+        return self._subscribers
+
+    def subscribe(self, queue: asyncio.Queue) -> None:
+        """
+        Добавляет подписчика. Если состояние хоста уже получено, подписчику
+        сразу отправляется последний ответ целиком.
+        """
+        self._subscribers.add(queue)
+        if self.last_response is not None:
+            self._send_snapshot(queue)
+        if self._task is None:
+            self._task = asyncio.create_task(self._run(), name=f'watcher_{self.ip_v4}')
+
+    def unsubscribe(self, queue: asyncio.Queue) -> None:
+        self._subscribers.discard(queue)
+        if isinstance(queue, SubscriberQueue):
+            queue.stale.discard(self.ip_v4)
+
+    def _send_snapshot(self, queue: asyncio.Queue) -> None:
+        """
+        Отправляет подписчику последний ответ хоста целиком. Снимок заменяет
+        все более ранние сообщения хоста, поэтому хост удаляется из stale.
+        """
+        put_drop_oldest(queue, {self.ip_v4: self.last_response})
+        if isinstance(queue, SubscriberQueue):
+            queue.stale.discard(self.ip_v4)
+
+    def _publish(self, message: dict[str, Any]) -> None:
+        for queue in self._subscribers:
+            put_drop_oldest(queue, message)
+
+    def _resync_stale_subscribers(self) -> None:
+        """
+        Отправляет последний ответ целиком подписчикам, у которых при переполнении
+        очереди были удалены сообщения хоста: иначе после потери изменения
+        состояние у клиента расходится с состоянием хоста.
+        """
+        for queue in self._subscribers:
+            if isinstance(queue, SubscriberQueue) and self.ip_v4 in queue.stale:
+                self._send_snapshot(queue)
+
+    async def poll(self) -> dict[str, Any]:
+        """
+        Возвращает состояние хоста из кэша, если запись не старше interval,
+        иначе отправляет запрос состояния хосту.
+        :return: response_as_dict хоста или словарь с ошибками запроса.
+        """
+        cached = self._cache.get(self.ip_v4, self._interval)
+        if cached is not None:
+            return cached.response
+        await self._states.compose_request()
+        data_host = self._states.allowed_to_request_hosts[self.ip_v4]
+        return getattr(data_host, 'response', None) or {str(FieldsNames.errors): getattr(data_host, 'errors', None)}
+
+    async def _run(self) -> None:
+        while True:
+            try:
+                response = await self.poll()
+            except Exception as exc:
+                logger.exception(f'Ошибка опроса состояния {self.ip_v4}: {exc}')
+            else:
+                previous = None if self.last_response is None else get_tracked_fields(self.last_response)
+                if self.last_response is None:
+                    self._publish({self.ip_v4: response})
+                elif diff := get_diff(previous, get_tracked_fields(response)):
+                    self._publish({self.ip_v4: diff})
+                self.last_response = response
+                self._resync_stale_subscribers()
+            await asyncio.sleep(self._interval)
+
+    async def stop(self) -> None:
+        if self._task is None:
+            return
+        self._task.cancel()
+        try:
+            await self._task
+        except asyncio.CancelledError:
+            pass
+        self._task = None
+
+
+class StatesSubscriptions:
+    """
+    Реестр подписок на состояния хостов. На каждый хост создаётся
+    один HostStatesWatcher, независимо от количества подписчиков.
+    """
+
+    def __init__(
+            self,
+            *,
+            interval: float,
+            cache: StatesCache = STATES_CACHE,
+            queue_size: int = 100,
+            snmp_concurrency: int = 100
+    ):
+        self._interval = interval
+        self._cache = cache
+        self.queue_size = queue_size
+        self._watchers: dict[str, HostStatesWatcher] = {}
+        # Общий для всех хостов: ограничивает количество одновременных snmp запросов подписок
+        self._sweeper = BulkSnmpSweeper(engine=services.Controllers.snmp_engine, max_concurrent=snmp_concurrency)
+
+    def __len__(self):
+        return len(self._watchers)
+
+    async def resolve_hosts(self, hosts: list[str]) -> tuple[dict[str, BaseFields], dict[str, Any]]:
+        """
+        Ищет хосты в БД и проверяет их данные.
+        :param hosts: Список ipv4 или номеров дк.
+        :return: Кортеж из словаря хостов, прошедших проверку, вида {ipv4: BaseFields}
+                 и словаря хостов с ошибками.
+        """
+        states = services.StatesMonitoring(
+            income_data=BaseFieldsSearchInDb(hosts=hosts),
+            search_in_db=True,
+            cache=self._cache
+        )
+        await states.sort_data_hosts()
+        return states.allowed_to_request_hosts, states.bad_hosts
+
+    def subscribe(self, ip_v4: str, data_host: BaseFields, queue: asyncio.Queue) -> None:
+        if ip_v4 not in self._watchers:
+            self._watchers[ip_v4] = HostStatesWatcher(
+                ip_v4,
+                data_host,
+                interval=self._interval,
+                session=HTTP_CLIENT_SESSIONS[0].session if HTTP_CLIENT_SESSIONS[0] is not None else None,
+                cache=self._cache,
+                sweeper=self._sweeper
+            )
+        self._watchers[ip_v4].subscribe(queue)
+
+    async def unsubscribe(self, ip_v4: str, queue: asyncio.Queue) -> None:
+        """
+        Удаляет подписчика. Опрос хоста останавливается, если подписчиков не осталось.
+        """
+        watcher = self._watchers.get(ip_v4)
+        if watcher is None:
+            return
+        watcher.unsubscribe(queue)
+        if not watcher.subscribers:
+            del self._watchers[ip_v4]
+            await watcher.stop()
+
+    async def close(self) -> None:
+        for watcher in self._watchers.values():
+            await watcher.stop()
+        self._watchers.clear()
+
+
+class StatesSubscriber:
+    """
+    Клиент websocket подписки на состояния.
+    Сообщения клиента: {"subscribe": ["10.45.154.16", "2390"]} или {"unsubscribe": ["2390"]}.
+    Сообщения сервера: {ipv4: response_as_dict} при подписке, {ipv4: изменённые поля} далее
+    и {"errors": [...]} на некорректное сообщение клиента.
+    Очередь сообщений клиента ограничена queue_size: если клиент не успевает читать,
+    самые старые сообщения удаляются, а по хостам с удалёнными сообщениями
+    клиенту повторно отправляется {ipv4: response_as_dict}.
+    """
+
+    def __init__(self, websocket: WebSocket, subscriptions: StatesSubscriptions):
+        self._websocket = websocket
+        self._subscriptions = subscriptions
+        self._queue = SubscriberQueue(maxsize=subscriptions.queue_size)
+        # Ключ - ipv4 или номер дк из запроса клиента, значение - ipv4 хоста
+        self._subscribed: dict[str, str] = {}
+
+    async def subscribe(self, hosts: list[str]) -> None:
+        try:
+            good_hosts, bad_hosts = await self._subscriptions.resolve_hosts(hosts)
+        except ValidationError as exc:
+            put_drop_oldest(self._queue, {str(FieldsNames.errors): exc.errors(include_url=False)})
+            return
+        if bad_hosts:
+            put_drop_oldest(self._queue, bad_hosts)
+        for ip_v4, data_host in good_hosts.items():
+            ip_or_name = getattr(data_host, 'ip_or_name_source', ip_v4)
+            if ip_or_name in self._subscribed:
+                continue
+            self._subscribed[ip_or_name] = ip_v4
+            self._subscriptions.subscribe(ip_v4, data_host, self._queue)
+
+    async def unsubscribe(self, hosts: list[str]) -> None:
+        for ip_or_name in hosts:
+            ip_v4 = self._subscribed.pop(ip_or_name, None)
+            if ip_v4 is not None and ip_v4 not in self._subscribed.values():
+                await self._subscriptions.unsubscribe(ip_v4, self._queue)
+
+    async def _send_messages(self) -> None:
+        while True:
+            message = await self._queue.get()
+            await self._websocket.send_json(jsonable_encoder(message))
+
+    async def _handle_message(self, message: Any) -> None:
+        if not isinstance(message, dict):
+            raise TypeError('Сообщение должно быть объектом вида {"subscribe": [...]} или {"unsubscribe": [...]}')
+        for hosts in (message.get('subscribe'), message.get('unsubscribe')):
+            if hosts is not None and not isinstance(hosts, list):
+                raise TypeError('Хосты должны быть переданы списком')
+        if hosts := message.get('subscribe'):
+            await self.subscribe(hosts)
+        if hosts := message.get('unsubscribe'):
+            await self.unsubscribe(hosts)
+
+    async def _receive_messages(self) -> None:
+        while True:
+            try:
+                # KeyError - бинарное сообщение вместо текстового
+                await self._handle_message(await self._websocket.receive_json())
+            except (json.JSONDecodeError, KeyError, TypeError) as exc:
+                put_drop_oldest(self._queue, {str(FieldsNames.errors): [f'Некорректное сообщение: {exc}']})
+            except ValidationError as exc:
+                put_drop_oldest(self._queue, {str(FieldsNames.errors): exc.errors(include_url=False)})
+
+    async def run(self) -> None:
+        sender = asyncio.create_task(self._send_messages())
+        try:
+            await self._receive_messages()
+        except WebSocketDisconnect:
+            pass
+        finally:
+            sender.cancel()
+            await self.unsubscribe(list(self._subscribed))
+
+
+states_subscriptions = StatesSubscriptions(
+    interval=settings.states_polling.subscriptions_interval,
+    queue_size=settings.states_polling.subscriber_queue_size,
+    snmp_concurrency=settings.states_polling.snmp_concurrency
+)
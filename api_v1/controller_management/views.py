@@ -1,7 +1,8 @@
 import logging
 import time
 
-from fastapi import APIRouter, Depends
+from fastapi import APIRouter, Depends, HTTPException, WebSocket, status
+from fastapi.responses import StreamingResponse
 from sqlalchemy.ext.asyncio import AsyncSession
 
 from api_v1.controller_management.crud import crud
@@ -9,6 +10,8 @@ from core.models.db_helper import db_helper
 from core.settings import settings
 from core.shared import HTTP_CLIENT_SESSIONS
 from api_v1.controller_management import services
+from api_v1.controller_management.subscriptions import StatesSubscriber, states_subscriptions
+from api_v1.controller_management.jobs import management_jobs
 from api_v1.controller_management.crud.crud import HostPropertiesFromDb
 from api_v1.controller_management.schemas import (
     BaseFieldsSearchInDb,
@@ -16,13 +19,28 @@ from api_v1.controller_management.schemas import (
     ResponseGetState,
     ResponseSearchinDb,
     FieldsManagementWithoutSearchInDb,
-    ControllerManagementOptions
+    ControllerManagementOptions,
+    StreamFormat,
+    FieldsManagementBatch,
+    ResponseBatchJob
 )
 from api_v1.controller_management.available_services import all_controllers_services, T_CommandOptions
+from api_v1.streaming import encode_stream, stream_media_types
 
 logger = logging.getLogger(__name__)
 router = APIRouter()
 
+async def create_streaming_response(states: services.Controllers, stream_format: StreamFormat) -> StreamingResponse:
+    """
+    Сортирует хосты(в том числе поиск в БД) до начала потока: ошибка на этом этапе
+    возвращается обычным ответом с кодом ошибки, а не обрывом уже начатого потока.
+    """
+    await states.sort_data_hosts()
+    return StreamingResponse(
+        encode_stream(states.stream_request(), stream_format),
+        media_type=stream_media_types[stream_format]
+    )
+
 # @router.post('/get-hosts-test/{test_val}')
 # async def get_hosts_test(test_val: str, data: T1):
 #     logger.debug(f'test_val: {test_val}')
@@ -48,27 +66,67 @@ async def get_hosts(data: BaseFieldsSearchInDb) -> ResponseSearchinDb:
 
 
 @router.post('/search-and-get-state', tags=[settings.traffic_lights_tag_monitoring])
-async def search_and_get_state(data: BaseFieldsSearchInDb) -> ResponseGetState:
+async def search_and_get_state(data: BaseFieldsSearchInDb, max_age: float = settings.states_polling.max_age) -> ResponseGetState:
 
-    states = services.StatesMonitoring(
+    states = services.CachedStatesMonitoring(
         income_data=data,
         search_in_db=True,
-        session=HTTP_CLIENT_SESSIONS[0].session
+        session=HTTP_CLIENT_SESSIONS[0].session,
+        max_age=max_age
     )
     return await states.compose_request()
 
 
+@router.post('/search-and-get-state/stream', tags=[settings.traffic_lights_tag_monitoring])
+async def search_and_get_state_stream(
+        data: BaseFieldsSearchInDb,
+        max_age: float = settings.states_polling.max_age,
+        stream_format: StreamFormat = StreamFormat.ndjson
+) -> StreamingResponse:
+
+    states = services.CachedStatesMonitoring(
+        income_data=data,
+        search_in_db=True,
+        session=HTTP_CLIENT_SESSIONS[0].session,
+        max_age=max_age
+    )
+    return await create_streaming_response(states, stream_format)
+
+
 @router.post('/get-state', tags=[settings.traffic_lights_tag_monitoring])
-async def get_state(data: FieldsMonitoringWithoutSearchInDb) -> ResponseGetState:
+async def get_state(data: FieldsMonitoringWithoutSearchInDb, max_age: float = settings.states_polling.max_age) -> ResponseGetState:
     # print(f'data: \n {data}')
-    states = services.StatesMonitoring(
+    states = services.CachedStatesMonitoring(
         income_data=data,
         search_in_db=False,
-        session=HTTP_CLIENT_SESSIONS[0].session
+        session=HTTP_CLIENT_SESSIONS[0].session,
+        max_age=max_age
     )
     return await states.compose_request()
 
 
+@router.post('/get-state/stream', tags=[settings.traffic_lights_tag_monitoring])
+async def get_state_stream(
+        data: FieldsMonitoringWithoutSearchInDb,
+        max_age: float = settings.states_polling.max_age,
+        stream_format: StreamFormat = StreamFormat.ndjson
+) -> StreamingResponse:
+
+    states = services.CachedStatesMonitoring(
+        income_data=data,
+        search_in_db=False,
+        session=HTTP_CLIENT_SESSIONS[0].session,
+        max_age=max_age
+    )
+    return await create_streaming_response(states, stream_format)
+
+
+@router.websocket('/ws/states')
+async def ws_states(websocket: WebSocket):
+    await websocket.accept()
+    await StatesSubscriber(websocket, states_subscriptions).run()
+
+
 @router.get('/commands-and-options', tags=[settings.traffic_lights_tag_management])
 async def commands_options() -> T_CommandOptions:
     return all_controllers_services
@@ -85,6 +143,31 @@ async def set_command(data: FieldsManagementWithoutSearchInDb):
     return await result_set_command.compose_request()
 
 
+@router.post(
+    '/set-command/batch',
+    tags=[settings.traffic_lights_tag_management],
+    status_code=status.HTTP_202_ACCEPTED
+)
+async def set_command_batch(data: FieldsManagementBatch) -> ResponseBatchJob:
+
+    job = management_jobs.create(data, session=HTTP_CLIENT_SESSIONS[0].session)
+    return job.get_response_as_model(with_results=False)
+
+
+@router.get('/set-command/batch/{job_id}', tags=[settings.traffic_lights_tag_management])
+async def get_set_command_batch(job_id: str, with_results: bool = True) -> ResponseBatchJob:
+
+    job = management_jobs.get(job_id)
+    if job is None:
+        raise HTTPException(status_code=status.HTTP_404_NOT_FOUND, detail=f'Задание {job_id} не найдено')
+    return job.get_response_as_model(with_results=with_results)
+
+
+@router.get('/http-client/pool-stats', tags=[settings.traffic_lights_tag_monitoring])
+async def get_http_client_pool_stats() -> dict[str, int | float]:
+    return HTTP_CLIENT_SESSIONS[0].get_pool_stats()
+
+
 
 
 
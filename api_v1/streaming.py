@@ -0,0 +1,31 @@
+import json
+from collections.abc import AsyncIterator
+from enum import StrEnum
+
+from fastapi.encoders import jsonable_encoder
+
+
+class StreamFormat(StrEnum):
+    ndjson = 'ndjson'
+    sse = 'sse'
+
+
+stream_media_types = {
+    StreamFormat.ndjson: 'application/x-ndjson',
+    StreamFormat.sse: 'text/event-stream',
+}
+
+
+async def encode_stream(items: AsyncIterator[dict], stream_format: StreamFormat) -> AsyncIterator[str]:
+    """
+    Сериализует элементы потока(данные хостов, результаты заданий) в NDJSON или Server-Sent Events.
+    :param items: Асинхронный итератор словарей, например {ipv4: данные хоста}.
+    :param stream_format: Формат потока.
+    :return: Асинхронный итератор строк потока.
+    """
+    async for item in items:
+        line = json.dumps(jsonable_encoder(item), ensure_ascii=False)
+        if stream_format == StreamFormat.sse:
+            yield f'data: {line}\n\n'
+        else:
+            yield f'{line}\n'
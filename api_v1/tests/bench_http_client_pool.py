@@ -0,0 +1,139 @@
+"""
+Нагрузочный тест общей http сессии(AsyncClientHTTP) на локальной заглушке Peek.
+Заглушка(aiohttp.web) поднимается на NUM_HOSTS портах 127.0.0.1, каждый порт - отдельный дк.
+Каждый дк отдаёт главную web страницу с задержкой RESPONSE_DELAY и, как Peek,
+отклоняет запрос(503), если одновременно обрабатывает больше MAX_CONCURRENT_PER_HOST запросов.
+Выполняется NUM_ROUNDS опросов всех дк по REQUESTS_PER_HOST одновременных запросов к каждому дк:
+  - прежняя сессия: TCPConnector по умолчанию(limit=100, limit_per_host=0) и
+    ClientTimeout(connect=.4) в каждом запросе;
+  - AsyncClientHTTP с настройками HttpClientConfig и таймаутом, как в AsyncHttpRequests:
+    ClientTimeout(connect=.4, sock_read=HttpClientConfig.sock_read).
+Для каждого варианта выводится время, количество ошибок, отклонённых заглушкой запросов
+и счётчики пула соединений(созданные/переиспользованные соединения, ожидания в пуле).
+
+Запуск: python -m api_v1.tests.bench_http_client_pool
+"""
+
+import asyncio
+import collections
+import time
+
+import aiohttp
+from aiohttp import web
+
+from core.drivers import AsyncClientHTTP, HttpPoolMetrics
+from core.settings import HttpClientConfig
+
+
+NUM_HOSTS = 300
+NUM_ROUNDS = 5
+REQUESTS_PER_HOST = 3
+RESPONSE_DELAY = .02
+MAX_CONCURRENT_PER_HOST = 2
+
+main_page = (
+    ':TITLE;##MENU_001a##\n:SUBTITLE;Moscow: Панфиловс пр / Андреевка\n:TFT_NAVBAR;10\n:REFRESH_LOCK;1\n\n'
+    ':BEGINTABLE\n:W;;200px;\n\n:D;;##T_PLAN##;005 -             \n\n:D;;##T_TIMINGSET##;005\n\n'
+    ':D;;##T_TIME##;2025-03-01 16:08:41\n:D;;##T_ALARMS##;ISWC\n\n\n:ENDTABLE\n\n'
+    '<b>##T_STREAM## 1</b>\n:BEGINTABLE\n:W;;200px;\n:D;;##T_STATE##;УПРАВЛЕНИЕ\n:D;;##T_CYCLE##;0 (0)\n'
+    ':D;;##T_MODE## (##T_STAGE##);FT (3)\n:ENDTABLE\n\n'
+)
+
+
+class PeekStub:
+
+    def __init__(self):
+        self.concurrent = collections.Counter()
+        self.rejected = 0
+        self.runner: web.AppRunner | None = None
+        self.ports: list[int] = []
+
+    async def handler(self, request: web.Request) -> web.Response:
+        port = request.transport.get_extra_info('sockname')[1]
+        self.concurrent[port] += 1
+        try:
+            if self.concurrent[port] > MAX_CONCURRENT_PER_HOST:
+                self.rejected += 1
+                return web.Response(status=503)
+            await asyncio.sleep(RESPONSE_DELAY)
+            return web.Response(text=main_page)
+        finally:
+            self.concurrent[port] -= 1
+
+    async def start(self) -> None:
+        app = web.Application()
+        app.router.add_get('/{tail:.*}', self.handler)
+        self.runner = web.AppRunner(app, access_log=None)
+        await self.runner.setup()
+        for _ in range(NUM_HOSTS):
+            site = web.TCPSite(self.runner, '127.0.0.1', 0)
+            await site.start()
+        self.ports = [address[1] for address in self.runner.addresses]
+
+    async def close(self) -> None:
+        await self.runner.cleanup()
+
+
+async def fetch_page(session: aiohttp.ClientSession, url: str, timeout: aiohttp.ClientTimeout) -> bool:
+    try:
+        async with session.get(url, timeout=timeout) as response:
+            assert response.status == 200
+            await response.text()
+        return True
+    except (asyncio.TimeoutError, AssertionError, aiohttp.ClientError):
+        return False
+
+
+async def run_load(
+        stub: PeekStub,
+        session: aiohttp.ClientSession,
+        timeout: aiohttp.ClientTimeout
+) -> tuple[float, int]:
+    urls = [f'http://127.0.0.1:{port}/main' for port in stub.ports]
+    errors = 0
+    start_time = time.perf_counter()
+    for _ in range(NUM_ROUNDS):
+        results = await asyncio.gather(
+            *(fetch_page(session, url, timeout) for url in urls for _ in range(REQUESTS_PER_HOST))
+        )
+        errors += results.count(False)
+    return time.perf_counter() - start_time, errors
+
+
+async def main():
+    stub = PeekStub()
+    await stub.start()
+    try:
+        metrics = HttpPoolMetrics()
+        session = aiohttp.ClientSession(
+            timeout=aiohttp.ClientTimeout(1),
+            trace_configs=[metrics.create_trace_config()]
+        )
+        try:
+            elapsed, errors = await run_load(stub, session, aiohttp.ClientTimeout(connect=.4))
+        finally:
+            await session.close()
+        print(
+            f'Прежняя сессия : {elapsed:.3f} c, ошибок {errors}, отклонено заглушкой {stub.rejected}, '
+            f'пул {metrics.as_dict()}'
+        )
+
+        stub.rejected = 0
+        client = AsyncClientHTTP(**HttpClientConfig().model_dump())
+        try:
+            elapsed, errors = await run_load(
+                stub, client.session, aiohttp.ClientTimeout(connect=.4, sock_read=client.timeout.sock_read)
+            )
+            stats = client.get_pool_stats()
+        finally:
+            await client.close()
+        print(
+            f'AsyncClientHTTP: {elapsed:.3f} c, ошибок {errors}, отклонено заглушкой {stub.rejected}, '
+            f'пул {stats}'
+        )
+    finally:
+        await stub.close()
+
+
+if __name__ == '__main__':
+    asyncio.run(main())
@@ -0,0 +1,104 @@
+"""
+Сравнение запроса поиска хостов в toolkit_trafficlightsobjects:
+прежняя цепочка OR(number = $1 OR ip_adress = $2 ...) и
+запрос фиксированного вида(number = ANY($1::TEXT[]) OR ip_adress = ANY($2::TEXT[])).
+Для 1, 10 и 30 хостов выводится время планирования, время выполнения(EXPLAIN ANALYZE)
+и средняя задержка запроса из приложения.
+
+Запуск: python -m api_v1.tests.bench_search_hosts_query
+"""
+
+import asyncio
+import json
+import time
+
+from sqlalchemy import select, or_
+
+from api_v1.controller_management.crud.crud import SearchHostsByIpOrNumQuery
+from api_v1.controller_management.schemas import SearchinDbFields
+from core.models import db_helper, TrafficLightsObjects
+from core.utils import get_field_for_search_in_db
+
+
+HOSTS_COUNTS = (1, 10, 30)
+REPEATS = 200
+
+
+def create_hosts_models(hosts: list[str]) -> dict[str, SearchinDbFields]:
+    return {
+        name_or_ipv4: SearchinDbFields(
+            ip_or_name_source=name_or_ipv4,
+            search_in_db_field=get_field_for_search_in_db(name_or_ipv4),
+            db_records=[]
+        )
+        for name_or_ipv4 in hosts
+    }
+
+
+def create_or_chain_query(hosts_models: dict[str, SearchinDbFields]):
+    search = SearchHostsByIpOrNumQuery()
+    return select(*search.standard_columns).where(or_(
+        *(search.matches.get(data_host.search_in_db_field) == ip_or_name
+          for ip_or_name, data_host in hosts_models.items())
+    ))
+
+
+def create_any_query(hosts_models: dict[str, SearchinDbFields]):
+    return SearchHostsByIpOrNumQuery().get_query_where(hosts_models)
+
+
+async def get_hosts_for_bench(conn, count: int) -> list[str]:
+    """
+    Возвращает count хостов из БД: половина номеров дк, половина ipv4.
+    """
+    result = await conn.execute(
+        select(TrafficLightsObjects.number, TrafficLightsObjects.ip_adress).limit(count)
+    )
+    return [
+        str(number) if i % 2 == 0 or not ip else ip
+        for i, (number, ip) in enumerate(result.all())
+    ]
+
+
+async def explain(conn, query) -> tuple[float, float]:
+    """
+    :return: Кортеж из времени планирования и времени выполнения запроса в мс.
+    """
+    compiled = query.compile(dialect=conn.dialect)
+    params = compiled.construct_params()
+    result = await conn.exec_driver_sql(
+        f'EXPLAIN (ANALYZE, FORMAT JSON) {compiled}',
+        tuple(params[name] for name in compiled.positiontup)
+    )
+    plan = result.scalar()
+    plan = json.loads(plan)[0] if isinstance(plan, str) else plan[0]
+    return plan['Planning Time'], plan['Execution Time']
+
+
+async def measure_latency(conn, query) -> float:
+    """
+    :return: Средняя задержка запроса в мс.
+    """
+    start_time = time.perf_counter()
+    for _ in range(REPEATS):
+        (await conn.execute(query)).mappings().all()
+    return (time.perf_counter() - start_time) / REPEATS * 1000
+
+
+async def main():
+    async with db_helper.engine.connect() as conn:
+        for count in HOSTS_COUNTS:
+            hosts_models = create_hosts_models(await get_hosts_for_bench(conn, count))
+            for name, create_query in (('OR', create_or_chain_query), ('ANY', create_any_query)):
+                query = create_query(hosts_models)
+                planning, execution = await explain(conn, query)
+                latency = await measure_latency(conn, query)
+                print(
+                    f'hosts: {count:3} {name:4}: planning {planning:.3f} мс, '
+                    f'execution {execution:.3f} мс, latency {latency:.3f} мс'
+                )
+    await db_helper.engine.dispose()
+
+
+if __name__ == '__main__':
+    asyncio.run(main())
@@ -0,0 +1,33 @@
+import pytest
+from pydantic import ValidationError
+
+from api_v1.conflicts.schemas import ConflictsJobFields
+from core.settings import settings
+
+
+STAGES = {'1': '1,2', '2': '3,4'}
+
+
+@pytest.fixture
+def configs_dir(tmp_path, monkeypatch):
+    configs_dir = tmp_path / 'configs'
+    (configs_dir / 'sub').mkdir(parents=True)
+    monkeypatch.setattr(settings.conflicts_batch, 'configs_dir', configs_dir)
+    return configs_dir.resolve()
+
+
+@pytest.mark.parametrize('path', ['CO3992.DAT', 'sub/CO11.PTC2', 'sub/../CO3992.DAT'])
+def test_path_inside_configs_dir(configs_dir, path):
+    job = ConflictsJobFields(stages=STAGES, path_to_src_config=path).get_job()
+    assert job.path_to_src_config == str((configs_dir / path).resolve())
+
+
+@pytest.mark.parametrize('path', ['../CO3992.DAT', 'sub/../../CO3992.DAT', '/etc/passwd', 'link/CO3992.DAT'])
+def test_path_outside_configs_dir(configs_dir, path):
+    (configs_dir / 'link').symlink_to(configs_dir.parent)
+    with pytest.raises(ValidationError):
+        ConflictsJobFields(stages=STAGES, path_to_src_config=path)
+
+
+def test_without_path(configs_dir):
+    assert ConflictsJobFields(stages=STAGES).get_job().path_to_src_config is None
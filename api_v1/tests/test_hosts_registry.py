@@ -0,0 +1,230 @@
+from datetime import datetime, timedelta
+from types import SimpleNamespace
+
+import pytest
+import pytest_asyncio
+
+from api_v1.controller_management.crud import crud, registry
+from api_v1.controller_management.crud.registry import HostsRegistry
+from api_v1.controller_management.schemas import BaseFieldsSearchInDb, TrafficLightsObjectsTableFields
+
+
+pytest_plugins = ('pytest_asyncio', )
+
+
+NUMBER = TrafficLightsObjectsTableFields.NUMBER
+IP_ADDRESS = TrafficLightsObjectsTableFields.IP_ADDRESS
+
+start_time = datetime(2025, 1, 1)
+
+
+def create_record(number: int | None, ip: str | None, type_controller: str = 'Swarco') -> dict:
+    return {
+        'number': number,
+        'ip_adress': ip,
+        'type_controller': type_controller,
+        'address': f'address {number}',
+        'description': None,
+    }
+
+
+class FakeResult:
+
+    def __init__(self, rows: list[dict] = None, one: tuple = None):
+        self._rows = rows
+        self._one = one
+
+    def one(self) -> tuple:
+        return self._one
+
+    def mappings(self):
+        return self
+
+    def all(self) -> list[dict]:
+        return self._rows
+
+
+class FakeTable:
+    """
+    Таблица toolkit_trafficlightsobjects в памяти. Запрос водяного знака
+    (max(time_update), count(*)) отличается от запроса записей количеством колонок.
+    """
+
+    def __init__(self, *records: dict):
+        self.records = list(records)
+        self.time_update = start_time
+        self.watermark_requests = 0
+        self.records_requests = 0
+
+    def touch(self) -> None:
+        self.time_update += timedelta(seconds=1)
+
+    def connect(self):
+        return self
+
+    async def __aenter__(self):
+        return self
+
+    async def __aexit__(self, *exc):
+        return False
+
+    async def execute(self, query) -> FakeResult:
+        if len(query.selected_columns) == 2:
+            self.watermark_requests += 1
+            return FakeResult(one=(self.time_update, len(self.records)))
+        self.records_requests += 1
+        return FakeResult(rows=[dict(record) for record in self.records])
+
+
+@pytest.fixture
+def table(monkeypatch) -> FakeTable:
+    table = FakeTable(
+        create_record(11, '10.179.28.9'),
+        create_record(12, '10.179.56.1', 'Поток (P)'),
+        create_record(13, '10.179.40.9'),
+    )
+    monkeypatch.setattr(registry, 'db_helper', SimpleNamespace(engine=table))
+    return table
+
+
+@pytest_asyncio.fixture
+async def hosts_registry(table) -> HostsRegistry:
+    hosts_registry = HostsRegistry(refresh_interval=60)
+    await hosts_registry.load()
+    return hosts_registry
+
+
+@pytest.mark.asyncio
+async def test_registry_not_loaded():
+    hosts_registry = HostsRegistry(refresh_interval=60)
+    assert not hosts_registry.loaded
+    assert len(hosts_registry) == 0
+    assert hosts_registry.find('11', NUMBER) == []
+    assert hosts_registry.get_all_records() == []
+
+
+@pytest.mark.asyncio
+async def test_registry_load(table, hosts_registry):
+    assert hosts_registry.loaded
+    assert len(hosts_registry) == 3
+    assert hosts_registry.get_all_records() == table.records
+
+
+@pytest.mark.asyncio
+async def test_registry_find_by_number_and_ip(hosts_registry):
+    assert hosts_registry.find('12', NUMBER) == [create_record(12, '10.179.56.1', 'Поток (P)')]
+    assert hosts_registry.find('10.179.40.9', IP_ADDRESS) == [create_record(13, '10.179.40.9')]
+    assert hosts_registry.find('14', NUMBER) == []
+    assert hosts_registry.find('10.179.40.10', IP_ADDRESS) == []
+    # Номер ищется только по номеру, ip только по ip
+    assert hosts_registry.find('12', IP_ADDRESS) == []
+
+
+@pytest.mark.asyncio
+async def test_registry_find_returns_copies(hosts_registry):
+    hosts_registry.find('11', NUMBER)[0]['ip_adress'] = '10.0.0.1'
+    hosts_registry.get_all_records()[0]['ip_adress'] = '10.0.0.1'
+    assert hosts_registry.find('11', NUMBER)[0]['ip_adress'] == '10.179.28.9'
+
+
+@pytest.mark.asyncio
+async def test_registry_find_duplicates(table):
+    table.records.append(create_record(11, '10.179.28.10'))
+    hosts_registry = HostsRegistry(refresh_interval=60)
+    await hosts_registry.load()
+    assert [record['ip_adress'] for record in hosts_registry.find('11', NUMBER)] == ['10.179.28.9', '10.179.28.10']
+
+
+@pytest.mark.asyncio
+async def test_registry_load_skips_empty_keys(table):
+    table.records.append(create_record(None, '10.179.1.1'))
+    table.records.append(create_record(15, None))
+    hosts_registry = HostsRegistry(refresh_interval=60)
+    await hosts_registry.load()
+    assert hosts_registry.find('10.179.1.1', IP_ADDRESS) == [create_record(None, '10.179.1.1')]
+    assert hosts_registry.find('15', NUMBER) == [create_record(15, None)]
+
+
+@pytest.mark.asyncio
+async def test_registry_refresh_without_changes(table, hosts_registry):
+    assert await hosts_registry.refresh() is False
+    assert table.records_requests == 1
+
+
+@pytest.mark.asyncio
+async def test_registry_refresh_inserted(table, hosts_registry):
+    table.records.append(create_record(14, '10.179.8.1'))
+    table.touch()
+    assert await hosts_registry.refresh() is True
+    assert len(hosts_registry) == 4
+    assert hosts_registry.find('14', NUMBER) == [create_record(14, '10.179.8.1')]
+    assert hosts_registry.find('10.179.8.1', IP_ADDRESS) == [create_record(14, '10.179.8.1')]
+
+
+@pytest.mark.asyncio
+async def test_registry_refresh_updated(table, hosts_registry):
+    table.records[0]['ip_adress'] = '10.179.28.17'
+    table.touch()
+    assert await hosts_registry.refresh() is True
+    assert len(hosts_registry) == 3
+    assert hosts_registry.find('11', NUMBER) == [create_record(11, '10.179.28.17')]
+    assert hosts_registry.find('10.179.28.17', IP_ADDRESS) == [create_record(11, '10.179.28.17')]
+    assert hosts_registry.find('10.179.28.9', IP_ADDRESS) == []
+
+
+@pytest.mark.asyncio
+async def test_registry_refresh_deleted(table, hosts_registry):
+    # Удаление не меняет max(time_update), но меняет count(*)
+    del table.records[1]
+    assert await hosts_registry.refresh() is True
+    assert len(hosts_registry) == 2
+    assert hosts_registry.find('12', NUMBER) == []
+    assert hosts_registry.find('10.179.56.1', IP_ADDRESS) == []
+
+
+class FakeSearchInDb:
+
+    def __init__(self, *records: dict):
+        self.records = records
+        self.queries = []
+
+    async def __call__(self, query) -> list[dict]:
+        self.queries.append(query)
+        return [dict(record) for record in self.records]
+
+
+def create_search(monkeypatch, hosts_registry: HostsRegistry, search_in_db: FakeSearchInDb, hosts: list[str]):
+    monkeypatch.setattr(crud.SearchDb, 'registry', hosts_registry)
+    monkeypatch.setattr(crud, 'search_hosts_base_properties', search_in_db)
+    return crud.SearchDb(BaseFieldsSearchInDb(hosts=hosts))
+
+
+@pytest.mark.asyncio
+async def test_search_uses_loaded_registry(monkeypatch, hosts_registry):
+    search_in_db = FakeSearchInDb()
+    search = create_search(monkeypatch, hosts_registry, search_in_db, ['11', '10.179.56.1'])
+    hosts = await search.search_hosts_and_processing()
+    assert search_in_db.queries == []
+    assert hosts['11'].db_records == [create_record(11, '10.179.28.9')]
+    assert hosts['10.179.56.1'].db_records == [create_record(12, '10.179.56.1', 'Поток (P)')]
+
+
+@pytest.mark.asyncio
+async def test_search_falls_back_to_db_for_hosts_missing_in_registry(monkeypatch, hosts_registry):
+    search_in_db = FakeSearchInDb(create_record('14', '10.179.8.1'))
+    search = create_search(monkeypatch, hosts_registry, search_in_db, ['11', '14'])
+    hosts = await search.search_hosts_and_processing()
+    assert len(search_in_db.queries) == 1
+    assert hosts['11'].db_records == [create_record(11, '10.179.28.9')]
+    assert hosts['14'].db_records == [create_record('14', '10.179.8.1')]
+
+
+@pytest.mark.asyncio
+async def test_search_falls_back_to_db_when_registry_not_loaded(monkeypatch, table):
+    search_in_db = FakeSearchInDb(create_record('11', '10.179.28.9'), create_record('13', '10.179.40.9'))
+    search = create_search(monkeypatch, HostsRegistry(refresh_interval=60), search_in_db, ['11', '10.179.40.9'])
+    hosts = await search.search_hosts_and_processing()
+    assert len(search_in_db.queries) == 1
+    assert table.watermark_requests == table.records_requests == 0
+    assert hosts['11'].db_records == [create_record('11', '10.179.28.9')]
+    assert hosts['10.179.40.9'].db_records == [create_record('13', '10.179.40.9')]
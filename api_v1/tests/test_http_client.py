@@ -0,0 +1,48 @@
+import pytest
+
+from api_v1.controller_management import services
+from core.drivers import AsyncClientHTTP
+from core.settings import HttpClientConfig
+from core.shared import PEEK_POST_RATE_LIMITER
+from sdp_lib.management_controllers.http.peek.peek_http import PeekWebHosts
+from sdp_lib.management_controllers.http.request_sender import AsyncHttpRequests
+
+
+pytest_plugins = ('pytest_asyncio', )
+
+
+class Host:
+    def __init__(self, client: AsyncClientHTTP):
+        self.driver = client.session
+
+
+@pytest.mark.asyncio
+async def test_request_timeout():
+    client = AsyncClientHTTP(**HttpClientConfig(sock_read=2).model_dump())
+    try:
+        timeout = AsyncHttpRequests(Host(client))._create_timeout(.4)
+        assert (timeout.connect, timeout.sock_read, timeout.total) == (.4, 2, None)
+    finally:
+        await client.close()
+
+
+@pytest.mark.asyncio
+async def test_pool_stats_without_connector_internals(monkeypatch):
+    client = AsyncClientHTTP(**HttpClientConfig().model_dump())
+    try:
+        stats = client.get_pool_stats()
+        assert (stats['acquired'], stats['idle'], stats['waiting']) == (0, 0, 0)
+
+        monkeypatch.setattr(client.connector, '_acquired_per_host', None)
+        stats = client.get_pool_stats()
+        assert stats['limit_per_host'] == 2
+        assert (stats['acquired'], stats['hosts'], stats['waiting']) == (None, None, None)
+    finally:
+        monkeypatch.undo()
+        await client.close()
+
+
+def test_single_peek_post_rate_limiter():
+    assert PeekWebHosts.post_rate_limiter is PEEK_POST_RATE_LIMITER
+    assert services.peek_http.PeekWebHosts(ipv4='10.0.0.1').post_rate_limiter is PEEK_POST_RATE_LIMITER
+    assert PEEK_POST_RATE_LIMITER.get('10.0.0.1') is PEEK_POST_RATE_LIMITER.get('10.0.0.1')
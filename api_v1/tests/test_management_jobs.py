@@ -0,0 +1,104 @@
+import asyncio
+
+import pytest
+
+from api_v1.controller_management import jobs
+from api_v1.controller_management.schemas import FieldsManagementBatch, JobStatus
+
+
+pytest_plugins = ('pytest_asyncio', )
+
+
+def create_jobs(jobs_ttl: float = 3600) -> jobs.ManagementJobs:
+    return jobs.ManagementJobs(snmp_concurrency=1, http_concurrency=1, ssh_concurrency=1, jobs_ttl=jobs_ttl)
+
+
+def create_data() -> FieldsManagementBatch:
+    return FieldsManagementBatch.model_construct(hosts={'10.0.0.1': None, '10.0.0.2': None})
+
+
+def patch_compose_request(monkeypatch, release: asyncio.Event, exc: Exception = None):
+
+    async def compose_request(self):
+        await release.wait()
+        if exc is not None:
+            raise exc
+        self.completed = 2
+
+    monkeypatch.setattr(jobs.ManagementBatch, 'compose_request', compose_request)
+
+
+@pytest.mark.asyncio
+async def test_job_status_done(monkeypatch):
+    patch_compose_request(monkeypatch, release := asyncio.Event())
+    management_jobs = create_jobs()
+    job = management_jobs.create(create_data())
+    assert job.status == JobStatus.pending
+
+    await asyncio.sleep(0)
+    assert job.status == JobStatus.running
+    assert job.finish_time is None
+
+    release.set()
+    await job.task
+    response = job.get_response_as_model(with_results=False)
+    assert (response.status, response.total, response.completed) == (JobStatus.done, 2, 2)
+    assert management_jobs.get(job.job_id) is job
+
+
+@pytest.mark.asyncio
+async def test_job_status_failed(monkeypatch):
+    release = asyncio.Event()
+    release.set()
+    patch_compose_request(monkeypatch, release, exc=ConnectionError('host unreachable'))
+    job = create_jobs().create(create_data())
+    await job.task
+    assert job.status == JobStatus.failed
+    assert job.finish_time is not None
+
+
+@pytest.mark.asyncio
+async def test_completed_jobs_removed_after_ttl(monkeypatch):
+    patch_compose_request(monkeypatch, release := asyncio.Event())
+    management_jobs = create_jobs(jobs_ttl=.05)
+    job = management_jobs.create(create_data())
+
+    await asyncio.sleep(.1)
+    assert management_jobs.get(job.job_id) is job
+
+    release.set()
+    await job.task
+    assert len(management_jobs) == 1
+    await asyncio.sleep(.1)
+    assert len(management_jobs) == 0
+
+
+@pytest.mark.asyncio
+async def test_close_cancels_jobs(monkeypatch):
+    patch_compose_request(monkeypatch, asyncio.Event())
+    management_jobs = create_jobs()
+    job = management_jobs.create(create_data())
+    await asyncio.sleep(0)
+    await management_jobs.close()
+    assert job.task.cancelled()
+    assert len(management_jobs) == 0
+
+
+@pytest.mark.asyncio
+async def test_job_total_excludes_rejected_hosts(monkeypatch):
+
+    async def sort_data_hosts(self):
+        self.allowed_to_request_hosts = {'10.0.0.1': None}
+        self.bad_hosts = {'10.0.0.2': {'errors': ['not found in database']}}
+
+    async def request(self, ip_v4, data_host):
+        self.completed += 1
+
+    monkeypatch.setattr(jobs.ManagementBatch, 'sort_data_hosts', sort_data_hosts)
+    monkeypatch.setattr(jobs.ManagementBatch, '_request', request)
+    job = create_jobs().create(create_data())
+    assert job.total == 2
+
+    await job.task
+    response = job.get_response_as_model(with_results=False)
+    assert (response.status, response.total, response.completed) == (JobStatus.done, 1, 1)
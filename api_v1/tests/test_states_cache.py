@@ -0,0 +1,134 @@
+import time
+
+import pytest
+
+from api_v1.controller_management import services
+from api_v1.controller_management.schemas import BaseFields
+from core.cache import CachedResponse, StatesCache
+
+
+pytest_plugins = ('pytest_asyncio', )
+
+
+def create_hosts(*ips: str, type_controller: str = 'Swarco') -> dict[str, BaseFields]:
+    return {
+        ip: BaseFields(ip_adress=ip, number=str(i), type_controller=type_controller, errors=[])
+        for i, ip in enumerate(ips, 1)
+    }
+
+
+class Host:
+    def __init__(self, ip: str):
+        self.ip_v4 = ip
+        self.response_as_dict = {'ip': ip}
+
+
+class Sweeper:
+    matches_controllers = {'Swarco': Host}
+
+    def __init__(self):
+        self.swept = []
+
+    def create_host(self, data_host: BaseFields) -> Host:
+        return Host(data_host.ip_adress)
+
+    async def get_states(self, hosts):
+        for host in hosts:
+            self.swept.append(host.ip_v4)
+            yield host
+
+
+def create_monitoring(cache: StatesCache, hosts: dict[str, BaseFields], max_age: float | None):
+    states = services.CachedStatesMonitoring(income_data=None, search_in_db=False, cache=cache, max_age=max_age)
+    states.allowed_to_request_hosts = hosts
+    return states
+
+
+def test_states_cache_hit_miss_stale():
+    cache = StatesCache()
+    assert cache.get('10.0.0.1') is None
+
+    cache.add('10.0.0.1', {'data': 1})
+    assert cache.get('10.0.0.1').response == {'data': 1}
+    assert cache.get('10.0.0.1', max_age=5).response == {'data': 1}
+
+    cache._states['10.0.0.1'] = CachedResponse({'data': 1}, time.time() - 10)
+    assert cache.get('10.0.0.1', max_age=5) is None
+    assert cache.get('10.0.0.1').response == {'data': 1}
+
+
+def test_cached_monitoring_hosts_for_request():
+    cache = StatesCache()
+    cache.add('10.0.0.1', {'data': 'fresh'})
+    cache._states['10.0.0.2'] = CachedResponse({'data': 'stale'}, time.time() - 60)
+    hosts = create_hosts('10.0.0.1', '10.0.0.2', '10.0.0.3')
+
+    hosts_for_request = create_monitoring(cache, hosts, max_age=30)._get_hosts_for_request()
+
+    assert list(hosts_for_request) == ['10.0.0.2', '10.0.0.3']
+    assert hosts['10.0.0.1'].response == {'data': 'fresh'}
+    assert hosts['10.0.0.1'].response_timestamp == cache.get('10.0.0.1').timestamp
+
+
+def test_cached_monitoring_without_max_age():
+    cache = StatesCache()
+    cache._states['10.0.0.1'] = CachedResponse({'data': 'stale'}, time.time() - 3600)
+    hosts = create_hosts('10.0.0.1')
+    assert create_monitoring(cache, hosts, max_age=None)._get_hosts_for_request() == {}
+    assert hosts['10.0.0.1'].response == {'data': 'stale'}
+
+
+def test_cached_monitoring_default_max_age():
+    states = services.CachedStatesMonitoring(income_data=None, search_in_db=False, cache=StatesCache())
+    assert states._max_age == services.settings.states_polling.max_age
+
+
+@pytest.mark.asyncio
+async def test_states_polling_isolates_host_errors(monkeypatch):
+
+    async def get_states(ip: str):
+        if ip == '10.0.0.2':
+            raise ConnectionError('host unreachable')
+        return Host(ip)
+
+    def get_coro(self, ip, data_host):
+        if ip == '10.0.0.3':
+            raise TypeError('unknown controller type')
+        return get_states(ip)
+
+    monkeypatch.setattr(services.StatesMonitoring, 'get_coro', get_coro)
+    cache = StatesCache()
+    cache.add('10.0.0.2', {'ip': 'previous'})
+    hosts = create_hosts('10.0.0.1', '10.0.0.2', '10.0.0.3', type_controller='Peek')
+    polling = services.StatesPolling(
+        income_data=hosts, search_in_db=False, session=object(), cache=cache, sweeper=Sweeper()
+    )
+    polling.allowed_to_request_hosts = hosts
+
+    await polling._make_request()
+    polling.add_response_to_data_hosts()
+
+    assert cache.get('10.0.0.1').response == {'ip': '10.0.0.1'}
+    assert cache.get('10.0.0.2').response == {'ip': 'previous'}
+    assert '10.0.0.3' not in cache
+    assert hosts['10.0.0.1'].errors == []
+    assert hosts['10.0.0.2'].errors and hosts['10.0.0.3'].errors
+
+
+@pytest.mark.asyncio
+async def test_states_polling_snmp_hosts_through_sweeper(monkeypatch):
+
+    async def get_states(ip: str):
+        return Host(ip)
+
+    monkeypatch.setattr(services.StatesMonitoring, 'get_coro', lambda self, ip, data_host: get_states(ip))
+    cache, sweeper = StatesCache(), Sweeper()
+    hosts = create_hosts('10.0.0.1', '10.0.0.2') | create_hosts('10.0.1.1', type_controller='Peek')
+    polling = services.StatesPolling(income_data=hosts, session=object(), cache=cache, sweeper=sweeper)
+    polling.allowed_to_request_hosts = hosts
+
+    await polling._make_request()
+    polling.add_response_to_data_hosts()
+
+    assert sweeper.swept == ['10.0.0.1', '10.0.0.2']
+    assert {ip: cache.get(ip).response for ip in hosts} == {ip: {'ip': ip} for ip in hosts}
@@ -0,0 +1,73 @@
+import json
+
+import pytest
+
+from api_v1.controller_management import services, views
+from api_v1.controller_management.schemas import BaseFields, StreamFormat
+from core.cache import StatesCache
+
+
+pytest_plugins = ('pytest_asyncio', )
+
+
+class Host:
+    def __init__(self, ip: str):
+        self.response_as_dict = {'ip': ip}
+
+
+async def get_states(ip: str):
+    if ip == '10.0.0.2':
+        raise ConnectionError('host unreachable')
+    return Host(ip)
+
+
+def create_states(monkeypatch, sorted_hosts: list) -> services.CachedStatesMonitoring:
+
+    async def sort_data_hosts(self):
+        sorted_hosts.append(True)
+        self.allowed_to_request_hosts = {
+            ip: BaseFields(ip_adress=ip, type_controller='Peek', errors=[])
+            for ip in ('10.0.0.1', '10.0.0.2')
+        }
+        self.bad_hosts = {'abra': {'errors': ['not found in database']}}
+
+    monkeypatch.setattr(services.CachedStatesMonitoring, 'sort_data_hosts', sort_data_hosts)
+    monkeypatch.setattr(services.StatesMonitoring, 'get_coro', lambda self, ip, data_host: get_states(ip))
+    return services.CachedStatesMonitoring(income_data=None, search_in_db=True, session=object(), cache=StatesCache())
+
+
+@pytest.mark.asyncio
+async def test_stream_request_host_errors(monkeypatch):
+    states = create_states(monkeypatch, sorted_hosts := [])
+    hosts = {}
+    async for host in states.stream_request():
+        hosts |= host
+
+    assert sorted_hosts == [True]
+    assert list(hosts)[0] == 'abra'
+    assert hosts['10.0.0.1'].response == {'ip': '10.0.0.1'} and hosts['10.0.0.1'].errors == []
+    assert 'host unreachable' in hosts['10.0.0.2'].errors[0]
+
+
+@pytest.mark.asyncio
+async def test_hosts_sorted_before_streaming_response(monkeypatch):
+    states = create_states(monkeypatch, sorted_hosts := [])
+    response = await views.create_streaming_response(states, StreamFormat.ndjson)
+    assert sorted_hosts == [True]
+
+    lines = [json.loads(line) async for line in response.body_iterator]
+    assert sorted_hosts == [True]
+    assert [next(iter(line)) for line in lines][0] == 'abra'
+    assert {next(iter(line)) for line in lines} == {'abra', '10.0.0.1', '10.0.0.2'}
+
+
+@pytest.mark.asyncio
+async def test_sort_error_before_streaming_response(monkeypatch):
+
+    async def sort_data_hosts(self):
+        raise RuntimeError('db is unavailable')
+
+    monkeypatch.setattr(services.CachedStatesMonitoring, 'sort_data_hosts', sort_data_hosts)
+    states = services.CachedStatesMonitoring(income_data=None, search_in_db=True, cache=StatesCache())
+    with pytest.raises(RuntimeError):
+        await views.create_streaming_response(states, StreamFormat.sse)
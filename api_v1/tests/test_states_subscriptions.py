@@ -0,0 +1,145 @@
+import asyncio
+import json
+
+import pytest
+from fastapi import WebSocketDisconnect
+
+from api_v1.controller_management import subscriptions
+from api_v1.controller_management.schemas import BaseFields
+from core.cache import StatesCache
+
+
+pytest_plugins = ('pytest_asyncio', )
+
+
+class FakeWebSocket:
+
+    def __init__(self, messages: list):
+        self._messages = list(messages)
+        self.sent = []
+
+    async def receive_json(self):
+        if not self._messages:
+            raise WebSocketDisconnect()
+        message = self._messages.pop(0)
+        if isinstance(message, Exception):
+            raise message
+        return message
+
+    async def send_json(self, data):
+        self.sent.append(data)
+
+
+def test_put_drop_oldest():
+    queue = asyncio.Queue(maxsize=3)
+    for i in range(5):
+        subscriptions.put_drop_oldest(queue, i)
+    assert [queue.get_nowait() for _ in range(queue.qsize())] == [2, 3, 4]
+
+
+@pytest.mark.asyncio
+async def test_watcher_uses_fresh_cache(monkeypatch):
+    cache = StatesCache()
+    watcher = subscriptions.HostStatesWatcher(
+        '10.0.0.1', BaseFields(ip_adress='10.0.0.1', type_controller='Swarco'), interval=5, cache=cache
+    )
+    requests = []
+
+    async def compose_request():
+        requests.append(True)
+        cache.add('10.0.0.1', {'data': 'polled'})
+        watcher._states.allowed_to_request_hosts = {'10.0.0.1': BaseFields(response={'data': 'polled'})}
+
+    monkeypatch.setattr(watcher._states, 'compose_request', compose_request)
+
+    cache.add('10.0.0.1', {'data': 'from poller'})
+    assert await watcher.poll() == {'data': 'from poller'}
+    assert requests == []
+
+    cache._states['10.0.0.1'] = cache.get('10.0.0.1')._replace(timestamp=0)
+    assert await watcher.poll() == {'data': 'polled'}
+    assert requests == [True]
+
+
+@pytest.mark.asyncio
+async def test_subscriber_bad_messages():
+    websocket = FakeWebSocket([
+        json.JSONDecodeError('Expecting value', 'abra', 0),
+        KeyError('text'),
+        ['10.0.0.1'],
+        {'subscribe': '10.0.0.1'},
+        {'unsubscribe': ['10.0.0.1']},
+    ])
+    subscriber = subscriptions.StatesSubscriber(websocket, subscriptions.StatesSubscriptions(interval=1))
+
+    with pytest.raises(WebSocketDisconnect):
+        await subscriber._receive_messages()
+
+    messages = [subscriber._queue.get_nowait() for _ in range(subscriber._queue.qsize())]
+    assert len(messages) == 4
+    assert all(list(message) == ['errors'] for message in messages)
+
+
+@pytest.mark.asyncio
+async def test_subscriber_queue_bounded():
+    states_subscriptions = subscriptions.StatesSubscriptions(interval=1, queue_size=2)
+    subscriber = subscriptions.StatesSubscriber(FakeWebSocket([]), states_subscriptions)
+    for i in range(5):
+        subscriptions.put_drop_oldest(subscriber._queue, {'10.0.0.1': {'current_stage': i}})
+    assert subscriber._queue.qsize() == 2
+    assert subscriber._queue.get_nowait() == {'10.0.0.1': {'current_stage': 3}}
+
+
+def test_put_drop_oldest_marks_stale_hosts():
+    queue = subscriptions.SubscriberQueue(maxsize=2)
+    assert subscriptions.put_drop_oldest(queue, {'10.0.0.1': {'current_stage': 1}}) is False
+    assert subscriptions.put_drop_oldest(queue, {'10.0.0.2': {'current_stage': 1}}) is False
+    assert subscriptions.put_drop_oldest(queue, {'10.0.0.2': {'current_stage': 2}}) is True
+    assert queue.stale == {'10.0.0.1'}
+
+
+def test_watcher_resyncs_stale_subscriber():
+    watcher = subscriptions.HostStatesWatcher(
+        '10.0.0.1', BaseFields(ip_adress='10.0.0.1', type_controller='Swarco'), interval=1, cache=StatesCache()
+    )
+    fresh_queue, stale_queue = subscriptions.SubscriberQueue(maxsize=2), subscriptions.SubscriberQueue(maxsize=2)
+    watcher.subscribers.update({fresh_queue, stale_queue})
+    watcher.last_response = {'data': {'current_stage': 2}}
+    # Сообщение хоста вытеснено из общей очереди сообщениями другого хоста
+    for message in ({'10.0.0.1': {'current_stage': 2}}, {'10.0.0.2': {}}, {'10.0.0.2': {}}):
+        subscriptions.put_drop_oldest(stale_queue, message)
+
+    watcher._resync_stale_subscribers()
+
+    assert fresh_queue.empty()
+    # Снимок вытеснил сообщение 10.0.0.2: его повторно отправит наблюдатель 10.0.0.2
+    assert stale_queue.stale == {'10.0.0.2'}
+    assert [stale_queue.get_nowait() for _ in range(stale_queue.qsize())] == [
+        {'10.0.0.2': {}}, {'10.0.0.1': {'data': {'current_stage': 2}}}
+    ]
+
+
+@pytest.mark.asyncio
+async def test_watcher_queue_overflow():
+    watcher = subscriptions.HostStatesWatcher(
+        '10.0.0.1', BaseFields(ip_adress='10.0.0.1', type_controller='Swarco'), interval=.001, cache=StatesCache()
+    )
+    responses = [{'data': {'current_stage': stage}, 'errors': []} for stage in range(1, 6)]
+    polled = asyncio.Event()
+
+    async def poll():
+        if not responses:
+            polled.set()
+            await asyncio.Event().wait()
+        return responses.pop(0)
+
+    watcher.poll = poll
+    queue = subscriptions.SubscriberQueue(maxsize=2)
+    watcher.subscribe(queue)
+    await asyncio.wait_for(polled.wait(), timeout=1)
+    await watcher.stop()
+
+    messages = [queue.get_nowait() for _ in range(queue.qsize())]
+    # Изменения фаз 2-4 удалены из очереди: последним клиент получает ответ целиком
+    assert messages[-1] == {'10.0.0.1': {'data': {'current_stage': 5}, 'errors': []}}
+    assert queue.stale == set()
@@ -0,0 +1,58 @@
+import time
+from typing import Any, NamedTuple
+
+
+class CachedResponse(NamedTuple):
+    """ Последний полученный ответ от хоста и время его получения. """
+
+    response: dict[str, Any]
+    timestamp: float
+
+    @property
+    def age(self) -> float:
+        return time.time() - self.timestamp
+
+
+class StatesCache:
+    """
+    Кэш последних состояний дк. Ключ - ipv4 хоста, значение - CachedResponse
+    с response_as_dict хоста.
+    """
+
+    def __init__(self):
+        self._states: dict[str, CachedResponse] = {}
+
+    def __len__(self):
+        return len(self._states)
+
+    def __contains__(self, ipv4: str):
+        return ipv4 in self._states
+
+    def add(self, ipv4: str, response: dict[str, Any]) -> CachedResponse:
+        """
+        Добавляет(перезаписывает) состояние хоста в кэш.
+        :param ipv4: ipv4 хоста.
+        :param response: response_as_dict хоста.
+        :return: Добавленная запись кэша.
+        """
+        self._states[ipv4] = CachedResponse(response, time.time())
+        return self._states[ipv4]
+
+    def get(self, ipv4: str, max_age: float = None) -> CachedResponse | None:
+        """
+        Возвращает состояние хоста из кэша.
+        :param ipv4: ipv4 хоста.
+        :param max_age: Максимально допустимый возраст записи в секундах.
+                        Если None, возраст записи не проверяется.
+        :return: Запись кэша, если она есть и не старше max_age, иначе None.
+        """
+        cached = self._states.get(ipv4)
+        if cached is None or (max_age is not None and cached.age > max_age):
+            return None
+        return cached
+
+    def remove(self, ipv4: str) -> CachedResponse | None:
+        return self._states.pop(ipv4, None)
+
+    def clear(self) -> None:
+        self._states.clear()
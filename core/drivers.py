@@ -1,11 +1,91 @@
+import time
+from types import SimpleNamespace
+
 import aiohttp
 
 
+class HttpPoolMetrics:
+    """
+    Счётчики использования пула соединений aiohttp.ClientSession.
+    Заполняются через aiohttp.TraceConfig: созданные и переиспользованные соединения,
+    ожидания свободного соединения в пуле и суммарное время ожидания.
+    """
+
+    def __init__(self):
+        self.connections_created = 0
+        self.connections_reused = 0
+        self.queued = 0
+        self.queued_time = 0.
+        self.max_queued_time = 0.
+
+    def create_trace_config(self) -> aiohttp.TraceConfig:
+        trace_config = aiohttp.TraceConfig()
+        trace_config.on_connection_create_end.append(self._on_connection_create_end)
+        trace_config.on_connection_reuseconn.append(self._on_connection_reuseconn)
+        trace_config.on_connection_queued_start.append(self._on_connection_queued_start)
+        trace_config.on_connection_queued_end.append(self._on_connection_queued_end)
+        return trace_config
+
+    async def _on_connection_create_end(self, session, trace_config_ctx: SimpleNamespace, params):
+        self.connections_created += 1
+
+    async def _on_connection_reuseconn(self, session, trace_config_ctx: SimpleNamespace, params):
+        self.connections_reused += 1
+
+    async def _on_connection_queued_start(self, session, trace_config_ctx: SimpleNamespace, params):
+        self.queued += 1
+        trace_config_ctx.queued_start = time.monotonic()
+
+    async def _on_connection_queued_end(self, session, trace_config_ctx: SimpleNamespace, params):
+        queued_time = time.monotonic() - trace_config_ctx.queued_start
+        self.queued_time += queued_time
+        self.max_queued_time = max(self.max_queued_time, queued_time)
+
+    def as_dict(self) -> dict[str, int | float]:
+        return {
+            'connections_created': self.connections_created,
+            'connections_reused': self.connections_reused,
+            'queued': self.queued,
+            'queued_time': round(self.queued_time, 3),
+            'max_queued_time': round(self.max_queued_time, 3),
+        }
+
+
 class AsyncClientHTTP:
-    def __init__(self, base_url=None, *, timeout: float = 1, **kwargs):
+    """
+    Общая http сессия для запросов к дк.
+    Пул соединений настраивается для большого количества хостов с raw ip:
+    limit - общее количество соединений, limit_per_host - количество соединений
+    с одним хостом(web сервер дк не выдерживает много одновременных соединений),
+    keepalive_timeout - время жизни неиспользуемого соединения в пуле.
+    Кэш DNS отключен, так как запросы выполняются по ip.
+    sock_read - таймаут чтения ответа, используется и в запросах AsyncHttpRequests.
+    """
+
+    def __init__(
+            self,
+            base_url=None,
+            *,
+            timeout: float = 1,
+            sock_read: float | None = None,
+            limit: int = 500,
+            limit_per_host: int = 2,
+            keepalive_timeout: float = 30,
+            use_dns_cache: bool = False,
+            **kwargs
+    ):
+        self._connector = aiohttp.TCPConnector(
+            limit=limit,
+            limit_per_host=limit_per_host,
+            keepalive_timeout=keepalive_timeout,
+            use_dns_cache=use_dns_cache
+        )
+        self._metrics = HttpPoolMetrics()
         self._session = aiohttp.ClientSession(
             base_url=base_url,
-            timeout=aiohttp.ClientTimeout(timeout),
+            connector=self._connector,
+            timeout=aiohttp.ClientTimeout(timeout, sock_read=sock_read),
+            trace_configs=[self._metrics.create_trace_config()],
             **kwargs
         )
 
@@ -17,6 +97,54 @@ class AsyncClientHTTP:
     def session(self):
         return self._session
 
+    @property
+    def connector(self) -> aiohttp.TCPConnector:
+        return self._connector
+
+    @property
+    def metrics(self) -> HttpPoolMetrics:
+        return self._metrics
+
+    def get_pool_stats(self) -> dict[str, int | float]:
+        """
+        Возвращает текущее состояние пула соединений и счётчики HttpPoolMetrics.
+        Состояние пула читается из приватных атрибутов TCPConnector(aiohttp==3.10.3
+        закреплён в requirements.txt/pyproject.toml). Если атрибуты недоступны в другой
+        версии aiohttp, значения acquired, idle, hosts, waiting равны None.
+        :return: Словарь вида:
+                 {
+                    "limit": 500,
+                    "limit_per_host": 2,
+                    "acquired": 12,
+                    "idle": 40,
+                    "hosts": 52,
+                    "waiting": 0,
+                    "connections_created": 52,
+                    "connections_reused": 1830,
+                    "queued": 3,
+                    "queued_time": 0.121,
+                    "max_queued_time": 0.057
+                 }
+        """
+        connector = self._connector
+        return {
+            'limit': connector.limit,
+            'limit_per_host': connector.limit_per_host,
+            **self._get_connector_state(),
+            **self._metrics.as_dict()
+        }
+
+    def _get_connector_state(self) -> dict[str, int | None]:
+        connector = self._connector
+        try:
+            return {
+                'acquired': len(connector._acquired),
+                'idle': sum(len(conns) for conns in connector._conns.values()),
+                'hosts': len(connector._acquired_per_host.keys() | connector._conns.keys()),
+                'waiting': sum(len(waiters) for waiters in connector._waiters.values()),
+            }
+        except (AttributeError, TypeError):
+            return dict.fromkeys(('acquired', 'idle', 'hosts', 'waiting'))
+
     async def close(self):
         await self._session.close()
-
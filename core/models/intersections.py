@@ -1,5 +1,5 @@
 
-from sqlalchemy import DateTime, func, Column
+from sqlalchemy import DateTime, func, Column, Index
 from sqlalchemy.orm import Mapped
 
 # from .base import Base
@@ -8,6 +8,18 @@ from core.models.base import Base
 
 class TrafficLightsObjects(Base):
     __tablename__ = "toolkit_trafficlightsobjects"
+    __table_args__ = (
+        Index(
+            'ix_toolkit_trafficlightsobjects_number',
+            'number',
+            postgresql_include=['ip_adress', 'type_controller', 'address', 'description']
+        ),
+        Index(
+            'ix_toolkit_trafficlightsobjects_ip_adress',
+            'ip_adress',
+            postgresql_include=['number', 'type_controller', 'address', 'description']
+        ),
+    )
 
     number: Mapped[int]
     description: Mapped[str]
@@ -14,6 +14,79 @@ class RunApp(BaseModel):
     reload: bool = True
 
 
+class HttpClientConfig(BaseModel):
+    timeout: float = 1
+    # Таймаут чтения ответа дк, None - не ограничен
+    sock_read: float | None = None
+    limit: int = 500
+    limit_per_host: int = 2
+    keepalive_timeout: float = 30
+    use_dns_cache: bool = False
+
+
+class StatesPollingConfig(BaseModel):
+    enabled: bool = True
+    interval: float = 10
+    subscriptions_interval: float = 2
+    # Допустимый возраст состояния в кэше по умолчанию, в интервалах опроса
+    max_age_intervals: float = 3
+    snmp_concurrency: int = 100
+    subnet_rate: float = 20
+    subscriber_queue_size: int = 100
+
+    @property
+    def max_age(self) -> float:
+        return self.interval * self.max_age_intervals
+
+
+class HostsRegistryConfig(BaseModel):
+    enabled: bool = True
+    refresh_interval: float = 60
+
+
+class ScnCacheConfig(BaseModel):
+    # Время жизни scn ug405 хоста в кэше
+    ttl: float = 3600
+
+
+class PeekPostLimiterConfig(BaseModel):
+    # Токен-бакет POST запросов к одному Peek
+    burst: int = 5
+    rate: float = 5
+    min_rate: float = .5
+    backoff_factor: float = .5
+    recovery_step: float = .5
+    # Количество одновременных POST запросов к одному Peek
+    max_concurrent: int = 5
+
+
+class PeekInputsCacheConfig(BaseModel):
+    # Время жизни входов Peek в кэше
+    ttl: float = 30
+
+
+class ManagementBatchConfig(BaseModel):
+    snmp_concurrency: int = 100
+    http_concurrency: int = 10
+    ssh_concurrency: int = 10
+    jobs_ttl: float = 3600
+
+
+class SwarcoSshPoolConfig(BaseModel):
+    max_size: int = 100
+    idle_timeout: float = 600
+    keepalive_interval: float = 30
+
+
+class ConflictsBatchConfig(BaseModel):
+    max_workers: int | None = None
+    max_jobs: int = 500
+    # Каталог исходных конфигов: path_to_src_config заданий должен находиться внутри него
+    configs_dir: Path = BASE_DIR / 'conflicts_configs'
+    # Каталог кэша результатов расчёта конфликтов, None - кэш отключен
+    results_cache_dir: Path | None = None
+
+
 class SettingsDb(BaseSettings):
     POSTGRES_USER: str
     POSTGRES_PASSWORD: str
@@ -41,9 +114,21 @@ class Settings(BaseSettings):
     traffic_lights_tag_static_properties: str = 'Traffic lights static properties'
     traffic_lights_tag_monitoring: str = 'Traffic lights monitoring'
     traffic_lights_tag_management: str = 'Traffic lights management'
+    conflicts_prefix: str = '/conflicts'
+    conflicts_tag: str = 'Conflicts'
 
     run_config_default: RunApp = RunApp()
     run_config_sdp: RunApp = RunApp(host='192.168.45.93', port=8001)
 
+    http_client: HttpClientConfig = HttpClientConfig()
+    states_polling: StatesPollingConfig = StatesPollingConfig()
+    hosts_registry: HostsRegistryConfig = HostsRegistryConfig()
+    swarco_ssh_pool: SwarcoSshPoolConfig = SwarcoSshPoolConfig()
+    peek_post_limiter: PeekPostLimiterConfig = PeekPostLimiterConfig()
+    scn_cache: ScnCacheConfig = ScnCacheConfig()
+    peek_inputs_cache: PeekInputsCacheConfig = PeekInputsCacheConfig()
+    management_batch: ManagementBatchConfig = ManagementBatchConfig()
+    conflicts_batch: ConflictsBatchConfig = ConflictsBatchConfig()
+
 settings_db = SettingsDb()
 settings = Settings()
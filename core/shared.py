@@ -1,4 +1,22 @@
+from core.cache import StatesCache
 from core.drivers import AsyncClientHTTP
+from core.settings import settings
+from sdp_lib.management_controllers.http.peek.inputs_cache import PeekInputsCache
+from sdp_lib.management_controllers.http.peek.peek_http import PeekWebHosts
+from sdp_lib.management_controllers.http.rate_limiter import HostsRateLimiter
+from sdp_lib.management_controllers.snmp.snmp_core import Ug405Hosts
+from sdp_lib.management_controllers.snmp.snmp_utils import ScnCache
+from sdp_lib.management_controllers.ssh.ssh_pool import SwarcoSshPool
 
 HTTP_CLIENT_SESSIONS: dict[int, AsyncClientHTTP | None] = {0: None}
-SWARCO_SSH_CONNECTIONS = {}
\ No newline at end of file
+SWARCO_SSH_SESSIONS = SwarcoSshPool(**settings.swarco_ssh_pool.model_dump())
+STATES_CACHE = StatesCache()
+PEEK_POST_RATE_LIMITER = HostsRateLimiter(**settings.peek_post_limiter.model_dump())
+# Единственный ограничитель POST запросов к Peek для всех экземпляров PeekWebHosts
+PeekWebHosts.post_rate_limiter = PEEK_POST_RATE_LIMITER
+PEEK_INPUTS_CACHE = PeekInputsCache(**settings.peek_inputs_cache.model_dump())
+# Единственный кэш входов для всех экземпляров PeekWebHosts
+PeekWebHosts.inputs_cache = PEEK_INPUTS_CACHE
+UG405_SCN_CACHE = ScnCache(**settings.scn_cache.model_dump())
+# Единственный кэш scn для всех экземпляров Ug405Hosts
+Ug405Hosts.scn_cache = UG405_SCN_CACHE
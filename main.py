@@ -7,18 +7,45 @@ from core.models import Base, db_helper
 from api_v1 import router as router_v1
 from core.settings import settings
 from core.drivers import AsyncClientHTTP
-from core.shared import HTTP_CLIENT_SESSIONS
+from core.shared import HTTP_CLIENT_SESSIONS, SWARCO_SSH_SESSIONS
+from api_v1.controller_management.polling import StatesPoller
+from api_v1.controller_management.services import Controllers
+from api_v1.controller_management.subscriptions import states_subscriptions
+from api_v1.controller_management.crud.registry import hosts_registry
+from api_v1.controller_management.jobs import management_jobs
+from api_v1.conflicts.views import conflicts_batch
+from sdp_lib.management_controllers.snmp.snmp_requests import udp_transport_targets
 
 
 @asynccontextmanager
 async def lifespan(app: FastAPI):
-    HTTP_CLIENT_SESSIONS[0] = AsyncClientHTTP()
+    HTTP_CLIENT_SESSIONS[0] = AsyncClientHTTP(**settings.http_client.model_dump())
     async with db_helper.engine.connect() as conn:
         await conn.run_sync(Base.metadata.create_all)
+    if settings.hosts_registry.enabled:
+        await hosts_registry.load()
+        hosts_registry.start()
+    states_poller = StatesPoller(
+        interval=settings.states_polling.interval,
+        session=HTTP_CLIENT_SESSIONS[0].session,
+        snmp_concurrency=settings.states_polling.snmp_concurrency,
+        subnet_rate=settings.states_polling.subnet_rate
+    )
+    if settings.states_polling.enabled:
+        states_poller.start()
+    SWARCO_SSH_SESSIONS.start()
     yield
 
+    await states_poller.stop()
+    await states_subscriptions.close()
+    await management_jobs.close()
+    conflicts_batch.close()
+    await hosts_registry.stop()
+    await SWARCO_SSH_SESSIONS.close()
     for identification, session in HTTP_CLIENT_SESSIONS.items():
         await session.close()
+    udp_transport_targets.clear()
+    Controllers.snmp_engine.close_dispatcher()
 
 # routr = APIRouter(prefix=f'{settings.api_v1_prefix}{settings.traffic_lights_prefix}')
 
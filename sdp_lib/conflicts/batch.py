@@ -0,0 +1,222 @@
+"""
+Пакетный расчёт конфликтов и формирование конфигов(.PTC2/.DAT) для многих перекрёстков.
+Каждое задание(фазы перекрёстка и путь к исходному конфигу) выполняется в отдельном процессе
+ProcessPoolExecutor, результаты возвращаются по мере выполнения заданий.
+
+Запуск из командной строки:
+    python -m sdp_lib.conflicts.batch jobs.json --max-workers 4 [--results-cache-dir DIR]
+jobs.json - список заданий вида:
+    [
+        {"stages": {"1": "1,2,3", "2": "4,5,6"}, "path_to_src_config": "CO3992.DAT"},
+        {"stages": {"1": "1,2", "2": "3,4"}, "path_to_src_config": "CO11.PTC2"},
+        {"stages": {"1": "1,2", "2": "3,4"}}
+    ]
+Результат каждого задания выводится отдельной строкой json.
+"""
+
+import argparse
+import asyncio
+import concurrent.futures
+import json
+import logging
+import pathlib
+import sys
+from collections.abc import AsyncIterator, Iterable, Iterator
+from typing import Any, NamedTuple
+
+from sdp_lib.conflicts.calculate_conflicts import (
+    CommonConflictsAndStagesAPI,
+    CreateConfigurationFileBase,
+    DataFields,
+    PeekConflictsAndStagesAPI,
+    SwarcoConflictsAndStagesAPI
+)
+from sdp_lib.conflicts.results_cache import ConflictsResultsCache
+
+
+logger = logging.getLogger(__name__)
+
+
+matches_config_suffix = {
+    '.ptc2': SwarcoConflictsAndStagesAPI,
+    '.dat': PeekConflictsAndStagesAPI,
+}
+
+matches_type_controller = {
+    SwarcoConflictsAndStagesAPI.controller_type: SwarcoConflictsAndStagesAPI,
+    PeekConflictsAndStagesAPI.controller_type: PeekConflictsAndStagesAPI,
+}
+
+
+class ConflictsJob(NamedTuple):
+    stages: dict[str, str]
+    path_to_src_config: str | None = None
+    type_controller: str | None = None
+    prefix_new_config: str = 'new_'
+
+
+def get_api_class(job: ConflictsJob) -> type[CommonConflictsAndStagesAPI]:
+    """
+    Возвращает класс API расчёта для задания. Если тип дк не задан,
+    определяется по расширению исходного конфига.
+    :param job: Задание.
+    :return: Класс API расчёта. Если нет исходного конфига, CommonConflictsAndStagesAPI.
+    """
+    if job.type_controller is not None:
+        return matches_type_controller[job.type_controller]
+    if job.path_to_src_config is None:
+        return CommonConflictsAndStagesAPI
+    return matches_config_suffix[pathlib.Path(job.path_to_src_config).suffix.lower()]
+
+
+def run_job(job: ConflictsJob) -> dict[str, Any]:
+    """
+    Выполняет расчёт конфликтов и формирование конфига для задания.
+    Выполняется в процессе ProcessPoolExecutor. Traceback ошибки записывается в лог,
+    в результат добавляется только сообщение об ошибке.
+    :param job: Задание.
+    :return: Словарь с результатом расчёта.
+    """
+    try:
+        api_class = get_api_class(job)
+        if issubclass(api_class, CreateConfigurationFileBase):
+            api = api_class(
+                job.stages,
+                path_to_src_config=job.path_to_src_config,
+                prefix_new_config=job.prefix_new_config
+            )
+            api.build_data(save_result_json=False)
+        else:
+            api = api_class(job.stages)
+            api.build_data()
+    except Exception as exc:
+        logger.exception(f'Ошибка выполнения задания {job.path_to_src_config}: {exc!r}')
+        return {DataFields.errors.value: [f'{exc!r}']}
+    instance_data = api.instance_data
+    return {
+        DataFields.type_controller.value: instance_data[DataFields.type_controller.value],
+        DataFields.errors.value: instance_data[DataFields.errors.value],
+        DataFields.number_of_groups.value: instance_data[DataFields.number_of_groups.value],
+        DataFields.number_of_stages.value: instance_data[DataFields.number_of_stages.value],
+        DataFields.sum_conflicts.value: instance_data[DataFields.sum_conflicts.value],
+        DataFields.stages_bin_vals.value: instance_data[DataFields.stages_bin_vals.value],
+        DataFields.config_file.value: instance_data.get(DataFields.config_file.value),
+    }
+
+
+def create_job_result(num_job: int, job: ConflictsJob, result: dict[str, Any]) -> dict[str, Any]:
+    return {
+        'job': num_job,
+        DataFields.path_to_file.value: job.path_to_src_config,
+        **result
+    }
+
+
+def init_worker(results_cache_dir: str | None) -> None:
+    """
+    Инициализация процесса пула: включает кэш результатов расчёта, если задан каталог кэша.
+    :param results_cache_dir: Каталог кэша результатов расчёта. None - кэш не используется.
+    """
+    if results_cache_dir is not None:
+        CommonConflictsAndStagesAPI.results_cache = ConflictsResultsCache(results_cache_dir)
+
+
+class ConflictsBatch:
+    """
+    Выполнение заданий расчёта конфликтов в ProcessPoolExecutor.
+    Пул процессов создаётся при первом запуске заданий.
+    Если задан results_cache_dir, процессы пула используют общий дисковый кэш результатов расчёта.
+    """
+
+    def __init__(self, max_workers: int = None, results_cache_dir: str | pathlib.Path = None):
+        self._max_workers = max_workers
+        self._results_cache_dir = None if results_cache_dir is None else str(results_cache_dir)
+        self._executor: concurrent.futures.ProcessPoolExecutor | None = None
+
+    @property
+    def executor(self) -> concurrent.futures.ProcessPoolExecutor:
+        if self._executor is None:
+            self._executor = concurrent.futures.ProcessPoolExecutor(
+                max_workers=self._max_workers,
+                initializer=init_worker,
+                initargs=(self._results_cache_dir, )
+            )
+        return self._executor
+
+    def run(self, jobs: Iterable[ConflictsJob]) -> Iterator[dict[str, Any]]:
+        """
+        Выполняет задания и возвращает результаты по мере выполнения заданий.
+        :param jobs: Задания.
+        :return: Итератор результатов заданий(см. run_job) с номером задания "job".
+        """
+        futures = {self.executor.submit(run_job, job): (num_job, job) for num_job, job in enumerate(jobs)}
+        try:
+            for future in concurrent.futures.as_completed(futures):
+                num_job, job = futures[future]
+                try:
+                    result = future.result()
+                except Exception as exc:
+                    logger.exception(f'Ошибка выполнения задания {num_job}: {exc!r}')
+                    result = {DataFields.errors.value: [f'{exc!r}']}
+                yield create_job_result(num_job, job, result)
+        finally:
+            for future in futures:
+                future.cancel()
+
+    async def _run_job_async(self, num_job: int, job: ConflictsJob) -> dict[str, Any]:
+        try:
+            result = await asyncio.get_running_loop().run_in_executor(self.executor, run_job, job)
+        except Exception as exc:
+            logger.exception(f'Ошибка выполнения задания {num_job}: {exc!r}')
+            result = {DataFields.errors.value: [f'{exc!r}']}
+        return create_job_result(num_job, job, result)
+
+    async def run_async(self, jobs: Iterable[ConflictsJob]) -> AsyncIterator[dict[str, Any]]:
+        """
+        Асинхронный вариант run. Расчёт выполняется в процессах пула,
+        цикл событий только ожидает результаты.
+        :param jobs: Задания.
+        :return: Асинхронный итератор результатов заданий с номером задания "job".
+        """
+        tasks = [
+            asyncio.create_task(self._run_job_async(num_job, job))
+            for num_job, job in enumerate(jobs)
+        ]
+        try:
+            for next_completed in asyncio.as_completed(tasks):
+                yield await next_completed
+        finally:
+            for task in tasks:
+                task.cancel()
+
+    def close(self) -> None:
+        if self._executor is not None:
+            self._executor.shutdown(cancel_futures=True)
+            self._executor = None
+
+
+def load_jobs(path_to_jobs: str) -> list[ConflictsJob]:
+    with open(path_to_jobs, encoding='utf-8') as f:
+        return [ConflictsJob(**job) for job in json.load(f)]
+
+
+def main():
+    parser = argparse.ArgumentParser(description='Пакетный расчёт конфликтов и формирование конфигов .PTC2/.DAT')
+    parser.add_argument('jobs', help='Путь к json файлу со списком заданий')
+    parser.add_argument('--max-workers', type=int, default=None, help='Количество процессов')
+    parser.add_argument(
+        '--results-cache-dir', default=None, help='Каталог кэша результатов расчёта(по умолчанию кэш отключен)'
+    )
+    args = parser.parse_args()
+
+    batch = ConflictsBatch(max_workers=args.max_workers, results_cache_dir=args.results_cache_dir)
+    try:
+        for result in batch.run(load_jobs(args.jobs)):
+            sys.stdout.write(f'{json.dumps(result, ensure_ascii=False)}\n')
+            sys.stdout.flush()
+    finally:
+        batch.close()
+
+
+if __name__ == '__main__':
+    main()
@@ -1,4 +1,5 @@
 import abc
+import io
 import json
 import math
 import os.path
@@ -9,7 +10,9 @@ from pathlib import Path
 from typing import Dict, Set, Tuple, List, Iterator, TextIO
 import logging
 
-from sdp_lib.utils_common import set_curr_datetime
+from sdp_lib.conflicts.results_cache import ConflictsResultsCache
+from sdp_lib.peek_controller.dat_file import DatFile, TableField, write_table
+from sdp_lib.utils_common.utils_common import set_curr_datetime
 
 # from toolkit.sdp_lib.utils_common import set_curr_datetime
 
@@ -94,6 +97,9 @@ class Utils:
 
 class BaseConflictsAndStagesCalculations:
 
+    # Режим отладки: проверка конфликтов каждой группы методом self._supervisor_conflicts
+    check_conflicts_by_supervisor: bool = False
+
     def __init__(self, stages_groups_data: Dict):
 
         self.instance_data = {
@@ -223,18 +229,64 @@ class BaseConflictsAndStagesCalculations:
 
     def calculate_conflicts_and_stages(self) -> None:
         """
-        Формирует словарь для всех групп с данными о группе: конфликтами и фазами, в которых участвует направеление
+        Формирует словарь для всех групп с данными о группе: конфликтами и фазами, в которых участвует направеление.
+        Принадлежность групп фазам представлена битовыми масками: бит i маски - группа с индексом i
+        в self.instance_data[DataFields.sorted_all_num_groups.value]. Для каждой группы за один проход
+        по фазам формируется маска групп, которые хотя бы в одной фазе участвуют вместе с группой.
+        Конфликтные группы - все остальные группы, кроме самой группы.
         :return: None
         """
 
         groups_prop = self.instance_data[DataFields.groups_property.value]
-        for group in self.instance_data.get(DataFields.sorted_all_num_groups.value):
-            groups_prop[group] = self._get_conflicts_and_stages_properties_for_group(group)
+        sorted_all_num_groups = self.instance_data[DataFields.sorted_all_num_groups.value]
+        sorted_stages_data = self.instance_data[DataFields.sorted_stages_data.value]
+
+        bits = {group: 1 << i for i, group in enumerate(sorted_all_num_groups)}
+        all_groups_mask = (1 << len(sorted_all_num_groups)) - 1
+        not_enemy_masks = dict(bits)
+        groups_in_stages = {group: set() for group in sorted_all_num_groups}
+        for stage, groups_in_stage in sorted_stages_data.items():
+            stage_mask = 0
+            for group in groups_in_stage:
+                stage_mask |= bits[group]
+            for group in groups_in_stage:
+                not_enemy_masks[group] |= stage_mask
+                groups_in_stages[group].add(stage)
+
+        all_stages = set(sorted_stages_data.keys())
+        for group in sorted_all_num_groups:
+            groups_prop[group] = self._get_conflicts_and_stages_properties_for_group(
+                group,
+                groups_in_stages[group],
+                self._get_groups_from_mask(all_groups_mask & ~not_enemy_masks[group], sorted_all_num_groups),
+                all_stages
+            )
+
+    @staticmethod
+    def _get_groups_from_mask(mask: int, sorted_all_num_groups: List) -> Set:
+        """
+        Формирует set из групп, биты которых установлены в mask.
+        :param mask: Битовая маска групп.
+        :param sorted_all_num_groups: Отсортированный список всех групп, индекс группы - номер бита.
+        :return: set из групп.
+        """
+
+        groups = set()
+        while mask:
+            lowest_bit = mask & -mask
+            groups.add(sorted_all_num_groups[lowest_bit.bit_length() - 1])
+            mask ^= lowest_bit
+        return groups
 
-    def _get_conflicts_and_stages_properties_for_group(self, num_group: int):
+    def _get_conflicts_and_stages_properties_for_group(
+            self, num_group: int, group_in_stages: Set, conflict_groups: Set, all_stages: Set
+    ):
         """
-        Формирует конфликты для группы.
-        :param num_group: Номер группы, для котороый будут сформированы конфликты в виде set
+        Формирует свойства группы.
+        :param num_group: Номер группы.
+        :param group_in_stages: Фазы, в которых участвует num_group.
+        :param conflict_groups: Группы, с которыми есть конфликт у группы num_group.
+        :param all_stages: Все фазы.
         :return: Словарь data для num_group вида:
                  {
                   'stages': {фазы(в которых участвует num_group) типа str},
@@ -243,16 +295,10 @@ class BaseConflictsAndStagesCalculations:
                 Пример data: {'stages': {'1', '2'}, 'enemy_groups': {'4', '5', '6'}}
         """
 
-        group_in_stages = set()
-        conflict_groups = {g for g in self.instance_data[DataFields.all_num_groups.value] if g != num_group}
-        for stage, groups_in_stage in self.instance_data[DataFields.sorted_stages_data.value].items():
-            if num_group in groups_in_stage:
-                group_in_stages.add(stage)
-                for g in groups_in_stage:
-                    conflict_groups.discard(g)
-        assert conflict_groups == self._supervisor_conflicts(num_group)
+        if self.check_conflicts_by_supervisor:
+            assert conflict_groups == self._supervisor_conflicts(num_group)
         is_always_red: bool = False if group_in_stages else True
-        is_always_green: bool = group_in_stages == set(self.instance_data[DataFields.sorted_stages_data.value].keys())
+        is_always_green: bool = group_in_stages == all_stages
         assert not ((is_always_red is True) and (is_always_green is True))
         data = {
             DataFields.stages.value: group_in_stages,
@@ -265,7 +311,8 @@ class BaseConflictsAndStagesCalculations:
     def _supervisor_conflicts(self, num_group: int) -> Set:
         """
         Метод формирует set из групп, с которыми есть конфликт у группы num_group. Является проверкой
-        корректности формирования конфликтных групп метода self.get_conflicts_and_stages_for_group.
+        корректности формирования конфликтных групп метода self.calculate_conflicts_and_stages
+        в режиме отладки(self.check_conflicts_by_supervisor).
         Алгоритм формирования set из конфликтных групп:
         В цикле перебираем все группы из self.instance_data[DataFields.sorted_all_num_groups.value] и
         смотрим, если num_group и очередная перебираемая группа не присутсвуют вместе ни в одной фазе, то
@@ -297,7 +344,12 @@ class OutputDataCalculations(BaseConflictsAndStagesCalculations):
         return '\n'.join((''.join(m) for m in matrix)) + '\n'
 
     def _create_row_output_matrix(
-            self, all_numbers_groups: List, current_group: int = None, enemy_groups: Set = None, first_row=False
+            self,
+            all_numbers_groups: List,
+            current_group: int = None,
+            enemy_groups: Set = None,
+            first_row=False,
+            num_row: int = None
     ) -> List[str]:
         """
         Формирует строку для матрицы в виде списка.
@@ -305,21 +357,23 @@ class OutputDataCalculations(BaseConflictsAndStagesCalculations):
         :param current_group: Номер группы, для которой будет сформирован список.
         :param enemy_groups: Коллекция set из конфликтных групп для current_group.
         :param first_row: Является ли строка первой строкой матрицы("шапка")
+        :param num_row: Номер строки в матрице. Если None, строка добавляется в конец текущей матрицы.
         :return: Список-строка для матрицы конфликтов группы current_group, если first_row == False,
                  иначе список-шапка матрицы
         """
 
         if not first_row:
+            if num_row is None:
+                num_row = len(self.instance_data[DataFields.output_matrix.value])
             row = [f'|0{current_group}|' if len(str(current_group)) == 1 else f'|{current_group}|']
             row += [
                 DataFields.no_conflict_O.value if gr not in enemy_groups else DataFields.conflict_K.value
                 for gr in all_numbers_groups
             ]
-            row[len(self.instance_data[DataFields.output_matrix.value])] = DataFields.cross_group_star_matrix.value
+            row[num_row] = DataFields.cross_group_star_matrix.value
         else:
             row = [DataFields.cross_group_star_matrix.value]
             row += [f'|0{g}|' if len(str(g)) == 1 else f'|{g}|' for g in all_numbers_groups]
-        print(f'row: {row}')
         return row
 
     def _create_row_f997(self, num_groups, current_group: int, enemy_groups: Set[int]) -> List[str]:
@@ -428,6 +482,17 @@ class CommonConflictsAndStagesAPI(OutputDataCalculations):
     и т.д, а также формирования текстового файла с учётом рассчитанных даных
     """
     controller_type = 'Общий'
+    # Кэш результатов расчёта для одинаковых таблиц фаз. По умолчанию отключен(None) -
+    # расчёт выполняется всегда.
+    results_cache: ConflictsResultsCache | None = None
+    cached_fields = (
+        DataFields.output_matrix.value,
+        DataFields.matrix_F997.value,
+        DataFields.numbers_conflicts_groups.value,
+        DataFields.stages_bin_vals.value,
+        DataFields.stages_bin_vals_f009.value,
+        DataFields.sum_conflicts.value
+    )
 
     def __init__(self, stages_groups_data: Dict, create_txt: bool = False, path_to_save_txt: str = None):
         super().__init__(stages_groups_data)
@@ -500,20 +565,87 @@ class CommonConflictsAndStagesAPI(OutputDataCalculations):
             DataFields.created.value: True if err is None else False
         }
 
+    def _get_results_cache_key(self) -> str:
+        return self.results_cache.get_key(
+            self.instance_data[DataFields.sorted_stages_data.value], self.get_controller_type()
+        )
+
+    def _load_results_from_cache(self) -> bool:
+        """
+        Загружает из кэша self.results_cache свойства групп и данные для вывода(self.cached_fields),
+        рассчитанные ранее для такой же таблицы фаз.
+        :return: True, если результат есть в кэше, иначе False.
+        """
+
+        if self.results_cache is None:
+            return False
+        results = self.results_cache.get(self._get_results_cache_key())
+        if results is None:
+            return False
+        try:
+            groups_property = self._get_groups_property_from_cached_results(results)
+            cached_data = {field: results[field] for field in self.cached_fields}
+        except (KeyError, TypeError, ValueError) as exc:
+            logger.warning('Некорректный результат в кэше конфликтов: %r', exc)
+            return False
+        self.instance_data[DataFields.groups_property.value] = groups_property
+        self.instance_data |= cached_data
+        return True
+
+    def _get_groups_property_from_cached_results(self, results: Dict) -> Dict:
+        """
+        Формирует свойства групп из результата в кэше и проверяет, что группы и их свойства
+        совпадают с текущей таблицей фаз.
+        :param results: Результат из кэша(см. _save_results_to_cache).
+        :return: Словарь вида {группа: свойства группы}.
+        """
+        groups_property = {}
+        for group, property_group in results[DataFields.groups_property.value]:
+            if not isinstance(property_group, dict):
+                raise TypeError(f'свойства группы {group!r} должны быть dict')
+            missing = {
+                DataFields.stages.value, DataFields.enemy_groups.value,
+                DataFields.always_red.value, DataFields.always_green.value
+            } - property_group.keys()
+            if missing:
+                raise KeyError(f'нет свойств {sorted(missing)} группы {group!r}')
+            groups_property[group] = property_group
+        if list(groups_property) != self.instance_data[DataFields.sorted_all_num_groups.value]:
+            raise ValueError('группы не совпадают с таблицей фаз')
+        return groups_property
+
+    def _save_results_to_cache(self) -> None:
+        """
+        Записывает в кэш self.results_cache свойства групп и данные для вывода(self.cached_fields).
+        Номера групп могут быть float, поэтому свойства групп записываются списком пар [группа, свойства].
+        :return: None
+        """
+
+        if self.results_cache is None:
+            return
+        groups_property = []
+        for group, property_group in self.instance_data[DataFields.groups_property.value].items():
+            property_group = dict(property_group)
+            Utils.set_to_list(property_group)
+            groups_property.append([group, property_group])
+        results = {field: self.instance_data[field] for field in self.cached_fields}
+        results[DataFields.groups_property.value] = groups_property
+        self.results_cache.add(self._get_results_cache_key(), results)
+
     def build_data(self, create_json=False):
         """
         Основной метод для получения данных по расчетам конфликтов, привзяки фаз и прочих значений.
+        Если для такой же таблицы фаз и типа дк результат расчёта есть в self.results_cache,
+        расчёт конфликтов не выполняется.
         :param create_json: формирует файл .json с данными, полученными в результате расчетов(self.instance_data)
         :return:
         """
 
-        functions: tuple = (
-            self.processing_data_for_calculation, self.calculate_conflicts_and_stages, self.create_data_for_output
-        )
-        for func in functions:
-            if self.instance_data[DataFields.errors.value]:
-                break
-            func()
+        self.processing_data_for_calculation()
+        if not self.instance_data[DataFields.errors.value] and not self._load_results_from_cache():
+            self.calculate_conflicts_and_stages()
+            self.create_data_for_output()
+            self._save_results_to_cache()
         if create_json:
             Utils.save_json_to_file(self.instance_data)
         else:
@@ -542,17 +674,21 @@ class CreateConfigurationFileBase(CommonConflictsAndStagesAPI):
     def create_config(self):
         ...
 
-    def build_data(self, create_json=False):
+    def build_data(self, create_json=False, save_result_json: bool = True):
         """
         Основной метод для получения данных по расчетам конфликтов, привзяки фаз и прочих значений.
         :param create_json: формирует файл .json с данными, полученными в результате расчетов(self.instance_data)
+        :param save_result_json: записывает self.instance_data после формирования конфига в conflicts.json.
+                                 При пакетном формировании конфигов должен быть False, так как все задания
+                                 записывают один и тот же файл.
         :return:
         """
 
         super().build_data(create_json)
         if self.path_to_src_config is not None:
             self.create_config()
-        Utils.save_json_to_file(self.instance_data)
+        if save_result_json:
+            Utils.save_json_to_file(self.instance_data)
 
     def push_result_to_instance_data(self, path_to_config: str | Path):
         """
@@ -665,92 +801,111 @@ class PeekConflictsAndStagesAPI(CreateConfigurationFileBase):
 
     controller_type = 'Peek'
 
-    def get_conflicts_for_write(self) -> str:
+    conflicts_fields = (
+        TableField('Type', 3, constant=2), TableField('Id1', 4), TableField('Id2', 4), TableField('Time', 3, constant=30)
+    )
+    ysrm_sa_stage_fields = (TableField('Id', 4), TableField('SGdef', 10))
+    ysrm_uk_stage_fields = (
+        TableField('ProcessId', 4, constant=1),
+        TableField('StageId', 4),
+        TableField('StartUpStage', 1),
+        TableField('SignalGroups', 10)
+    )
+
+    def _iter_conflicts_records(self) -> Iterator[Tuple]:
+        for group, properties in self.instance_data[DataFields.groups_property.value].items():
+            for enemy_group in properties[DataFields.enemy_groups.value]:
+                yield group, enemy_group
+
+    def _iter_stages(self) -> Iterator[Tuple[str, str]]:
+        for stage, groups_in_stage in self.instance_data[DataFields.sorted_stages_data.value].items():
+            yield stage, ','.join(map(str, groups_in_stage))
+
+    def write_conflicts(self, file: TextIO) -> None:
         """
-        Формирует строку :TABLE "XSGSG" для записи в новый DAT файл.
-        :return: строка :TABLE "XSGSG" для записи в новый DAT файл.
+        Записывает :TABLE "XSGSG" в файл по мере формирования записей.
+        :param file: Текстовый файл(буфер) для записи.
+        :return: None
         """
 
-        table_conflicts = f':TABLE "XSGSG",{str(self.instance_data[DataFields.sum_conflicts.value])},4,3,4,4,3\n'
-        for group, properties in self.instance_data[DataFields.groups_property.value].items():
-            for enemy_group in properties[DataFields.enemy_groups.value]:
-                table_conflicts += (
-                    f':RECORD\n'
-                    f'"Type",2\n'
-                    f'"Id1",{group}\n'
-                    f'"Id2",{str(enemy_group)}\n'
-                    f'"Time",30\n'
-                    f':END\n'
-                )
-        return f'{table_conflicts}:END\n'
+        write_table(
+            file,
+            'XSGSG',
+            self.conflicts_fields,
+            self._iter_conflicts_records(),
+            self.instance_data[DataFields.sum_conflicts.value]
+        )
 
-    def get_ysrm_sa_stage_and_ysrm_uk_stage(self) -> Tuple[str, str]:
+    def write_ysrm_sa_stage(self, file: TextIO) -> None:
         """
-        Аккумулирует строки таблиц :TABLE "YSRM_SA_STG" и :TABLE "YSRM_UK_STAGE" для записи в новый DAT файл.
-        :return: Кортеж из двух строк ysrm_sa_stage и ysrm_uk_stage для записи в новый DAT файл.
+        Записывает :TABLE "YSRM_SA_STG" в файл.
+        :param file: Текстовый файл(буфер) для записи.
+        :return: None
         """
 
-        sum_stages = str(self.instance_data[DataFields.number_of_stages.value])
-        ysrm_sa_stage = f':TABLE "YSRM_SA_STG",{sum_stages},2,4,10\n'
-        ysrm_uk_stage = f':TABLE "YSRM_UK_STAGE",{sum_stages},4,4,4,1,10\n'
+        write_table(
+            file,
+            'YSRM_SA_STG',
+            self.ysrm_sa_stage_fields,
+            self._iter_stages(),
+            self.instance_data[DataFields.number_of_stages.value]
+        )
 
-        for stage, groups_in_stage in self.instance_data[DataFields.sorted_stages_data.value].items():
-            groups_in_stage = f"{','.join(map(str, groups_in_stage))}"
-            ysrm_sa_stage += (
-                f':RECORD\n'
-                f'"Id",{stage}\n'
-                f'"SGdef","{groups_in_stage}"\n'
-                f':END\n'
-            )
-            ysrm_uk_stage += (
-                f':RECORD\n'
-                f'"ProcessId",1\n'
-                f'"StageId",{stage}\n'
-                f'"StartUpStage",{str(True) if stage == "1" else str(False)}\n'
-                f'"SignalGroups",",{groups_in_stage},"\n'
-                f':END\n'
-            )
-        return f'{ysrm_sa_stage}:END\n', f'{ysrm_uk_stage}:END\n'
+    def write_ysrm_uk_stage(self, file: TextIO) -> None:
+        """
+        Записывает :TABLE "YSRM_UK_STAGE" в файл.
+        :param file: Текстовый файл(буфер) для записи.
+        :return: None
+        """
+
+        write_table(
+            file,
+            'YSRM_UK_STAGE',
+            self.ysrm_uk_stage_fields,
+            ((stage, stage == '1', f',{groups_in_stage},') for stage, groups_in_stage in self._iter_stages()),
+            self.instance_data[DataFields.number_of_stages.value]
+        )
 
-    def skipping_lines(self, file: Iterator, stopper: str) -> str:
+    def get_conflicts_for_write(self) -> str:
         """
-        Итерируется по строкам исходного DAT файла, которые не требуется записывать в новый файл DAT.
-        :param file: Исходный DAT файл.
-        :param stopper: Строка-стоппер, до которой будет вызываться next()
-        :return: Строка-стоппер
+        Формирует строку :TABLE "XSGSG" для записи в новый DAT файл.
+        :return: строка :TABLE "XSGSG" для записи в новый DAT файл.
         """
 
-        line = ''
-        while stopper not in line:
-            line = next(file)
-        return line
+        buffer = io.StringIO()
+        self.write_conflicts(buffer)
+        return buffer.getvalue()
+
+    def get_ysrm_sa_stage_and_ysrm_uk_stage(self) -> Tuple[str, str]:
+        """
+        Формирует строки таблиц :TABLE "YSRM_SA_STG" и :TABLE "YSRM_UK_STAGE" для записи в новый DAT файл.
+        :return: Кортеж из двух строк ysrm_sa_stage и ysrm_uk_stage для записи в новый DAT файл.
+        """
+
+        ysrm_sa_stage, ysrm_uk_stage = io.StringIO(), io.StringIO()
+        self.write_ysrm_sa_stage(ysrm_sa_stage)
+        self.write_ysrm_uk_stage(ysrm_uk_stage)
+        return ysrm_sa_stage.getvalue(), ysrm_uk_stage.getvalue()
 
     def create_config(self):
         """
-        Формирует новый DAT файл конфигурации на основе расчётов.
+        Формирует новый DAT файл конфигурации на основе расчётов: таблицы "XSGSG", "YSRM_SA_STG"
+        и "YSRM_UK_STAGE" заменяются рассчитанными, остальные данные копируются из исходного файла.
         :return:
         """
 
         p = pathlib.Path(self.path_to_src_config)
         path_to_new_DAT = p.parent / f'{self.prefix_new_config}{p.name}'
-        ysrm_sa_stage, ysrm_uk_stage = self.get_ysrm_sa_stage_and_ysrm_uk_stage()
 
-        with (
-            open(self.path_to_src_config, 'r', encoding='utf-8') as src,
-            open(path_to_new_DAT, 'w', encoding='utf-8') as file2
-        ):
-            for line in src:
-                if ':TABLE "XSGSG"' in line:
-                    file2.write(self.get_conflicts_for_write())
-                    file2.write(self.skipping_lines(src, ':TABLE "YKLOK"'))
-                elif ':TABLE "YSRM_SA_STG"' in line:
-                    file2.write(ysrm_sa_stage)
-                    file2.write(self.skipping_lines(src, ':TABLE "YSRM_STEP"'))
-                elif ':TABLE "YSRM_UK_STAGE"' in line:
-                    file2.write(ysrm_uk_stage)
-                    file2.write(self.skipping_lines(src, ':TABLE "YSRM_UK_STAGE_TRANS"'))
-                else:
-                    file2.write(line)
+        with DatFile(self.path_to_src_config) as dat_file:
+            dat_file.write(
+                path_to_new_DAT,
+                {
+                    'XSGSG': self.write_conflicts,
+                    'YSRM_SA_STG': self.write_ysrm_sa_stage,
+                    'YSRM_UK_STAGE': self.write_ysrm_uk_stage
+                }
+            )
 
         self.push_result_to_instance_data(path_to_new_DAT)
 
@@ -0,0 +1,253 @@
+import collections
+from typing import Counter, Dict, Iterable, Set
+
+from sdp_lib.conflicts.calculate_conflicts import (
+    DataFields,
+    OutputDataCalculations
+)
+
+
+class IncrementalConflictsSession(OutputDataCalculations):
+    """
+    Сессия интерактивного редактирования фаз.
+    Хранит текущую таблицу фаза -> направления и после каждого изменения(добавление/удаление
+    направления в фазе, добавление/удаление фазы) обновляет только затронутые строки матриц
+    конфликтов, свойства затронутых направлений и их бинарные значения фаз.
+    Для каждой пары направлений хранится количество фаз, в которых направления участвуют вместе:
+    направления конфликтны, если это количество равно 0.
+    Если изменение меняет состав направлений(с учётом "пост. красных"), допустимость формирования
+    конфига или приводит к ошибке данных, выполняется полный расчёт.
+    Результат в self.instance_data совпадает с результатом полного расчёта
+    processing_data_for_calculation -> calculate_conflicts_and_stages -> create_data_for_output.
+    """
+
+    def __init__(self, stages_groups_data: Dict, separator: str = ','):
+        """
+        :param stages_groups_data: Фазы вида {фаза: направления через separator}.
+        :param separator: Разделитель направлений.
+        :raise ValueError: Если номер направления не является числом.
+        """
+        super().__init__(stages_groups_data)
+        self._separator = separator
+        self._stages: Dict[str, Set] = {
+            stage: {int(g) if g.isdigit() else float(g) for g in groups.split(separator) if g}
+            for stage, groups in stages_groups_data.items()
+        }
+        self._together: Dict[int | float, Counter] = {}
+        self._positions: Dict[int | float, int] = {}
+        self.recalculate()
+
+    @property
+    def stages(self) -> Dict[str, Set]:
+        return self._stages
+
+    def _create_raw_stage(self, groups: Iterable) -> str:
+        return self._separator.join(map(str, groups))
+
+    def recalculate(self, stages: Dict[str, Set] = None) -> None:
+        """
+        Полный расчёт по фазам stages(по умолчанию - текущие фазы).
+        :param stages: Фазы вида {фаза: set из направлений}.
+        :return: None
+        """
+
+        if stages is not None:
+            self._stages = stages
+        OutputDataCalculations.__init__(
+            self, {stage: self._create_raw_stage(groups) for stage, groups in self._stages.items()}
+        )
+        self.processing_data_for_calculation(self._separator)
+        if self.instance_data[DataFields.errors.value]:
+            return
+        # Фазы сессии и фазы расчёта - одни и те же объекты, изменения фаз сессии
+        # не требуют отдельного обновления sorted_stages_data
+        self.instance_data[DataFields.sorted_stages_data.value] = self._stages
+        self.calculate_conflicts_and_stages()
+        self.create_data_for_output()
+
+        self._positions = {group: i for i, group in enumerate(self.instance_data[DataFields.groups_property.value])}
+        self._together = {group: collections.Counter() for group in self._positions}
+        for groups_in_stage in self._stages.values():
+            for group in groups_in_stage:
+                self._together[group].update(groups_in_stage)
+                self._together[group][group] -= 1
+
+    def _can_update_incrementally(self, new_stages: Dict[str, Set]) -> bool:
+        """
+        Проверяет, что изменение фаз не меняет состав направлений, допустимость формирования конфига
+        и не приводит к ошибке данных. Если проверка пройдена, обновляет "пост. красные" направления.
+        :param new_stages: Фазы после изменения.
+        :return: True, если изменение можно применить без полного расчёта, иначе False.
+        """
+
+        if self.instance_data[DataFields.errors.value]:
+            return False
+        if len(new_stages) > 128:
+            return False
+        groups_in_stages = set().union(*new_stages.values())
+        all_num_groups, always_red_groups = self._get_always_red_and_all_unsorted_groups(groups_in_stages)
+        if all_num_groups != self.instance_data[DataFields.all_num_groups.value]:
+            return False
+        if self._make_config_allowed(new_stages) != self.instance_data[DataFields.allow_make_config.value]:
+            return False
+        self.instance_data[DataFields.always_red_groups.value] = always_red_groups
+        return True
+
+    def _change_together(self, group1, group2, delta: int, changed_rows: Set) -> None:
+        """
+        Изменяет количество фаз, в которых направления участвуют вместе.
+        Если направления стали(перестали быть) конфликтными, обновляет enemy_groups обоих
+        направлений и добавляет их в changed_rows.
+        """
+
+        before = self._together[group1][group2]
+        after = before + delta
+        self._together[group1][group2] = self._together[group2][group1] = after
+        if bool(before) == bool(after):
+            return
+        groups_property = self.instance_data[DataFields.groups_property.value]
+        for group, other_group in ((group1, group2), (group2, group1)):
+            enemy_groups = groups_property[group][DataFields.enemy_groups.value]
+            if after:
+                enemy_groups.discard(other_group)
+            else:
+                enemy_groups.add(other_group)
+        self.instance_data[DataFields.sum_conflicts.value] += -2 if after else 2
+        changed_rows |= {group1, group2}
+
+    def _refresh(self, changed_rows: Set, changed_stages_groups: Set, stages_changed: bool) -> None:
+        """
+        Обновляет затронутые строки матриц и свойства направлений.
+        :param changed_rows: Направления, у которых изменились конфликтные направления.
+        :param changed_stages_groups: Направления, у которых изменились фазы.
+        :param stages_changed: Изменился ли состав фаз.
+        :return: None
+        """
+
+        instance_data = self.instance_data
+        groups_property = instance_data[DataFields.groups_property.value]
+        allow_make_config = instance_data[DataFields.allow_make_config.value]
+        all_numbers_groups = instance_data[DataFields.sorted_all_num_groups.value]
+        num_groups = instance_data[DataFields.number_of_groups.value]
+
+        for group in changed_rows:
+            position = self._positions[group]
+            enemy_groups = groups_property[group][DataFields.enemy_groups.value]
+            instance_data[DataFields.output_matrix.value][position + 1] = self._create_row_output_matrix(
+                all_numbers_groups, group, enemy_groups, num_row=position + 1
+            )
+            if allow_make_config:
+                instance_data[DataFields.matrix_F997.value][position] = self._create_row_f997(
+                    num_groups, group, enemy_groups
+                )
+                instance_data[DataFields.numbers_conflicts_groups.value][position] = (
+                    f"{';'.join(map(str, sorted(enemy_groups)))};"
+                )
+
+        if stages_changed:
+            instance_data[DataFields.number_of_stages.value] = len(self.stages)
+            changed_stages_groups = groups_property.keys()
+        all_stages = set(self.stages.keys())
+        for group in changed_stages_groups:
+            property_group = groups_property[group]
+            property_group[DataFields.always_red.value] = not property_group[DataFields.stages.value]
+            property_group[DataFields.always_green.value] = property_group[DataFields.stages.value] == all_stages
+            if allow_make_config:
+                instance_data[DataFields.stages_bin_vals.value][self._positions[group]] = self._get_bin_val_stages(
+                    property_group[DataFields.stages.value]
+                )
+        instance_data[DataFields.stages_bin_vals_f009.value] = self._get_bin_vals_stages_for_swarco_f009()
+
+    def add_group_to_stage(self, stage: str, group: int | float) -> None:
+        """
+        Добавляет направление в фазу.
+        :param stage: Номер фазы.
+        :param group: Номер направления.
+        :return: None
+        """
+
+        groups_in_stage = self._stages[stage]
+        if group in groups_in_stage:
+            return
+        new_stages = self._stages | {stage: groups_in_stage | {group}}
+        if not self._can_update_incrementally(new_stages):
+            return self.recalculate(new_stages)
+
+        changed_rows = set()
+        for other_group in groups_in_stage:
+            self._change_together(group, other_group, 1, changed_rows)
+        groups_in_stage.add(group)
+        self.instance_data['raw_stages_data'][stage] = self._create_raw_stage(groups_in_stage)
+        self.instance_data[DataFields.groups_property.value][group][DataFields.stages.value].add(stage)
+        self._refresh(changed_rows, {group}, stages_changed=False)
+
+    def remove_group_from_stage(self, stage: str, group: int | float) -> None:
+        """
+        Удаляет направление из фазы.
+        :param stage: Номер фазы.
+        :param group: Номер направления.
+        :return: None
+        """
+
+        groups_in_stage = self._stages[stage]
+        if group not in groups_in_stage:
+            return
+        new_stages = self._stages | {stage: groups_in_stage - {group}}
+        if not self._can_update_incrementally(new_stages):
+            return self.recalculate(new_stages)
+
+        groups_in_stage.discard(group)
+        changed_rows = set()
+        for other_group in groups_in_stage:
+            self._change_together(group, other_group, -1, changed_rows)
+        self.instance_data['raw_stages_data'][stage] = self._create_raw_stage(groups_in_stage)
+        self.instance_data[DataFields.groups_property.value][group][DataFields.stages.value].discard(stage)
+        self._refresh(changed_rows, {group}, stages_changed=False)
+
+    def add_stage(self, stage: str, groups: Iterable[int | float]) -> None:
+        """
+        Добавляет фазу в конец таблицы фаз. Если фаза уже есть, заменяет её направления.
+        :param stage: Номер фазы.
+        :param groups: Направления фазы.
+        :return: None
+        """
+
+        if stage in self._stages:
+            self.remove_stage(stage)
+        groups = set(groups)
+        new_stages = self._stages | {stage: groups}
+        if not self._can_update_incrementally(new_stages):
+            return self.recalculate(new_stages)
+
+        changed_rows = set()
+        for group in groups:
+            for other_group in groups:
+                if group < other_group:
+                    self._change_together(group, other_group, 1, changed_rows)
+            self.instance_data[DataFields.groups_property.value][group][DataFields.stages.value].add(stage)
+        self._stages[stage] = groups
+        self.instance_data['raw_stages_data'][stage] = self._create_raw_stage(groups)
+        self._refresh(changed_rows, groups, stages_changed=True)
+
+    def remove_stage(self, stage: str) -> None:
+        """
+        Удаляет фазу.
+        :param stage: Номер фазы.
+        :return: None
+        """
+
+        if stage not in self._stages:
+            return
+        new_stages = {s: groups for s, groups in self._stages.items() if s != stage}
+        if not self._can_update_incrementally(new_stages):
+            return self.recalculate(new_stages)
+
+        groups = self._stages.pop(stage)
+        changed_rows = set()
+        for group in groups:
+            for other_group in groups:
+                if group < other_group:
+                    self._change_together(group, other_group, -1, changed_rows)
+            self.instance_data[DataFields.groups_property.value][group][DataFields.stages.value].discard(stage)
+        del self.instance_data['raw_stages_data'][stage]
+        self._refresh(changed_rows, groups, stages_changed=True)
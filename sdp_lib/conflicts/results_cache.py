@@ -0,0 +1,151 @@
+import hashlib
+import json
+import logging
+import os
+import pathlib
+import stat
+import tempfile
+from collections.abc import Mapping
+from typing import Any, Iterable
+
+
+logger = logging.getLogger(__name__)
+
+
+T_results = dict[str, Any]
+
+
+class ConflictsResultsCache:
+    """
+    Дисковый кэш результатов расчёта конфликтов.
+    Ключ - sha256 от нормализованной таблицы фаз(фазы и направления отсортированы) и типа дк,
+    поэтому одинаковые таблицы фаз разных перекрёстков используют один результат.
+    Каждый результат хранится в отдельном файле <ключ>.json, запись выполняется через временный
+    файл и os.replace, поэтому кэш можно использовать из нескольких процессов.
+    Если суммарный размер файлов превышает max_size байт, удаляются файлы, которые дольше всех
+    не использовались.
+    Каталог создаётся с правами 0700. Если каталог принадлежит другому пользователю или доступен
+    на запись группе/остальным, кэш не используется: файлы из такого каталога могли быть подменены.
+    При изменении расчёта конфликтов или формата результата нужно увеличить version.
+    """
+
+    version = 1
+
+    def __init__(self, path_to_dir: str | pathlib.Path, max_size: int = 64 * 1024 * 1024):
+        self._path_to_dir = pathlib.Path(path_to_dir)
+        self._max_size = max_size
+        self._dir_is_safe: bool | None = None
+
+    def _check_dir(self) -> bool:
+        """
+        Создаёт каталог кэша(0700), если его нет, и проверяет владельца и права каталога.
+        Результат проверки запоминается.
+        :return: True, если каталог можно использовать для кэша, иначе False.
+        """
+        if self._dir_is_safe is None:
+            try:
+                self._path_to_dir.mkdir(mode=0o700, parents=True, exist_ok=True)
+                dir_stat = self._path_to_dir.stat()
+            except OSError:
+                logger.exception('Ошибка создания каталога кэша конфликтов %s', self._path_to_dir)
+                self._dir_is_safe = False
+                return False
+            getuid = getattr(os, 'getuid', None)
+            self._dir_is_safe = (
+                stat.S_ISDIR(dir_stat.st_mode)
+                and not dir_stat.st_mode & (stat.S_IWGRP | stat.S_IWOTH)
+                and (getuid is None or dir_stat.st_uid == getuid())
+            )
+            if not self._dir_is_safe:
+                logger.warning(
+                    'Каталог кэша конфликтов %s принадлежит другому пользователю или доступен на запись '
+                    'группе/остальным, кэш не используется', self._path_to_dir
+                )
+        return self._dir_is_safe
+
+    @property
+    def path_to_dir(self) -> pathlib.Path:
+        return self._path_to_dir
+
+    @classmethod
+    def get_key(cls, sorted_stages_data: Mapping[str, Iterable], type_controller: str) -> str:
+        """
+        Формирует ключ кэша.
+        :param sorted_stages_data: Фазы вида {фаза: направления}.
+        :param type_controller: Тип дк.
+        :return: sha256 нормализованных данных в виде hex строки.
+        """
+        normalized = [
+            cls.version,
+            type_controller,
+            sorted((stage, sorted(groups)) for stage, groups in sorted_stages_data.items())
+        ]
+        return hashlib.sha256(json.dumps(normalized, separators=(',', ':')).encode()).hexdigest()
+
+    def _get_path(self, key: str) -> pathlib.Path:
+        return self._path_to_dir / f'{key}.json'
+
+    def get(self, key: str) -> T_results | None:
+        """
+        Возвращает результат расчёта и обновляет время использования файла.
+        :param key: Ключ кэша(см. get_key).
+        :return: Результат расчёта(dict), если он есть в кэше, иначе None.
+        """
+        if not self._check_dir():
+            return None
+        path = self._get_path(key)
+        try:
+            with open(path, encoding='utf-8') as f:
+                results = json.load(f)
+            if not isinstance(results, dict):
+                raise ValueError(f'ожидается объект json, получен {type(results).__name__}')
+            os.utime(path)
+        except FileNotFoundError:
+            return None
+        except (OSError, ValueError):
+            logger.warning('Повреждённый файл кэша конфликтов: %s', path)
+            path.unlink(missing_ok=True)
+            return None
+        return results
+
+    def add(self, key: str, results: T_results) -> None:
+        """
+        Записывает результат расчёта в кэш.
+        :param key: Ключ кэша(см. get_key).
+        :param results: Результат расчёта, должен сериализоваться в json.
+        :return: None
+        """
+        if not self._check_dir():
+            return
+        try:
+            fd, path_to_tmp = tempfile.mkstemp(dir=self._path_to_dir, suffix='.tmp')
+            with os.fdopen(fd, 'w', encoding='utf-8') as f:
+                json.dump(results, f, ensure_ascii=False, separators=(',', ':'))
+            os.replace(path_to_tmp, self._get_path(key))
+        except OSError:
+            logger.exception('Ошибка записи в кэш конфликтов %s', self._path_to_dir)
+            return
+        self._evict()
+
+    def _evict(self) -> None:
+        """
+        Удаляет файлы, которые дольше всех не использовались, пока суммарный
+        размер файлов кэша больше max_size.
+        """
+        files = []
+        for path in self._path_to_dir.glob('*.json'):
+            try:
+                stat = path.stat()
+            except FileNotFoundError:
+                continue
+            files.append((stat.st_mtime, stat.st_size, path))
+        size = sum(file_size for _, file_size, _ in files)
+        for _, file_size, path in sorted(files):
+            if size <= self._max_size:
+                break
+            path.unlink(missing_ok=True)
+            size -= file_size
+
+    def clear(self) -> None:
+        for path in self._path_to_dir.glob('*.json'):
+            path.unlink(missing_ok=True)
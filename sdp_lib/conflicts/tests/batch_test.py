@@ -0,0 +1,79 @@
+from unittest import IsolatedAsyncioTestCase, TestCase, main
+
+from sdp_lib.conflicts.batch import ConflictsBatch, ConflictsJob, run_job
+from sdp_lib.conflicts.calculate_conflicts import DataFields
+
+
+STAGES = {'1': '1,2,3', '2': '4,5', '3': '1,5'}
+
+jobs = [
+    ConflictsJob(stages=STAGES),
+    ConflictsJob(stages=STAGES, path_to_src_config='not_exists/CO1.DAT'),
+    ConflictsJob(stages={'1': '1,2', '2': '3,4'}),
+    # Задание не сериализуется для передачи в процесс пула
+    ConflictsJob(stages={'1': lambda: None}),
+]
+
+
+class TestRunJob(TestCase):
+
+    def test_result(self):
+        result = run_job(jobs[0])
+        self.assertEqual(result[DataFields.errors.value], [])
+        self.assertEqual(result[DataFields.number_of_groups.value], 5)
+        self.assertEqual(result[DataFields.number_of_stages.value], 3)
+
+    def test_error_without_traceback(self):
+        with self.assertLogs('sdp_lib.conflicts.batch', level='ERROR') as logs:
+            result = run_job(jobs[1])
+        self.assertEqual(list(result), [DataFields.errors.value])
+        self.assertEqual(len(result[DataFields.errors.value]), 1)
+        self.assertNotIn('Traceback', result[DataFields.errors.value][0])
+        self.assertIn('Traceback', logs.output[0])
+
+    def test_unknown_config_suffix(self):
+        with self.assertLogs('sdp_lib.conflicts.batch', level='ERROR'):
+            result = run_job(ConflictsJob(stages=STAGES, path_to_src_config='CO1.txt'))
+        self.assertIn('KeyError', result[DataFields.errors.value][0])
+
+
+class TestConflictsBatch(TestCase):
+
+    def setUp(self) -> None:
+        self.batch = ConflictsBatch(max_workers=2)
+        self.addCleanup(self.batch.close)
+
+    def test_run(self):
+        with self.assertLogs('sdp_lib.conflicts.batch', level='ERROR'):
+            results = {result['job']: result for result in self.batch.run(jobs)}
+        self.assertEqual(sorted(results), [0, 1, 2, 3])
+        self.assertEqual(results[0][DataFields.errors.value], [])
+        self.assertEqual(results[2][DataFields.number_of_groups.value], 4)
+        self.assertEqual(results[1][DataFields.path_to_file.value], 'not_exists/CO1.DAT')
+        for num_job in (1, 3):
+            self.assertEqual(len(results[num_job][DataFields.errors.value]), 1)
+        self.assertFalse(any('traceback' in result for result in results.values()))
+
+
+class TestConflictsBatchAsync(IsolatedAsyncioTestCase):
+
+    async def asyncSetUp(self) -> None:
+        self.batch = ConflictsBatch(max_workers=2)
+        self.addCleanup(self.batch.close)
+
+    async def test_run_async(self):
+        with self.assertLogs('sdp_lib.conflicts.batch', level='ERROR'):
+            results = {result['job']: result async for result in self.batch.run_async(jobs)}
+        self.assertEqual(sorted(results), [0, 1, 2, 3])
+        self.assertEqual(results[0][DataFields.errors.value], [])
+        self.assertEqual(len(results[3][DataFields.errors.value]), 1)
+
+    async def test_run_async_close_early(self):
+        results = self.batch.run_async(jobs[:1] * 4)
+        result = await anext(results)
+        self.assertEqual(result[DataFields.errors.value], [])
+        await results.aclose()
+
+
+if __name__ == '__main__':
+    main()
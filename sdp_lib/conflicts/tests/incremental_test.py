@@ -0,0 +1,102 @@
+import random
+from unittest import TestCase, main
+
+from sdp_lib.conflicts.calculate_conflicts import DataFields, OutputDataCalculations
+from sdp_lib.conflicts.incremental import IncrementalConflictsSession
+
+
+compared_fields = (
+    DataFields.sorted_stages_data.value,
+    DataFields.number_of_groups.value,
+    DataFields.number_of_stages.value,
+    DataFields.all_num_groups.value,
+    DataFields.always_red_groups.value,
+    DataFields.sorted_all_num_groups.value,
+    DataFields.allow_make_config.value,
+    DataFields.errors.value,
+    DataFields.groups_property.value,
+    DataFields.output_matrix.value,
+    DataFields.matrix_F997.value,
+    DataFields.numbers_conflicts_groups.value,
+    DataFields.stages_bin_vals.value,
+    DataFields.stages_bin_vals_f009.value,
+    DataFields.sum_conflicts.value,
+)
+
+
+class TestIncrementalConflicts(TestCase):
+
+    def setUp(self) -> None:
+        self.rnd = random.Random(0)
+
+    def get_full_calculation(self, session: IncrementalConflictsSession) -> dict:
+        calculation = OutputDataCalculations(dict(session.instance_data['raw_stages_data']))
+        calculation.processing_data_for_calculation()
+        if not calculation.instance_data[DataFields.errors.value]:
+            calculation.calculate_conflicts_and_stages()
+            calculation.create_data_for_output()
+        return calculation.instance_data
+
+    def assert_equal_full_calculation(self, session: IncrementalConflictsSession):
+        expected = self.get_full_calculation(session)
+        for field in compared_fields:
+            self.assertEqual(session.instance_data.get(field), expected.get(field), field)
+
+    def apply_random_change(self, session: IncrementalConflictsSession, num_groups: int):
+        stages = list(session.stages)
+        action = self.rnd.randrange(4) if stages else 2
+        if action == 0:
+            session.add_group_to_stage(self.rnd.choice(stages), self.rnd.randint(1, num_groups))
+        elif action == 1:
+            stage = self.rnd.choice(stages)
+            if session.stages[stage]:
+                session.remove_group_from_stage(stage, self.rnd.choice(list(session.stages[stage])))
+        elif action == 2:
+            session.add_stage(
+                str(self.rnd.randint(1, 8)), self.rnd.sample(range(1, num_groups + 1), self.rnd.randint(1, 4))
+            )
+        else:
+            session.remove_stage(self.rnd.choice(stages))
+
+    def test_initial_calculation(self):
+        session = IncrementalConflictsSession({'1': '1,4,2,3,5', '2': '1,6,7,3', '3': '9,10,8,13,3', '4': '5,6,4'})
+        self.assert_equal_full_calculation(session)
+        self.assertEqual(session.instance_data[DataFields.always_red_groups.value], {11, 12})
+
+    def test_add_and_remove_group(self):
+        session = IncrementalConflictsSession({'1': '1,2', '2': '3,4', '3': '5,6'})
+        session.add_group_to_stage('1', 3)
+        self.assertNotIn(3, session.instance_data[DataFields.groups_property.value][1][DataFields.enemy_groups.value])
+        self.assert_equal_full_calculation(session)
+        session.remove_group_from_stage('1', 3)
+        self.assertIn(3, session.instance_data[DataFields.groups_property.value][1][DataFields.enemy_groups.value])
+        self.assert_equal_full_calculation(session)
+
+    def test_random_changes(self):
+        """
+        Проверяет, что после каждого случайного изменения фаз результат сессии совпадает
+        с полным расчётом.
+        """
+
+        for num_groups in (6, 12, 24):
+            session = IncrementalConflictsSession(
+                {
+                    str(stage): ','.join(map(str, self.rnd.sample(range(1, num_groups + 1), 3)))
+                    for stage in range(1, 5)
+                }
+            )
+            for _ in range(300):
+                self.apply_random_change(session, num_groups)
+                self.assert_equal_full_calculation(session)
+
+    def test_float_groups(self):
+        session = IncrementalConflictsSession({'1': '1,2.1,3', '2': '2.2,4', '3': '1,4'})
+        self.assertFalse(session.instance_data[DataFields.allow_make_config.value])
+        session.add_group_to_stage('2', 1)
+        self.assert_equal_full_calculation(session)
+        session.remove_stage('1')
+        self.assert_equal_full_calculation(session)
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,123 @@
+import json
+import os
+import pathlib
+import stat
+import tempfile
+from unittest import TestCase, main
+
+from sdp_lib.conflicts.calculate_conflicts import (
+    CommonConflictsAndStagesAPI,
+    DataFields,
+    PeekConflictsAndStagesAPI
+)
+from sdp_lib.conflicts.results_cache import ConflictsResultsCache
+
+
+class TestConflictsResultsCache(TestCase):
+
+    def setUp(self) -> None:
+        self.tmp_dir = tempfile.TemporaryDirectory()
+        self.addCleanup(self.tmp_dir.cleanup)
+        self.cache = ConflictsResultsCache(self.tmp_dir.name)
+        self.raw_data_stages = {
+            '1': '1,4,2,3,5',
+            '2': '1,6,7,3',
+            '3': '9,10,8,13,3',
+            '4': '5,6,4'
+        }
+
+    def build_data(self, raw_data_stages: dict, results_cache: ConflictsResultsCache | None, api_class=None):
+        api = (api_class or CommonConflictsAndStagesAPI)(dict(raw_data_stages))
+        api.results_cache = results_cache
+        if isinstance(api, PeekConflictsAndStagesAPI):
+            api.build_data(save_result_json=False)
+        else:
+            api.build_data()
+        return api
+
+    def test_cached_result_equal_calculation(self):
+        expected = self.build_data(self.raw_data_stages, None).instance_data
+        self.build_data(self.raw_data_stages, self.cache)
+        self.assertEqual(len(list(self.cache.path_to_dir.glob('*.json'))), 1)
+
+        api = CommonConflictsAndStagesAPI(dict(self.raw_data_stages))
+        api.results_cache = self.cache
+        api.calculate_conflicts_and_stages = api.create_data_for_output = None
+        api.build_data()
+        self.assertEqual(api.instance_data, expected)
+
+    def test_float_groups(self):
+        raw_data_stages = {'1': '1,2.1,3', '2': '2.2,4'}
+        expected = self.build_data(raw_data_stages, None).instance_data
+        self.build_data(raw_data_stages, self.cache)
+        self.assertEqual(self.build_data(raw_data_stages, self.cache).instance_data, expected)
+
+    def test_key(self):
+        reordered_stages = {'4': '4,6,5', '3': '3,13,8,9,10', '2': '1,3,7,6', '1': '5,3,2,4,1'}
+        self.build_data(self.raw_data_stages, self.cache)
+        self.build_data(reordered_stages, self.cache)
+        self.assertEqual(len(list(self.cache.path_to_dir.glob('*.json'))), 1)
+
+        self.build_data(self.raw_data_stages, self.cache, PeekConflictsAndStagesAPI)
+        self.build_data(self.raw_data_stages | {'4': '5,6,4,1'}, self.cache)
+        self.assertEqual(len(list(self.cache.path_to_dir.glob('*.json'))), 3)
+
+    def test_errors_not_cached(self):
+        api = self.build_data({'1': '1,a'}, self.cache)
+        self.assertTrue(api.instance_data[DataFields.errors.value])
+        self.assertEqual(list(self.cache.path_to_dir.glob('*.json')), [])
+
+    def test_eviction(self):
+        cache = ConflictsResultsCache(self.tmp_dir.name, max_size=350)
+        for i in range(10):
+            cache.add(str(i), {'data': 'x' * 100})
+            os.utime(cache.path_to_dir / f'{i}.json', (i, i))
+        self.assertEqual(sorted(p.stem for p in cache.path_to_dir.glob('*.json')), ['7', '8', '9'])
+
+    def test_corrupted_file(self):
+        key = self.cache.get_key({'1': [1, 2]}, 'Общий')
+        self.cache.add(key, {'data': 1})
+        self.cache.path_to_dir.joinpath(f'{key}.json').write_text('{', encoding='utf-8')
+        self.assertIsNone(self.cache.get(key))
+        self.cache.add(key, {'data': 1})
+        self.assertEqual(self.cache.get(key), json.loads('{"data": 1}'))
+
+    def test_disabled_by_default(self):
+        self.assertIsNone(CommonConflictsAndStagesAPI.results_cache)
+
+    def test_dir_mode(self):
+        cache = ConflictsResultsCache(os.path.join(self.tmp_dir.name, 'cache'))
+        cache.add('1', {'data': 1})
+        self.assertEqual(stat.S_IMODE(cache.path_to_dir.stat().st_mode), 0o700)
+        self.assertEqual(cache.get('1'), {'data': 1})
+
+    def test_unsafe_dir_not_used(self):
+        path_to_dir = pathlib.Path(self.tmp_dir.name, 'cache')
+        path_to_dir.mkdir()
+        path_to_dir.joinpath('1.json').write_text('{"data": 1}', encoding='utf-8')
+        path_to_dir.chmod(0o777)
+        cache = ConflictsResultsCache(path_to_dir)
+        self.assertIsNone(cache.get('1'))
+        cache.add('2', {'data': 2})
+        self.assertFalse(path_to_dir.joinpath('2.json').exists())
+
+    def test_invalid_payload(self):
+        expected = self.build_data(self.raw_data_stages, None).instance_data
+        self.build_data(self.raw_data_stages, self.cache)
+        path_to_file = next(self.cache.path_to_dir.glob('*.json'))
+        valid_results = json.loads(path_to_file.read_text(encoding='utf-8'))
+        invalid_payloads = [
+            [],
+            {'data': 1},
+            valid_results | {DataFields.groups_property.value: [[1, []]]},
+            valid_results | {DataFields.groups_property.value: valid_results[DataFields.groups_property.value][1:]},
+            {field: val for field, val in valid_results.items() if field != DataFields.sum_conflicts.value},
+        ]
+        for payload in invalid_payloads:
+            with self.subTest(payload=str(payload)[:50]):
+                path_to_file.write_text(json.dumps(payload), encoding='utf-8')
+                self.assertEqual(self.build_data(self.raw_data_stages, self.cache).instance_data, expected)
+
+
+if __name__ == '__main__':
+    main()
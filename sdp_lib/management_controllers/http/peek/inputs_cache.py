@@ -0,0 +1,52 @@
+import time
+
+from sdp_lib.management_controllers.http.peek.varbinds import T_inp_props
+
+
+T_inputs = dict[str, T_inp_props]
+
+
+class PeekInputsCache:
+    """
+    Кэш входов Peek. Ключ - ipv4 хоста, значение - входы с web страницы
+    в виде {имя входа: свойства входа}. Запись действительна в течение ttl секунд.
+    Кэш хранится в памяти процесса: изменения входов другими процессами(воркерами)
+    или через web интерфейс дк в течение ttl не видны.
+    """
+
+    def __init__(self, ttl: float = 30):
+        self._ttl = ttl
+        self._inputs: dict[str, tuple[T_inputs, float]] = {}
+
+    def __len__(self):
+        return len(self._inputs)
+
+    def add(self, ipv4: str, inputs: T_inputs) -> None:
+        """
+        Добавляет(перезаписывает) входы хоста.
+        :param ipv4: ipv4 хоста.
+        :param inputs: Входы с web страницы.
+        :return: None
+        """
+        self._inputs[ipv4] = dict(inputs), time.monotonic()
+
+    def get(self, ipv4: str) -> T_inputs | None:
+        """
+        Возвращает входы хоста.
+        :param ipv4: ipv4 хоста.
+        :return: Входы хоста, если запись есть и не устарела, иначе None.
+        """
+        try:
+            inputs, added_time = self._inputs[ipv4]
+        except KeyError:
+            return None
+        if time.monotonic() - added_time > self._ttl:
+            del self._inputs[ipv4]
+            return None
+        return inputs
+
+    def invalidate(self, ipv4: str) -> None:
+        self._inputs.pop(ipv4, None)
+
+    def clear(self) -> None:
+        self._inputs.clear()
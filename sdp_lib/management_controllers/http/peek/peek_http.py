@@ -1,4 +1,5 @@
 import asyncio
+import contextlib
 from enum import IntEnum
 from functools import cached_property
 from typing import (
@@ -11,19 +12,30 @@ import aiohttp
 
 from sdp_lib.management_controllers.exceptions import (
     BadControllerType,
-    BadValueToSet
+    BadValueToSet,
+    ConnectionTimeout,
+    ErrorSetValue
 )
+from sdp_lib.management_controllers.fields_names import FieldsNames
 from sdp_lib.management_controllers.http.http_core import HttpHosts
+from sdp_lib.management_controllers.http.rate_limiter import (
+    HostsRateLimiter,
+    TokenBucket
+)
 from sdp_lib.management_controllers.http.peek import (
     routes,
     static_data
 )
+from sdp_lib.management_controllers.http.peek.inputs_cache import PeekInputsCache
 from sdp_lib.management_controllers.http.peek.varbinds import InputsVarbinds
 from sdp_lib.management_controllers.parsers.parsers_peek_http_new import (
     MainPageParser,
     InputsPageParser,
 )
-from sdp_lib.management_controllers.structures import HttpResponseStructure
+from sdp_lib.management_controllers.structures import (
+    HttpResponseStructure,
+    InputsStructure
+)
 
 
 T_Parsers = TypeVar('T_Parsers', MainPageParser, InputsPageParser)
@@ -38,6 +50,12 @@ class DataFromWeb(IntEnum):
 
 class PeekWebHosts(HttpHosts):
 
+    # Общий для всех экземпляров ограничитель POST запросов(Peek сбрасывает соединение при
+    # большом количестве запросов). Задаётся приложением(core.shared), None - без ограничения.
+    post_rate_limiter: HostsRateLimiter | None = None
+    # Общий кэш входов. Задаётся приложением(core.shared), None - входы запрашиваются перед каждой командой.
+    inputs_cache: PeekInputsCache | None = None
+
     @cached_property
     def matches(self) -> dict[DataFromWeb, tuple[str, Callable, Type[T_Parsers]]]:
         return {
@@ -51,13 +69,20 @@ class PeekWebHosts(HttpHosts):
             url,
             method: Callable,
             parser_class,
+            rate_limiter: TokenBucket = None,
             **kwargs
     ):
-        self.last_response = await self._request_sender.http_request_to_host(
-            url=url,
-            method=method,
-            **kwargs
-        )
+        async with rate_limiter.limit() if rate_limiter is not None else contextlib.nullcontext():
+            self.last_response = await self._request_sender.http_request_to_host(
+                url=url,
+                method=method,
+                **kwargs
+            )
+        if rate_limiter is not None:
+            if isinstance(self.last_response[HttpResponseStructure.ERROR], ConnectionTimeout):
+                rate_limiter.on_timeout()
+            elif self.last_response[HttpResponseStructure.ERROR] is None:
+                rate_limiter.on_success()
         if self.check_http_response_errors_and_add_to_host_data_if_has():
             return self
 
@@ -106,17 +131,16 @@ class PeekWebHosts(HttpHosts):
     async def post_all_pages(self, page, payload_data: list[tuple]):
         async with asyncio.TaskGroup() as tg:
             results = []
-            print(f'page: {page}\npayload: {payload_data}')
             route, method, parser_class = self.matches.get(page)
-            max_concurrent_tasks = 5
-            for num_task, payload in enumerate(payload_data, 1):
-                if num_task % max_concurrent_tasks == 0:
-                    print(f'DEBUG len(payload_data) : {len(payload_data)}')
-                    await asyncio.sleep(1) # Peek сбрасывает при коннект при большом количестве запросов
+            # Peek сбрасывает соединение при большом количестве запросов, частота и
+            # количество одновременных запросов к хосту ограничиваются токен-бакетом хоста
+            rate_limiter = None if self.post_rate_limiter is None else self.post_rate_limiter.get(self.ip_v4)
+            for payload in payload_data:
                 results.append(
                     tg.create_task(
                         self._single_common_request(
                             self._base_url + route, method, parser_class,
+                            rate_limiter=rate_limiter,
                             cookies=static_data.cookies,
                             data=payload
                         )
@@ -128,36 +152,116 @@ class PeekWebHosts(HttpHosts):
             self.remove_data_from_response()
         return self
 
+    async def _get_inputs_snapshot(self) -> dict | None:
+        """
+        Возвращает входы хоста из кэша. Если в кэше нет актуальной записи,
+        запрашивает web страницу входов и добавляет входы в кэш.
+        :return: Входы хоста или None, если запрос завершился ошибкой.
+        """
+        inputs = None if self.inputs_cache is None else self.inputs_cache.get(self.ip_v4)
+        if inputs is not None:
+            return inputs
+        await self.get_inputs()
+        if self.response_errors:
+            return None
+        inputs = self.response_as_dict['data'][str(FieldsNames.inputs)]
+        if self.inputs_cache is not None:
+            self.inputs_cache.add(self.ip_v4, inputs)
+        return inputs
+
+    def _invalidate_cached_inputs(self) -> None:
+        if self.inputs_cache is not None:
+            self.inputs_cache.invalidate(self.ip_v4)
+
+    async def verify_inputs(self, expected_inputs: dict):
+        """
+        Запрашивает web страницу входов и проверяет актуаторы только изменённых входов.
+        В ответ добавляются входы с web страницы. Если актуаторы совпадают с ожидаемыми,
+        входы записываются в кэш, иначе запись хоста в кэше удаляется.
+        :param expected_inputs: Словарь вида {имя входа: ожидаемые свойства входа}.
+        :return: self
+        """
+        await self.get_inputs()
+        if self.response_errors:
+            self._invalidate_cached_inputs()
+            return self
+        inputs = self.response_as_dict['data'][str(FieldsNames.inputs)]
+        self.add_data_to_data_response_attrs(data={str(FieldsNames.inputs): inputs})
+        not_set = [
+            name for name, props in expected_inputs.items()
+            if name not in inputs
+               or inputs[name][InputsStructure.ACTUATOR] != props[InputsStructure.ACTUATOR]
+        ]
+        if not_set:
+            self._invalidate_cached_inputs()
+            self.add_data_to_data_response_attrs(ErrorSetValue(f'входы {", ".join(not_set)}'))
+        elif self.inputs_cache is not None:
+            self.inputs_cache.add(self.ip_v4, inputs)
+        return self
+
     async def set_inputs_to_web(
             self,
             *,
             inps_name_and_vals: dict | tuple = None,
             stage: int = None,
+            verify: bool = True
     ):
-        await self.get_inputs()
-        if self.response_errors:
+        """
+        Устанавливает актуаторы входов. Текущие входы берутся из кэша входов хоста,
+        поэтому повторные команды в течение ttl кэша требуют только POST запросов.
+        После отправки POST запросов запись хоста в кэше удаляется: в кэш попадают
+        только входы, прочитанные с web страницы.
+        :param inps_name_and_vals: Входы и значения актуаторов для установки.
+        :param stage: Фаза для установки через входы MPP.
+        :param verify: Если True, после отправки команд запрашивает web страницу
+                       входов, проверяет изменённые входы и добавляет в ответ входы
+                       с web страницы. Если False и входы были изменены, входы в ответ
+                       не добавляются: их фактические значения неизвестны.
+                       Проверка не выполняется, если по входам из кэша изменять нечего.
+                       Кэш входов хранится в памяти процесса, поэтому, если входы были
+                       изменены другим процессом или через web интерфейс дк в течение ttl
+                       кэша, необходимый POST запрос может быть пропущен.
+        :return: self
+        """
+        _inputs = await self._get_inputs_snapshot()
+        if _inputs is None:
             return self
-        _inputs = self.response_as_dict['data']['inputs']
 
+        varbinds = InputsVarbinds(_inputs)
         if stage is not None:
-            payloads = InputsVarbinds(_inputs).get_varbinds_set_stage(stage)
+            payloads = varbinds.get_varbinds_set_stage(stage)
         else:
-            payloads = InputsVarbinds(_inputs).get_varbinds_as_from_name(inps_name_and_vals)
+            payloads = varbinds.get_varbinds_as_from_name(inps_name_and_vals)
 
-        print(f'payloads: {payloads}')
-        await self.post_all_pages(
-            DataFromWeb.inputs_page_set,
-            payload_data=payloads
-        )
-        await self.get_inputs()
-        return self
+        changed_inputs = varbinds.get_changed_inputs(payloads)
+        if payloads:
+            await self.post_all_pages(
+                DataFromWeb.inputs_page_set,
+                payload_data=payloads
+            )
+            self._invalidate_cached_inputs()
+            if self.response_errors:
+                return self
 
-    async def set_stage(self, stage: int):
+        if changed_inputs:
+            if verify:
+                return await self.verify_inputs(changed_inputs)
+            self.remove_data_from_response()
+            return self
+        self.add_data_to_data_response_attrs(data={str(FieldsNames.inputs): _inputs})
+        return self
 
+    async def set_stage(self, stage: int, verify: bool = True):
+        """
+        Устанавливает фазу через входы MPP.
+        :param stage: Фаза, 0 - сброс ручного управления.
+        :param verify: Проверка изменённых входов после отправки команд, см. set_inputs_to_web.
+        :return: self
+        """
         if stage not in range(9):
             self.add_data_to_data_response_attrs(BadValueToSet(value=stage, expected=(0, 8)))
             return self
-        return await self.set_inputs_to_web(stage=stage)
+        return await self.set_inputs_to_web(stage=stage, verify=verify)
 
 
 
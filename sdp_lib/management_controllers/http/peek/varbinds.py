@@ -116,6 +116,30 @@ class InputsVarbinds:
                 )
         return payloads
 
+    def get_changed_inputs(self, payloads: list) -> dict[str, T_inp_props]:
+        """
+        Формирует свойства входов, которые будут установлены после отправки payloads.
+        Актуатор входа заменяется на устанавливаемый, состояние входа заменяется
+        для актуаторов ВКЛ/ВЫКЛ. Для '-' состояние определяет дк, поэтому оно не изменяется.
+        :param payloads: Payloads, сформированные методами get_varbinds_*.
+        :return: Словарь вида {имя входа: свойства входа}.
+        """
+        inputs_by_payload_key = {
+            f'{inputs_prefix}{props[InputsStructure.INDEX]}': (name, props)
+            for name, props in self._inputs_from_web.items()
+        }
+        changed_inputs = {}
+        for (_, payload_key), (_, actuator_val) in payloads:
+            name, props = inputs_by_payload_key[payload_key]
+            props = list(props)
+            props[InputsStructure.ACTUATOR] = str(matches_actuators[actuator_val])
+            if actuator_val == ActuatorAsValue.ON:
+                props[InputsStructure.STATE] = '1'
+            elif actuator_val == ActuatorAsValue.OFF:
+                props[InputsStructure.STATE] = '0'
+            changed_inputs[name] = tuple(props)
+        return changed_inputs
+
     def create_payload(self, inp_index: str, actuator_val: ActuatorAsValue | str) -> tuple:
 
         return (
@@ -0,0 +1,105 @@
+import asyncio
+import contextlib
+import time
+from collections.abc import AsyncIterator
+
+
+class TokenBucket:
+    """
+    Токен-бакет запросов к одному хосту с адаптивной скоростью пополнения.
+    При таймауте подключения скорость пополнения уменьшается в backoff_factor раз
+    (не ниже min_rate), при успешном запросе увеличивается на recovery_step
+    (не выше rate). Количество одновременных запросов ограничивается max_concurrent.
+    """
+
+    def __init__(
+            self,
+            *,
+            burst: int,
+            rate: float,
+            min_rate: float,
+            backoff_factor: float = .5,
+            recovery_step: float = .5,
+            max_concurrent: int = 5
+    ):
+        self._burst = burst
+        self._max_rate = rate
+        self._min_rate = min_rate
+        self._backoff_factor = backoff_factor
+        self._recovery_step = recovery_step
+        self.rate = rate
+        self._tokens = float(burst)
+        self._last_refill = time.monotonic()
+        self._lock = asyncio.Lock()
+        self._semaphore = asyncio.Semaphore(max_concurrent)
+
+    def _refill(self) -> None:
+        now = time.monotonic()
+        self._tokens = min(self._burst, self._tokens + (now - self._last_refill) * self.rate)
+        self._last_refill = now
+
+    async def acquire(self) -> None:
+        """
+        Ожидает появления токена и забирает его.
+        """
+        async with self._lock:
+            self._refill()
+            if self._tokens < 1:
+                await asyncio.sleep((1 - self._tokens) / self.rate)
+                self._refill()
+            self._tokens -= 1
+
+    @contextlib.asynccontextmanager
+    async def limit(self) -> AsyncIterator[None]:
+        """
+        Ожидает свободного места среди одновременных запросов и токена.
+        Место освобождается при выходе из контекста(после получения ответа).
+        """
+        async with self._semaphore:
+            await self.acquire()
+            yield
+
+    def on_success(self) -> None:
+        self.rate = min(self._max_rate, self.rate + self._recovery_step)
+
+    def on_timeout(self) -> None:
+        self._refill()
+        self.rate = max(self._min_rate, self.rate * self._backoff_factor)
+        self._tokens = min(self._tokens, 0)
+
+
+class HostsRateLimiter:
+    """
+    Токен-бакеты запросов, ключ - ipv4 хоста.
+    """
+
+    def __init__(
+            self,
+            *,
+            burst: int = 5,
+            rate: float = 5,
+            min_rate: float = .5,
+            backoff_factor: float = .5,
+            recovery_step: float = .5,
+            max_concurrent: int = 5
+    ):
+        self._bucket_params = {
+            'burst': burst,
+            'rate': rate,
+            'min_rate': min_rate,
+            'backoff_factor': backoff_factor,
+            'recovery_step': recovery_step,
+            'max_concurrent': max_concurrent
+        }
+        self._buckets: dict[str, TokenBucket] = {}
+
+    def __len__(self):
+        return len(self._buckets)
+
+    def get(self, ipv4: str) -> TokenBucket:
+        if ipv4 not in self._buckets:
+            self._buckets[ipv4] = TokenBucket(**self._bucket_params)
+        return self._buckets[ipv4]
+
+    def clear(self) -> None:
+        self._buckets.clear()
@@ -7,6 +7,11 @@ from sdp_lib.management_controllers.exceptions import ConnectionTimeout, BadCont
 
 
 class AsyncHttpRequests:
+    """
+    Http запросы к хосту через сессию хоста(instance_host.driver).
+    Таймаут запроса ограничивает получение соединения(connect), ограничение чтения
+    ответа(sock_read) берётся из таймаута сессии хоста.
+    """
 
     default_timeout_get_request = .4
     default_timeout_post_request = .6
@@ -14,12 +19,15 @@ class AsyncHttpRequests:
     def __init__(self, instance_host):
         self._instance_host = instance_host
 
+    def _create_timeout(self, timeout: float) -> aiohttp.ClientTimeout:
+        return aiohttp.ClientTimeout(connect=timeout, sock_read=self._instance_host.driver.timeout.sock_read)
+
     async def fetch(
             self,
             url: str,
             timeout: float = .4
     ) -> str:
-        async with self._instance_host.driver.get(url, timeout=aiohttp.ClientTimeout(connect=timeout)) as response:
+        async with self._instance_host.driver.get(url, timeout=self._create_timeout(timeout)) as response:
             assert response.status == 200
             return await response.text()
 
@@ -31,7 +39,7 @@ class AsyncHttpRequests:
     ) -> int:
         async with self._instance_host.driver.post(
                 url,
-                timeout=aiohttp.ClientTimeout(connect=timeout),
+                timeout=self._create_timeout(timeout),
                 **kwargs
         ) as response:
             assert response.status == 200
@@ -53,7 +61,6 @@ class AsyncHttpRequests:
                  при ошибке в получении контента, иначе None.
                  [1] -> контент веб страницы типа str, если запрос выполнен успешно, иначе None.
         """
-        print(f'++ self.method: {method.__name__}')
         error = content = None
         try:
             content = await method(
@@ -1,6 +1,6 @@
 import json
 import pprint
-import time
+import re
 from typing import (
     Any,
     TypeAlias
@@ -43,19 +43,43 @@ class ParserBase(Parsers):
 class MainPageParser(ParserBase):
     """
     Парсер контента главной web страницы ДК Peek.
+    Контент разбирается скомпилированными регулярными выражениями без разбиения на строки:
+    общие данные ДК(до первого ":ENDTABLE") - regex_common, данные потоков(xp) - regex_streams.
+    Пример строк общих данных:
+        ":SUBTITLE;Moscow: Панфиловс пр / Андреевка"
+        ":D;;##T_PLAN##;006 -             "
+        ":D;;##T_TIMINGSET##;005"
+        ":D;;##T_TIME##;2025-03-01 16:39:57"
+        ":D;;##T_ALARMS##;ISWC"
+    Пример строк потока(xp):
+        "<b>##T_STREAM## 1</b>"
+        ":BEGINTABLE"
+        ":W;;200px;"
+        ":D;;##T_STATE##;УПРАВЛЕНИЕ"
+        ":D;;##T_CYCLE##;0 (0)"
+        ":D;;##T_MODE## (##T_STAGE##);FT (6)"
+        ":ENDTABLE"
     """
 
-    pattern_address = ':SUBTITLE;'
-    pattern_plan = ':D;;##T_PLAN##;'
-    pattern_plan_param = '##T_TIMINGSET##;'
-    pattern_time = ':D;;##T_TIME##;'
-    pattern_alarms = ':D;;##T_ALARMS##;'
     pattern_end_table = ':ENDTABLE'
 
-    pattern_stream = '<b>##T_STREAM## '
-    pattern_state = ':D;;##T_STATE##;'
-    pattern_cycle = ':D;;##T_CYCLE##;'
-    pattern_mode_and_stage = ':D;;##T_MODE## (##T_STAGE##);'
+    regex_common = re.compile(
+        r'(?m)^:(?:'
+        r'SUBTITLE;(?P<address>[^\r\n]*)'
+        r'|D;;##T_(?:'
+        r'PLAN##;[ \t]*(?P<plan>[^\s]*)[^\r\n]*'
+        r'|TIMINGSET##;(?P<plan_param>[^\r\n]*)'
+        r'|TIME##;(?P<time>[^\r\n]*)'
+        r'|ALARMS##;(?P<alarms>[^\r\n]*)'
+        r'))'
+    )
+    regex_streams = re.compile(
+        r'(?m)^<b>##T_STREAM## (?P<xp>[^\r\n<]*)</b>\r?\n'
+        r'(?:[^\r\n]*\r?\n){2}'
+        r':D;;##T_STATE##;(?P<state>[^\r\n]*)\r?\n'
+        r'[^\r\n]*\r?\n'
+        r':D;;##T_MODE## \(##T_STAGE##\);(?P<mode>[^\s(]*)[ \t]*\((?P<stage>[^)\r\n]*)\)'
+    )
 
     def __init__(self):
         super().__init__()
@@ -64,7 +88,6 @@ class MainPageParser(ParserBase):
         self.current_plan_param = None
         self.current_time = None
         self.current_alarms = None
-        self._num_xp = None
         self.all_xp_data = []
 
     def __repr__(self):
@@ -74,144 +97,33 @@ class MainPageParser(ParserBase):
             f'self.current_plan_param: {self.current_plan_param!r}\n'
             f'self.current_time: {self.current_time!r}\n'            
             f'self.alarms: {self.current_alarms!r}\n'            
-            f'self.num_xp: {self._num_xp!r}\n'
             f'self.all_xp_data: {self.all_xp_data!r}\n'
             f'self.parsed_content_as_dict: {json.dumps(self.parsed_content_as_dict, indent=4, ensure_ascii=False)}'
         )
 
-    def extract_address(self, line: str) -> str:
-        """
-        Извлекает адрес из переданной строки line.
-        :param line: Строка с web страницы ДК Peek, содержащая адрес.
-                     Пример: ":SUBTITLE;Moscow: Панфиловс пр / Андреевка"
-        :return: Адрес объекта. Пример: "Moscow: Панфиловс пр / Андреевка"
-        """
-        return self.base_extract_data_from_line(line, self.pattern_address)
-
-    def extract_current_plan(self, line: str) -> str | None:
-        """
-        Извлекает номер текущего плана ДК из переданной строки line.
-        :param line: Строка с web страницы ДК Peek, содержащая номер плана.
-                     Пример: ":D;;##T_PLAN##;006 -             "
-        :return: Текущий номер плана. Пример: "006"
-        """
-        try:
-            return line.split(self.pattern_plan)[-1].split(maxsplit=1)[0]
-        except IndexError:
-            pass
-        return None
-
-    def extract_current_plan_param(self, line: str) -> str | None:
-        """
-        Извлекает параметр текущего плана ДК из переданной строки line.
-        :param line: Строка с web страницы ДК Peek, содержащая параметр плана.
-                     Пример: ":D;;##T_TIMINGSET##;005"
-        :return: Текущий параметр плана. Пример: "005"
-        """
-        return self.base_extract_data_from_line(line, self.pattern_plan_param)
-
-    def extract_current_time(self, line: str) -> str | None:
-        """
-        Извлекает текущее время ДК из переданной строки line.
-        :param line: Строка с web страницы ДК Peek, содержащая текущее время.
-                     Пример: ":D;;##T_TIME##;2025-03-01 16:39:57"
-        :return: Текущее время. Пример: "2025-03-01 16:39:57"
-        """
-        return self.base_extract_data_from_line(line, self.pattern_time)
-
-    def extract_current_alarms(self, line: str) -> str | None:
-        """
-        Извлекает текущие ошибки ДК из переданной строки line.
-        :param line: Строка с web страницы ДК Peek, содержащая текущие ошибки.
-                     Пример: ":D;;##T_ALARMS##;ISWC"
-        :return: Текущие ошибки. Пример: "ISWC"
-        """
-        return self.base_extract_data_from_line(line, self.pattern_alarms)
-
-    def extract_current_num_xp(self, line: str) -> str | None:
-        """
-        Извлекает номер текущего потока(xp) переданной строки line.
-        :param line: Строка с web страницы ДК Peek, содержащая текущие ошибки.
-                     Пример: "<b>##T_STREAM## 1</b>"
-        :return: Номер текущего потока(xp). Пример: "1"
-        """
-        try:
-            return line.split(self.pattern_stream)[-1].replace('</b>', '')
-        except IndexError:
-            pass
-        return line
-
-    def extract_current_xp_state(self, line: str) -> str | None:
-        """
-        Извлекает номер текущего потока(xp) переданной строки line.
-        :param line: Строка с web страницы ДК Peek, содержащая текущие ошибки.
-                     Пример: ":D;;##T_STATE##;УПРАВЛЕНИЕ"
-        :return: Номер текущего потока(xp). Пример: "УПРАВЛЕНИЕ"
-        """
-        return self.base_extract_data_from_line(line, self.pattern_state)
-
-    def extract_current_xp_mode_and_stage(self, line: str) -> tuple[str | None, str | None]:
-        """
-        Извлекает текущий режим и фазу потока(xp) переданной строки line.
-        :param line: Строка с web страницы ДК Peek, содержащая текущие ошибки.
-                     Пример: ":D;;##T_MODE## (##T_STAGE##);FT (5)"
-        :return: Кортеж из значений текущего режима и фазы потока(xp). Пример: ("FT", "5")
-        """
-        try:
-            mode, stage = self.base_extract_data_from_line(line, self.pattern_mode_and_stage).split()
-            return mode, stage.replace('(', '').replace(')', '')
-        except IndexError:
-            return None, None
-
-    def parse_xp_data(self, lines: list[str]) -> tuple[str, str, str, str]:
-        """
-        Извлекает текущую информацию для потока(xp) переданного списка lines.
-        :param lines: Список с web страницы ДК Peek, содержащий строки с данными о потоке.
-                      len(lines) == 7.
-                      Пример: ["<b>##T_STREAM## 1</b>",
-                              ":BEGINTABLE",
-                              ":W;;200px;",
-                              ":D;;##T_STATE##;УПРАВЛЕНИЕ",
-                              ":D;;##T_CYCLE##;0 (0)",
-                              ":D;;##T_MODE## (##T_STAGE##);FT (6)",
-                              ":ENDTABLE"]
-        :return: Кортеж из значений текущего режима и фазы потока(xp). Пример: ("FT", "6")
-        """
-        print(f'lines::: {lines}')
-        num_xp = self.extract_current_num_xp(lines[0])
-        state = self.extract_current_xp_state(lines[3])
-        mode, stage = self.extract_current_xp_mode_and_stage(lines[5])
-        return num_xp, state, mode, stage
-
     def parse(self, content: str):
         """
         Парсит данные с основной web страницы ДК Peek, присваивая их соответствующим атрибутам.
-        :param get_parsed_data_as_dict: Параметр является опцией.
-                                        При True -> формирует атрибут self.parsed_content_as_dict.
-        :return: None.
-        """
-        self.content_as_list = content.splitlines()
-        common_data_is_extracted = False
-        for i, line in enumerate(self.content_as_list):
-            if not common_data_is_extracted:
-                if self.pattern_address in line:
-                    self.address = self.extract_address(line)
-                elif self.pattern_plan in line:
-                    self.current_plan = self.extract_current_plan(line)
-                elif self.pattern_plan_param in line:
-                    self.current_plan_param = self.extract_current_plan_param(line)
-                elif self.pattern_time in line:
-                    self.current_time = self.extract_current_time(line)
-                elif self.pattern_alarms in line:
-                    self.current_alarms = self.extract_current_alarms(line)
-                elif self.pattern_end_table in line:
-                    common_data_is_extracted = True
-            elif self.pattern_stream in line:
-                stream_data = self.content_as_list[i: i + 7]
-                self.all_xp_data.append(self.parse_xp_data(stream_data))
+        :param content: Контент главной web страницы ДК Peek.
+        :return: Словарь с данными о текущем состоянии ДК.
+        """
+        end_common_data = content.find(self.pattern_end_table)
+        if end_common_data == -1:
+            end_common_data = len(content)
+        for match in self.regex_common.finditer(content, 0, end_common_data):
+            if match.lastgroup == 'address':
+                self.address = match['address']
+            elif match.lastgroup == 'plan':
+                self.current_plan = match['plan'] or None
+            elif match.lastgroup == 'plan_param':
+                self.current_plan_param = match['plan_param']
+            elif match.lastgroup == 'time':
+                self.current_time = match['time']
+            elif match.lastgroup == 'alarms':
+                self.current_alarms = match['alarms']
+        self.all_xp_data = self.regex_streams.findall(content, end_common_data)
 
         # assert self.all_xp_data and self.data_for_response #DEBUG
-        # print(f'main_page.build_data_for_response(): {self.build_attr_data_for_response(self._get_properties())}')
         return self.build_attr_data_for_response(self._get_properties())
 
     def _get_xp_data_as_dict(self, xp_data: tuple[str, str, str, str]):
@@ -297,28 +209,24 @@ class InputsPageParser(ParserBase):
     TIME     = 4
     ACTUATOR = 5
 
-    pattern_input_data = ':D;'
+    regex = re.compile(
+        r'(?m)^:D;([^;\r\n]*);([^;\r\n]*);([^;\r\n]*);([^;\r\n]*);([^;\r\n]*);([^;\r\n]*)\r?$'
+    )
 
     def parse(self, content: str):
         """
-        Парсит данные с основной web страницы ДК Peek, присваивая их соответствующим атрибутам.
-        :param get_parsed_data_as_dict: Параметр является опцией.
-                                        При True -> формирует атрибут self.parsed_content_as_dict.
-        :return: None.
+        Парсит данные с web страницы входов ДК Peek за один проход скомпилированным
+        регулярным выражением. Пример строки входа: ":D;5;5;MPP_MAN;0;0;-"
+        :param content: Контент web страницы входов ДК Peek.
+        :return: Словарь вида {"inputs": {имя входа: (index, num, name, state, time, actuator)}}.
         """
-        self.content_as_list = content.splitlines()
-        for line in self.content_as_list:
-            if self.pattern_input_data in line:
-                index, num, name, state, _time, actuator = self.extract_data_from_line(line)
-                self.parsed_content_as_dict[name] = (index, num, name, state, _time, actuator)
-        # print(f'inputs_self.build_data_for_response(): {self.build_attr_data_for_response()}')
+        self.parsed_content_as_dict = {
+            inp_data[self.NAME]: inp_data for inp_data in self.regex.findall(content)
+        }
         return self.build_attr_data_for_response(
             [(str(FieldsNames.inputs), self.parsed_content_as_dict)]
         )
 
-    def extract_data_from_line(self, line: str):
-        return line.split(';')[1:]
-
 
 class SetInputsPageParser(ParserBase):
 
@@ -329,12 +237,7 @@ class SetInputsPageParser(ParserBase):
 if __name__ == '__main__':
     s = ':TITLE;##MENU_001a##\n:SUBTITLE;Moscow: Панфиловс пр / Андреевка\n:TFT_NAVBAR;10\n:REFRESH_LOCK;1\n\n:BEGINTABLE\n:W;;200px;\n\n:D;;##T_PLAN##;005 -             \n\n:D;;##T_TIMINGSET##;005\n\n:D;;##T_TIME##;2025-03-01 16:08:41\n:D;;##T_ALARMS##;ISWC\n\n\n:ENDTABLE\n\n<b>##T_STREAM## 1</b>\n:BEGINTABLE\n:W;;200px;\n:D;;##T_STATE##;УПРАВЛЕНИЕ\n:D;;##T_CYCLE##;0 (0)\n:D;;##T_MODE## (##T_STAGE##);FT (3)\n:ENDTABLE\n\n<b>##T_STREAM## 2</b>\n:BEGINTABLE\n:W;;200px;\n:D;;##T_STATE##;УПРАВЛЕНИЕ\n:D;;##T_CYCLE##;0 (0)\n:D;;##T_MODE## (##T_STAGE##);FT (6)\n:ENDTABLE\n\n\n\n\n\n\n\n\n\n\n\n:BEGIN_TFT_ONLY\n<div id="nav_home">\n<br /><br />\n<ul>\n<li><button type=button OnClick=\'top.doDataHref("cell1370.hvi",1)\'>##CELL_1370##</button></li>\n<li><button type=button OnClick=\'top.doDataHref("cell1240.hvi",1)\'>##CELL_1240##</button></li>\n<li><button type=button OnClick=\'top.doHref("detswico.hvi",1)\'>##T_DETSWICO##</button></li>\n</ul>\n</div>\n:END_TFT_ONLY\n'
 
-    start_time = time.perf_counter()
-    o = MainPageParser(s)
-
-    o.parse()
+    o = MainPageParser()
+    o.parse(s)
     print(o)
-
-    print(f'Время составило: {time.perf_counter() - start_time:.8f}')
-    pprint.pprint(o.parsed_content_as_dict)
-
+    pprint.pprint(o.data_for_response)
@@ -0,0 +1,90 @@
+import functools
+from collections.abc import Callable, Iterable, Mapping
+from types import MappingProxyType
+from typing import Any
+
+from sdp_lib.management_controllers.parsers.snmp_parsers.processing_methods import (
+    get_val_as_str,
+    pretty_print
+)
+from sdp_lib.management_controllers.snmp.user_types import T_Varbinds
+
+
+T_Slots = Mapping[tuple[int, ...], tuple[str, Callable]]
+
+
+def convert_oid_to_tuple(oid: str) -> tuple[int, ...]:
+    """
+    Конвертирует оид(или scn) из строки в кортеж чисел.
+    :param oid: Оид в виде строки. Например: 1.3.6.1.4.1.1618.3.7.2.11.1.0 или .1.6.67.79.51.57.57.53
+    :return: Кортеж чисел. Например: (1, 3, 6, 1, 4, 1, 1618, 3, 7, 2, 11, 1, 0)
+    """
+    return tuple(int(num) for num in oid.strip('.').split('.'))
+
+
+class VarbindsDecoder:
+    """
+    Предкомпилированный декодер varbinds для типа дк.
+    Таблица соответствий оидов полям ответа формируется один раз:
+    ключ - оид в виде кортежа чисел, значение - кортеж(имя поля, функция обработки значения).
+    При разборе ответа для каждого varbind выполняется один поиск в словаре по кортежу оида,
+    без str(oid) и удаления scn из строки оида.
+    Для ug405 таблицы с добавленным к оидам scn кэшируются по scn. Scn добавляется
+    только к оидам из scn_required(как в запросе, см. snmp_utils.add_scn_to_oids),
+    остальные оиды(например, utcType2OperationMode) остаются без scn.
+    """
+
+    max_cached_scn = 1024
+
+    def __init__(self, matches: Mapping[str, tuple[str, Callable]], scn_required: Iterable[str] = ()):
+        self._slots: T_Slots = MappingProxyType(
+            {convert_oid_to_tuple(oid): slot for oid, slot in matches.items()}
+        )
+        self._scn_required = frozenset(convert_oid_to_tuple(oid) for oid in scn_required if oid in matches)
+        self._get_slots_with_scn = functools.lru_cache(maxsize=self.max_cached_scn)(
+            self._create_slots_with_scn
+        )
+
+    def _create_slots_with_scn(self, scn_as_ascii: str) -> T_Slots:
+        scn = convert_oid_to_tuple(scn_as_ascii)
+        return MappingProxyType(
+            {(oid + scn if oid in self._scn_required else oid): slot for oid, slot in self._slots.items()}
+        )
+
+    def get_slots(self, scn_as_ascii: str = None) -> T_Slots:
+        """
+        Возвращает таблицу соответствий оидов полям ответа.
+        :param scn_as_ascii: scn в виде строки ascii. Если None, возвращается таблица без scn.
+        :return: Неизменяемый словарь вида {оид в виде кортежа: (имя поля, функция обработки значения)}.
+        """
+        if scn_as_ascii is None:
+            return self._slots
+        return self._get_slots_with_scn(scn_as_ascii)
+
+    def decode(
+            self,
+            varbinds: T_Varbinds,
+            result: dict[str, Any],
+            *,
+            oid_handler: Callable = get_val_as_str,
+            val_oid_handler: Callable = pretty_print,
+            scn_as_ascii: str = None
+    ) -> dict[str, Any]:
+        """
+        Разбирает varbinds и записывает значения в result.
+        :param varbinds: varbinds из ответа.
+        :param result: Словарь, в который будут записаны разобранные значения.
+        :param oid_handler: Функция обработки оида, которого нет в таблице соответствий.
+        :param val_oid_handler: Функция обработки значения оида.
+        :param scn_as_ascii: scn хоста ug405 в виде строки ascii.
+        :return: result.
+        """
+        get_slot = self.get_slots(scn_as_ascii).get
+        for oid, val in varbinds:
+            slot = get_slot(oid.asTuple())
+            if slot is None:
+                result[oid_handler(oid)] = val_oid_handler(val)
+            else:
+                field_name, cb_fn = slot
+                result[field_name] = cb_fn(val_oid_handler(val))
+        return result
@@ -1,11 +1,11 @@
 import abc
 import typing
 from collections.abc import Callable
-from functools import cached_property
 
 from sdp_lib.management_controllers.controller_modes import NamesMode
 from sdp_lib.management_controllers.fields_names import FieldsNames
 from sdp_lib.management_controllers.parsers.parser_core import Parsers
+from sdp_lib.management_controllers.parsers.snmp_parsers.decoders import VarbindsDecoder
 from sdp_lib.management_controllers.parsers.snmp_parsers.mixins import (
     StcipMixin,
     Ug405Mixin
@@ -15,7 +15,7 @@ from sdp_lib.management_controllers.parsers.snmp_parsers.processing_methods impo
     pretty_print
 )
 from sdp_lib.management_controllers.snmp.user_types import T_Varbinds
-from sdp_lib.management_controllers.snmp.oids import Oids
+from sdp_lib.management_controllers.snmp.oids import Oids, oids_scn_required
 
 from sdp_lib.management_controllers.snmp.snmp_utils import(
     StageConverterMixinPotokS,
@@ -29,6 +29,7 @@ class ConfigsParser(typing.NamedTuple):
     oid_handler: Callable
     val_oid_handler: Callable
     host_protocol: str = None
+    scn_as_ascii: str = None
 
 
 default_processing = ConfigsParser(
@@ -54,10 +55,20 @@ default_processing_ug405 = ConfigsParser(
 
 class BaseSnmpParser(Parsers):
 
-    @property
+    _decoder: VarbindsDecoder | None = None
+
+    @classmethod
     @abc.abstractmethod
+    def get_matches(cls) -> dict[str | Oids, tuple[FieldsNames, Callable]]:
+        """
+        Возвращает соответствия оидов полям ответа. Функции обработки значений -
+        функции, staticmethod или classmethod: таблица общая для всех экземпляров
+        класса(см. get_decoder) и не должна ссылаться на экземпляр.
+        """
+
+    @property
     def matches(self) -> dict[str | Oids, tuple[FieldsNames, Callable]]:
-        ...
+        return self.get_matches()
 
     @property
     @abc.abstractmethod
@@ -75,19 +86,29 @@ class BaseSnmpParser(Parsers):
         for field_name, cb_fn in self.extras_methods.items():
             self.parsed_content_as_dict[field_name] = cb_fn()
 
+    @classmethod
+    def get_decoder(cls) -> VarbindsDecoder:
+        """
+        Возвращает декодер varbinds, общий для всех экземпляров класса.
+        Декодер формируется из matches при первом обращении.
+        """
+        if cls.__dict__.get('_decoder') is None:
+            cls._decoder = VarbindsDecoder(cls.get_matches(), oids_scn_required)
+        return cls._decoder
+
     def parse(
             self,
             *,
             varbinds: T_Varbinds,
             config: ConfigsParser = default_processing
     ):
-        for oid, val in varbinds:
-            oid, val = config.oid_handler(oid), config.val_oid_handler(val)
-            try:
-                field_name, cb_fn = self.matches[oid]
-                self.parsed_content_as_dict[field_name] = cb_fn(val)
-            except TypeError:
-                self.parsed_content_as_dict[oid] = val
+        self.get_decoder().decode(
+            varbinds,
+            self.parsed_content_as_dict,
+            oid_handler=config.oid_handler,
+            val_oid_handler=config.val_oid_handler,
+            scn_as_ascii=config.scn_as_ascii
+        )
 
         if config.extras:
             self._add_extras_to_response()
@@ -110,7 +131,8 @@ class ParsersVarbindsSwarco(BaseSnmpParser, StcipMixin):
 
     host_protocol = FieldsNames.protocol_stcip
 
-    def get_soft_flags_180_181_status(self, octet_string: str) -> str:
+    @staticmethod
+    def get_soft_flags_180_181_status(octet_string: str) -> str:
         return octet_string[179: 181]
 
     def get_current_mode(self) -> str | None:
@@ -143,17 +165,17 @@ class ParsersVarbindsSwarco(BaseSnmpParser, StcipMixin):
     def extras_methods(self) -> dict[str, Callable]:
         return {FieldsNames.curr_mode: self.get_current_mode}
 
-    @cached_property
-    def matches(self):
+    @classmethod
+    def get_matches(cls):
         return {
             Oids.swarcoUTCTrafftechFixedTimeStatus: (FieldsNames.fixed_time_status, get_val_as_str),
             Oids.swarcoUTCTrafftechPlanSource: (FieldsNames.plan_source, get_val_as_str),
-            Oids.swarcoUTCStatusEquipment: (FieldsNames.curr_status, self.get_status),
+            Oids.swarcoUTCStatusEquipment: (FieldsNames.curr_status, cls.get_status),
             Oids.swarcoUTCTrafftechPhaseStatus:
                 (FieldsNames.curr_stage, StageConverterMixinSwarco.get_num_stage_from_oid_val),
             Oids.swarcoUTCTrafftechPlanCurrent: (FieldsNames.curr_plan, get_val_as_str),
             Oids.swarcoUTCDetectorQty: (FieldsNames.num_detectors, get_val_as_str),
-            Oids.swarcoSoftIOStatus: (FieldsNames.status_soft_flag180_181, self.get_soft_flags_180_181_status),
+            Oids.swarcoSoftIOStatus: (FieldsNames.status_soft_flag180_181, cls.get_soft_flags_180_181_status),
         }
 
 
@@ -175,10 +197,10 @@ class ParsersVarbindsPotokS(BaseSnmpParser, StcipMixin):
     def extras_methods(self) -> dict[str, Callable]:
         return {FieldsNames.curr_mode: self.get_current_mode}
 
-    @cached_property
-    def matches(self):
+    @classmethod
+    def get_matches(cls):
         return {
-        Oids.swarcoUTCStatusEquipment: (FieldsNames.curr_status, self.get_status),
+        Oids.swarcoUTCStatusEquipment: (FieldsNames.curr_status, cls.get_status),
         Oids.swarcoUTCTrafftechPhaseStatus:
             (FieldsNames.curr_stage, StageConverterMixinPotokS.get_num_stage_from_oid_val),
         Oids.swarcoUTCTrafftechPlanCurrent: (FieldsNames.curr_plan, get_val_as_str),
@@ -231,8 +253,8 @@ class ParsersVarbindsPotokP(BaseSnmpParser, Ug405Mixin):
             FieldsNames.curr_mode: self.get_current_mode
         }
 
-    @cached_property
-    def matches(self):
+    @classmethod
+    def get_matches(cls):
         return {
             Oids.utcType2OperationMode: (FieldsNames.operation_mode, get_val_as_str),
             Oids.potokP_utcReplyDarkStatus: (FieldsNames.dark, get_val_as_str),
@@ -247,8 +269,8 @@ class ParsersVarbindsPotokP(BaseSnmpParser, Ug405Mixin):
 
 
 class ParsersVarbindsPeek(BaseSnmpParser, Ug405Mixin):
-    @property
-    def matches(self) -> dict[str | Oids, tuple[FieldsNames, Callable]]:
+    @classmethod
+    def get_matches(cls) -> dict[str | Oids, tuple[FieldsNames, Callable]]:
         return {}
 
     @property
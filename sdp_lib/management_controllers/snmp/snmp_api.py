@@ -5,3 +5,4 @@ from sdp_lib.management_controllers.snmp.snmp_core import (
     PeekUg405
 )
 
+from sdp_lib.management_controllers.snmp.snmp_sweeper import BulkSnmpSweeper
@@ -38,7 +38,9 @@ from sdp_lib.management_controllers.snmp.snmp_utils import (
     swarco_stcip_varbinds,
     potok_stcip_varbinds,
     potok_ug405_varbinds,
-    peek_ug405_varbinds, CommonVarbindsUg405
+    peek_ug405_varbinds,
+    CommonVarbindsUg405,
+    ScnCache
 )
 from sdp_lib.management_controllers.snmp.user_types import T_Varbinds
 
@@ -190,6 +192,9 @@ class SnmpHosts(Host):
 
 class Ug405Hosts(SnmpHosts, ScnConverterMixin):
 
+    # Общий кэш scn ug405 хостов, None - scn запрашивается перед каждым запросом
+    scn_cache: ScnCache | None = None
+
     def __init__(
             self,
             *,
@@ -227,17 +232,34 @@ class Ug405Hosts(SnmpHosts, ScnConverterMixin):
         """
         Получает и обрабатывает зависимость для snmp-запросов.
         В данной реализации получение scn и установка в соответствующие атрибуты.
+        Если scn хоста есть в self.scn_cache, запрос не отправляется.
         """
 
+        cached_scn = None if self.scn_cache is None else self.scn_cache.get(self._ipv4)
+        if cached_scn is not None:
+            self.scn_as_chars, self.scn_as_ascii_string = cached_scn
+            return
+
         self.last_response = await self._method_for_get_scn(varbinds=[CommonVarbindsUg405.site_id_varbind])
 
         if self._check_snmp_response_errors_and_add_to_host_data_if_has():
             return
         try:
             self._set_scn_from_response()
+            if self.scn_cache is not None:
+                self.scn_cache.add(self._ipv4, self.scn_as_chars, self.scn_as_ascii_string)
         except BadControllerType as e:
             self.add_data_to_data_response_attrs(e)
 
+    def _invalidate_scn_if_response_errors(self) -> None:
+        """
+        Удаляет scn хоста из self.scn_cache, если в ответе есть любая ошибка
+        (BadControllerType, таймаут и т.д.): закэшированный scn мог устареть
+        после замены или перенастройки дк.
+        """
+        if self.scn_cache is not None and self.response_errors:
+            self.scn_cache.invalidate(self._ipv4)
+
     async def _collect_data_and_send_snmp_request_ug405(
             self,
             *,
@@ -250,6 +272,23 @@ class Ug405Hosts(SnmpHosts, ScnConverterMixin):
         Основной метод-драйвер для формирования snmp запроса.
         """
 
+        await self._send_snmp_request_ug405(
+            method=method,
+            varbinds_generate_method=varbinds_generate_method,
+            value=value,
+            parse_method=parse_method
+        )
+        self._invalidate_scn_if_response_errors()
+        return self
+
+    async def _send_snmp_request_ug405(
+            self,
+            *,
+            method: Callable,
+            varbinds_generate_method: Callable,
+            value: int | str = None,
+            parse_method: Callable = None,
+    ):
         await self._get_dependency_data_and_add_error_if_has()
         if self.response_errors:
             return self
@@ -397,7 +436,8 @@ class Ug405Hosts(SnmpHosts, ScnConverterMixin):
             extras=True,
             oid_handler=build_func_with_remove_scn(self.scn_as_ascii_string, get_val_as_str),
             val_oid_handler=pretty_print,
-            host_protocol=FieldsNames.protocol_ug405
+            host_protocol=FieldsNames.protocol_ug405,
+            scn_as_ascii=self.scn_as_ascii_string
         )
 
     def _get_default_processed_config(self):
@@ -83,13 +83,51 @@ async def snmp_set(
     return error_indication, error_status, error_index, var_binds
 
 
+class UdpTransportTargetsPool:
+    """
+    Пул UdpTransportTarget, общий для всех хостов и запросов.
+    Ключ - (ip, timeout, retries).
+    """
+
+    def __init__(self, port: int = 161):
+        self._port = port
+        self._targets: dict[tuple[str, float, int], UdpTransportTarget] = {}
+
+    def __len__(self):
+        return len(self._targets)
+
+    async def get(self, ip: str, timeout: float, retries: int) -> UdpTransportTarget:
+        """
+        Возвращает UdpTransportTarget из пула. Если в пуле нет target с
+        такими параметрами, создаёт его и добавляет в пул.
+        :param ip: ipv4 хоста.
+        :param timeout: таймаут запроса, в секундах.
+        :param retries: количество попыток запроса.
+        :return: UdpTransportTarget.
+        """
+        key = ip, timeout, retries
+        try:
+            return self._targets[key]
+        except KeyError:
+            target = await UdpTransportTarget.create((ip, self._port), timeout=timeout, retries=retries)
+            self._targets[key] = target
+            return target
+
+    def clear(self) -> None:
+        self._targets.clear()
+
+
+udp_transport_targets = UdpTransportTargetsPool()
+
+
 class SnmpRequests:
 
-    def __init__(self, instance):
+    def __init__(self, instance, transport_targets: UdpTransportTargetsPool = udp_transport_targets):
         self._instance_host = instance
         self.ip = instance._ipv4
         self.community_r = instance.snmp_config.community_r
         self.community_w = instance.snmp_config.community_w
+        self._transport_targets = transport_targets
         # self.engine = instance._driver
 
     async def snmp_get(
@@ -126,7 +164,7 @@ class SnmpRequests:
         return await get_cmd(
             self._instance_host.driver,
             CommunityData(self.community_r),
-            await UdpTransportTarget.create((self._instance_host._ipv4, 161), timeout=timeout, retries=retries),
+            await self._transport_targets.get(self._instance_host._ipv4, timeout, retries),
             ContextData(),
             *varbinds
         )
@@ -147,7 +185,7 @@ class SnmpRequests:
         return await set_cmd(
             self._instance_host.driver,
             CommunityData(self.community_w),
-            await UdpTransportTarget.create((self.ip, 161), timeout=timeout, retries=retries),
+            await self._transport_targets.get(self.ip, timeout, retries),
             ContextData(),
             *varbinds
             # *[ObjectType(ObjectIdentity(oid), val) for oid, val in oids]
@@ -190,7 +228,7 @@ class SnmpRequests:
         return await next_cmd(
             self._instance_host.driver,
             CommunityData(self.community_r),
-            await UdpTransportTarget.create((self.ip, 161), timeout=timeout, retries=retries),
+            await self._transport_targets.get(self.ip, timeout, retries),
             ContextData(),
             *varbinds
         )
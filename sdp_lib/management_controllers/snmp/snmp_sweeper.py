@@ -0,0 +1,188 @@
+import asyncio
+import ipaddress
+import logging
+import time
+from collections.abc import AsyncIterator, Iterable, Mapping, Sized
+from typing import Any
+
+from pysnmp.entity.engine import SnmpEngine
+
+from sdp_lib.management_controllers.constants import AllowedControllers
+from sdp_lib.management_controllers.exceptions import BadControllerType
+from sdp_lib.management_controllers.snmp.snmp_core import (
+    SnmpHosts,
+    SwarcoStcip,
+    PotokS,
+    PotokP
+)
+
+
+logger = logging.getLogger(__name__)
+
+
+class SubnetRateLimiter:
+    """
+    Ограничитель частоты запросов к хостам одной подсети.
+    Запросы к хостам одной подсети начинаются не чаще, чем rate раз в секунду.
+    Подсети, к которым не было запросов дольше интервала между запросами,
+    не влияют на ожидание и удаляются не чаще, чем раз в prune_interval секунд.
+    """
+
+    def __init__(self, rate: float, prefix: int = 24, prune_interval: float = 60):
+        self._interval = 1 / rate
+        self._prefix = prefix
+        self._prune_interval = prune_interval
+        self._next_prune = time.monotonic() + prune_interval
+        self._next_start: dict[ipaddress.IPv4Network, float] = {}
+
+    def __len__(self):
+        return len(self._next_start)
+
+    def get_subnet(self, ipv4: str) -> ipaddress.IPv4Network:
+        return ipaddress.IPv4Network(f'{ipv4}/{self._prefix}', strict=False)
+
+    def prune(self, now: float = None) -> None:
+        """
+        Удаляет подсети, для которых очередной запрос уже доступен без ожидания.
+        :param now: Текущее время time.monotonic().
+        :return: None
+        """
+        now = time.monotonic() if now is None else now
+        for subnet in [subnet for subnet, next_start in self._next_start.items() if next_start <= now]:
+            del self._next_start[subnet]
+        self._next_prune = now + self._prune_interval
+
+    async def wait(self, ipv4: str) -> None:
+        """
+        Ожидает, пока для подсети ipv4 не станет доступен очередной запрос.
+        :param ipv4: ipv4 хоста.
+        :return: None
+        """
+        subnet = self.get_subnet(ipv4)
+        now = time.monotonic()
+        if now >= self._next_prune:
+            self.prune(now)
+        start = max(self._next_start.get(subnet, now), now)
+        self._next_start[subnet] = start + self._interval
+        if start > now:
+            await asyncio.sleep(start - now)
+
+
+class BulkSnmpSweeper:
+    """
+    Массовый опрос snmp хостов с ограничением количества одновременных
+    запросов и частоты запросов к каждой подсети. Результаты отдаются
+    асинхронным итератором по мере готовности каждого хоста.
+    Хосты берутся из итератора не более чем max_concurrent задачами-обработчиками,
+    слот подсети занимается после получения слота семафора, непосредственно перед запросом.
+    """
+
+    matches_controllers = {
+        AllowedControllers.SWARCO: SwarcoStcip,
+        AllowedControllers.POTOK_S: PotokS,
+        AllowedControllers.POTOK_P: PotokP,
+    }
+
+    def __init__(
+            self,
+            *,
+            engine: SnmpEngine,
+            max_concurrent: int = 100,
+            subnet_rate: float = 20,
+            subnet_prefix: int = 24
+    ):
+        self._engine = engine
+        self._max_concurrent = max_concurrent
+        self._semaphore = asyncio.Semaphore(max_concurrent)
+        self._subnet_limiter = SubnetRateLimiter(subnet_rate, subnet_prefix)
+
+    def create_host(
+            self,
+            record: Mapping[str, Any] | Any,
+            ip_field: str = 'ip_adress',
+            type_controller_field: str = 'type_controller',
+            number_field: str = 'number'
+    ) -> SnmpHosts:
+        """
+        Создаёт экземпляр snmp хоста из записи БД(например, из crud.SearchDb).
+        :param record: Запись с данными хоста(RowMapping, dict или pydantic модель).
+        :param ip_field: Имя поля с ipv4.
+        :param type_controller_field: Имя поля с типом дк.
+        :param number_field: Имя поля с номером дк.
+        :return: Экземпляр snmp хоста.
+        """
+        if hasattr(record, 'model_dump'):
+            record = record.model_dump()
+        try:
+            host_class = self.matches_controllers[record[type_controller_field]]
+        except KeyError:
+            raise BadControllerType(record.get(type_controller_field))
+        ipv4, number = record[ip_field], record.get(number_field)
+        if host_class is PotokP:
+            return host_class(ipv4=ipv4, host_id=number, engine=self._engine, scn=PotokP.add_CO_to_scn(number))
+        return host_class(ipv4=ipv4, host_id=number, engine=self._engine)
+
+    def create_hosts(self, records: Iterable[Mapping[str, Any] | Any], **kwargs) -> list[SnmpHosts]:
+        """
+        Создаёт экземпляры snmp хостов из записей БД. Записи с типом дк,
+        который не опрашивается по snmp, пропускаются.
+        """
+        hosts = []
+        for record in records:
+            try:
+                hosts.append(self.create_host(record, **kwargs))
+            except BadControllerType:
+                continue
+        return hosts
+
+    async def _request(self, host: SnmpHosts, method_name: str, *args) -> SnmpHosts:
+        async with self._semaphore:
+            await self._subnet_limiter.wait(host.ip_v4)
+            try:
+                return await getattr(host, method_name)(*args)
+            except Exception as exc:
+                host.add_data_to_data_response_attrs(exc)
+                return host
+
+    async def sweep(
+            self,
+            hosts: Iterable[SnmpHosts],
+            method_name: str = 'get_states',
+            *args
+    ) -> AsyncIterator[SnmpHosts]:
+        """
+        Опрашивает хосты и отдаёт каждый хост по мере получения ответа.
+        :param hosts: Экземпляры snmp хостов.
+        :param method_name: Имя метода хоста для запроса(get_states, set_stage...).
+        :param args: Аргументы метода method_name.
+        :return: Асинхронный итератор хостов в порядке получения ответов.
+        """
+        hosts_iterator = iter(hosts)
+        num_workers = min(self._max_concurrent, len(hosts)) if isinstance(hosts, Sized) else self._max_concurrent
+        # Обработчики ожидают, пока потребитель заберёт ответы, если очередь заполнена
+        responses: asyncio.Queue[SnmpHosts | None] = asyncio.Queue(maxsize=max(num_workers, 1))
+
+        async def worker():
+            try:
+                for host in hosts_iterator:
+                    await responses.put(await self._request(host, method_name, *args))
+            except Exception as exc:
+                logger.exception(f'Ошибка опроса хостов: {exc}')
+            await responses.put(None)
+
+        workers = [asyncio.create_task(worker()) for _ in range(num_workers)]
+        remaining = num_workers
+        try:
+            while remaining:
+                host = await responses.get()
+                if host is None:
+                    remaining -= 1
+                else:
+                    yield host
+        finally:
+            for task in workers:
+                task.cancel()
+            await asyncio.gather(*workers, return_exceptions=True)
+
+    def get_states(self, hosts: Iterable[SnmpHosts]) -> AsyncIterator[SnmpHosts]:
+        return self.sweep(hosts, 'get_states')
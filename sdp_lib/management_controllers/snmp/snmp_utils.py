@@ -1,6 +1,8 @@
 
+import functools
 import logging
 import math
+import time
 from collections.abc import Iterable
 from typing import Type
 
@@ -215,6 +217,52 @@ class ScnConverterMixin:
             return self.convert_ascii_string_to_chars(scn_as_ascii_string)
 
 
+class ScnCache:
+    """
+    Кэш scn ug405 хостов. Ключ - ipv4 хоста, значение - scn в виде
+    символов и в виде ascii строки. Запись действительна в течение ttl секунд.
+    """
+
+    def __init__(self, ttl: float = 3600):
+        self._ttl = ttl
+        self._scn: dict[str, tuple[str, str, float]] = {}
+
+    def __len__(self):
+        return len(self._scn)
+
+    def add(self, ipv4: str, scn_as_chars: str, scn_as_ascii: str) -> None:
+        """
+        Добавляет(перезаписывает) scn хоста.
+        :param ipv4: ipv4 хоста.
+        :param scn_as_chars: scn в виде символов. Пример: CO3995
+        :param scn_as_ascii: scn в виде ascii строки. Пример: .1.6.67.79.51.57.57.53
+        :return: None
+        """
+        self._scn[ipv4] = scn_as_chars, scn_as_ascii, time.monotonic()
+
+    def get(self, ipv4: str) -> tuple[str, str] | None:
+        """
+        Возвращает scn хоста.
+        :param ipv4: ipv4 хоста.
+        :return: Кортеж (scn_as_chars, scn_as_ascii), если запись есть и
+                 не устарела, иначе None.
+        """
+        try:
+            scn_as_chars, scn_as_ascii, added_time = self._scn[ipv4]
+        except KeyError:
+            return None
+        if time.monotonic() - added_time > self._ttl:
+            del self._scn[ipv4]
+            return None
+        return scn_as_chars, scn_as_ascii
+
+    def invalidate(self, ipv4: str) -> None:
+        self._scn.pop(ipv4, None)
+
+    def clear(self) -> None:
+        self._scn.clear()
+
+
 class HexValueToIntegerStageConverter:
 
     @classmethod
@@ -282,6 +330,7 @@ class VarbPotokS(AbstractVarbinds):
 class CommonVarbindsUg405:
 
     max_scn = 9999
+    max_cached_scn = 1024
     num_CO_prefix = 'CO'
 
     operation_mode_varbind = wrap_oid_by_object_type(Oids.utcType2OperationMode)
@@ -298,9 +347,14 @@ class CommonVarbindsUg405:
     integer32_val2 = Integer32(2)
     integer32_val3 = Integer32(3)
 
-    states_varbinds: dict[str, Iterable[T_Varbinds]]
     states_oids: T_Oids
 
+    def __init__(self):
+        # Varbinds get_state создаются по требованию для каждого scn и хранятся в LRU кэше
+        self._get_states_varbinds = functools.lru_cache(maxsize=self.max_cached_scn)(
+            self._create_states_varbinds
+        )
+
     @classmethod
     def get_operation_mode_varbinds(cls, op_mode_val: int) -> ObjectType:
         if op_mode_val == 3:
@@ -309,13 +363,21 @@ class CommonVarbindsUg405:
             return cls.operation_mode2_varbind
         return cls.operation_mode1_varbind
 
-    def get_varbinds_current_states(self, scn_as_ascii: str):
-        try:
-            return self.states_varbinds[scn_as_ascii]
-        except KeyError:
-            return add_scn_to_oids(
-                scn_as_ascii, self.states_oids, True
-            )
+    def _create_states_varbinds(self, scn_as_ascii: str) -> T_Varbinds:
+        return add_scn_to_oids(
+            scn_as_ascii, self.states_oids, True, container=tuple
+        )
+
+    def get_varbinds_current_states(self, scn_as_ascii: str) -> T_Varbinds:
+        """
+        Возвращает varbinds для получения текущего состояния дк с scn_as_ascii.
+        :param scn_as_ascii: scn в виде строки. Пример: .1.6.67.79.51.57.57.53
+        :return: Кортеж varbinds.
+        """
+        return self._get_states_varbinds(scn_as_ascii)
+
+    def clear_states_varbinds_cache(self) -> None:
+        self._get_states_varbinds.cache_clear()
 
     def get_varbinds_set_stage(
             self,
@@ -333,7 +395,6 @@ class CommonVarbindsUg405:
 
 class VarbPotokP(CommonVarbindsUg405):
     states_oids = oids.oids_state_potok_p
-    states_varbinds = create_varbinds_get_state_with_scn(oids.oids_state_potok_p)
 
 
 class VarbPeek(CommonVarbindsUg405):
@@ -1,6 +1,7 @@
 import asyncio
 import os
-from typing import Self, Sequence
+import re
+from typing import Any, Self, Sequence
 from collections import deque
 
 import asyncssh
@@ -22,7 +23,9 @@ from sdp_lib.management_controllers.ssh.constants import (
 from sdp_lib.management_controllers.ssh.swarco_terminal import (
     ItcTerminal,
     is_log_l2,
-    get_commands_set_stage, login_commands, instat102_and_display, process_stdout_instat, process_terminal_stdout
+    get_commands_set_stage, login_commands, instat102_and_display, process_stdout_instat, process_terminal_stdout,
+    itc_prompt_pattern, create_batch_input, get_batch_marker_pattern, split_batch_stdout,
+    is_batch_command
 )
 
 
@@ -56,6 +59,50 @@ async def read_timed(
         #     raise ReadFromInteractiveShellError()
 
 
+async def read_until_prompt(
+    stream: asyncssh.SSHReader,
+    timeout: float = 2,
+    prompt_pattern: re.Pattern = itc_prompt_pattern,
+    sentinel: re.Pattern = None,
+    bufsize: int = 4096,
+    tail_size: int = 256
+) -> str:
+    """
+    Читает данные из потока вывода до появления приглашения командной строки
+    в конце прочитанных данных. Таймаут ограничивает общее время чтения сверху.
+    Отмена задачи(CancelledError) не перехватывается.
+    :param stream: Поток обмена данными.
+    :param timeout: Максимальное время чтения данных из потока в секундах.
+    :param prompt_pattern: Шаблон приглашения командной строки в конце вывода.
+    :param sentinel: Шаблон маркера. Если передан, чтение завершается на первом приглашении
+                     после появления маркера в выводе.
+    :param bufsize: Размер буфера в байтах.
+    :param tail_size: Количество последних символов вывода, в которых выполняется поиск.
+    :return: Вывод данных в строковом представлении.
+    """
+    chunks = []
+    tail = ''
+    sentinel_found = sentinel is None
+    loop = asyncio.get_running_loop()
+    deadline = loop.time() + timeout
+    while (remaining := deadline - loop.time()) > 0:
+        try:
+            chunk = await asyncio.wait_for(stream.read(bufsize), remaining)
+        except asyncio.TimeoutError:
+            break
+        if not chunk:
+            break
+        chunks.append(chunk)
+        tail = (tail + chunk).replace('\u0000', '')
+        if not sentinel_found and (sentinel_match := sentinel.search(tail)):
+            sentinel_found = True
+            tail = tail[sentinel_match.end():]
+        if sentinel_found and prompt_pattern.search(tail):
+            break
+        tail = tail[-tail_size:]
+    return ''.join(chunks).replace('\u0000', '')
+
+
 class SwarcoItcUserConnectionsSSH:
     """
     Класс ssh соединений.
@@ -66,11 +113,13 @@ class SwarcoItcUserConnectionsSSH:
             connect_timeout: float = 20,
             login_timeout: float = 10,
             open_interactive_process_timeout: float = 2,
+            keepalive_interval: float = 30,
     ):
         self._ipv4 = ip
         self._connect_timeout = connect_timeout
         self._login_timeout = login_timeout
         self._open_interactive_process_timeout = open_interactive_process_timeout
+        self._keepalive_interval = keepalive_interval
         self._ssh_connection = None
         self._ssh_process = None
         self._last_conn_time = None
@@ -87,7 +136,8 @@ class SwarcoItcUserConnectionsSSH:
                 username=itc_login,
                 password=itc_passwd,
                 options=asyncssh.SSHClientConnectionOptions(connect_timeout=self._connect_timeout,
-                                                            login_timeout=self._login_timeout),
+                                                            login_timeout=self._login_timeout,
+                                                            keepalive_interval=self._keepalive_interval),
                 kex_algs=kex_algs,
                 encryption_algs=enc_algs,
                 known_hosts=None,
@@ -157,6 +207,31 @@ class SwarcoItcUserConnectionsSSH:
         """
         return self._ssh_process
 
+    @property
+    def is_alive(self) -> bool:
+        """
+        Возвращает True, если ssh-соединение не закрыто и процесс оболочки shell не завершён.
+        Разрыв соединения обнаруживается keepalive запросами asyncssh.
+        """
+        return (
+            self._ssh_connection is not None
+            and not self._ssh_connection.is_closed()
+            and self._ssh_process is not None
+            and self._ssh_process.exit_status is None
+        )
+
+    async def close(self) -> None:
+        """
+        Закрывает процесс оболочки shell и ssh-соединение.
+        """
+        if self._ssh_process is not None:
+            self._ssh_process.close()
+            self._ssh_process = None
+        if self._ssh_connection is not None:
+            self._ssh_connection.close()
+            await self._ssh_connection.wait_closed()
+            self._ssh_connection = None
+
     @property
     def stack_connection_errors(self) -> deque:
         """
@@ -182,24 +257,46 @@ class SwarcoItcUserConnectionsSSH:
         """
         self._ssh_process.stdin.write(f'{data}\n')
 
-    async def write_and_read_shell(self, data: str, timeout: float = .6) -> str:
+    async def write_and_read_shell(self, data: str, timeout: float = 2) -> str:
         """
         Записывает данные в stdin сеанса интерактивной оболочки и ожидает ответа.
+        Чтение завершается при появлении приглашения командной строки ITC.
         :param data: Данные для записи в stdin.
+        :param timeout: Максимальное время ожидания ответа в секундах.
         :return: Stdout сеанса интерактивной оболочки.
         """
         self.write_to_shell(data)
-        return await read_timed(self._ssh_process.stdout, timeout=timeout)
+        return await read_until_prompt(self._ssh_process.stdout, timeout=timeout)
+
+    async def write_and_read_shell_batch(self, commands: Sequence[str], timeout: float = 5) -> list[str]:
+        """
+        Записывает пакет команд в stdin сеанса интерактивной оболочки одной операцией,
+        после каждой команды записывается команда вывода маркера. Чтение завершается
+        на приглашении после строки вывода последнего маркера. Общий stdout разделяется по маркерам.
+        Применяется только для неинтерактивных команд(inpNNN=V), см. is_batch_command.
+        :param commands: Команды.
+        :param timeout: Максимальное время ожидания вывода всего пакета в секундах.
+        :return: Список stdout команд в порядке commands.
+        """
+        self._ssh_process.stdin.write(create_batch_input(commands))
+        stdout = await read_until_prompt(
+            self._ssh_process.stdout, timeout=timeout, sentinel=get_batch_marker_pattern(len(commands) - 1)
+        )
+        return split_batch_stdout(stdout, commands)
 
     async def check_connection_and_interactive_session(self) -> bool:
         """
         Проверяет состояние ssh-подключения и сеанса интерактивной оболочки.
-        Сначала происходит проверка сеанса интерактивной оболочки. Если сеанс неактивен, пробует
+        Если соединение и процесс оболочки активны(is_alive), сразу возвращает True без
+        отправки ECHO. Иначе происходит проверка сеанса интерактивной оболочки. Если сеанс неактивен, пробует
         открыть новый сеанс. Если сеанс открыть не удается, инициирует новое ssh-соединение,
         затем пытается открыть сеанса интерактивной оболочки.
         :return: True, если соендинение утсановлено и сеанс интерактивной оболочки готов
                  для чтения и записи данных, иначе False.
         """
+        if self.is_alive:
+            return True
+        self._connection_errors.clear()
         ok = False
         try:
             self.write_to_shell(ItcTerminal.echo)
@@ -251,6 +348,7 @@ class SwarcoSSH(Host):
         self.pretty_output = None
         self.raw_stdout = None
         self.timeout = .2
+        self.batch_commands = True
 
     def create_and_set_driver(self):
         self.set_driver(SwarcoItcUserConnectionsSSH(self.ip_v4))
@@ -272,34 +370,43 @@ class SwarcoSSH(Host):
             self.add_data_to_data_response_attrs(self.driver.get_err_from_stack_or_none())
         return success_conn
 
+    async def _send_group_commands(self, group_commands: list[tuple[str, Any]]) -> list[str]:
+        """
+        Отправляет группу команд. Группа, все команды которой разрешены для пакетной
+        отправки(is_batch_command), отправляется одним пакетом, если batch_commands == True,
+        иначе команды отправляются по одной.
+        :return: Список stdout команд группы.
+        """
+        commands = [command for command, _ in group_commands]
+        if self.batch_commands and all(is_batch_command(command) for command in commands):
+            return await self.driver.write_and_read_shell_batch(commands)
+        return [await self.driver.write_and_read_shell(command) for command in commands]
+
     async def _send_commands(self, terminal_commands_entity):
 
         states = {}
-        sent_commands = []
         self.raw_stdout = []
         self._sent_commands = []
-        print(f'argsargs: {terminal_commands_entity}')
         for group_commands in terminal_commands_entity:
-            for data in group_commands:
-                print(f'data: {data}')
-                command, need_processing = data
-                try:
-                    stdout = await self.driver.write_and_read_shell(command)
-                    self.raw_stdout.append((command, stdout))
-                    self._sent_commands.append(command)
-                    if need_processing:
-                        field_name, processed_data = process_terminal_stdout(command, stdout)
-                        states[field_name] = processed_data
-
-                except ReadFromInteractiveShellError as exc:
-                    raise TypeError('ALARM! FAULT IN SENDING DATA TO SHELL')
-
-                self.add_data_to_data_response_attrs(data={
-                    'states_after_shell_session': states,
-                    'sent_commands': self._sent_commands
-                })
-
-
+            group_commands = list(group_commands)
+            if not group_commands:
+                continue
+            try:
+                stdouts = await self._send_group_commands(group_commands)
+            except ReadFromInteractiveShellError as exc:
+                raise TypeError('ALARM! FAULT IN SENDING DATA TO SHELL')
+
+            for (command, need_processing), stdout in zip(group_commands, stdouts):
+                self.raw_stdout.append((command, stdout))
+                self._sent_commands.append(command)
+                if need_processing:
+                    field_name, processed_data = process_terminal_stdout(command, stdout)
+                    states[field_name] = processed_data
+
+            self.add_data_to_data_response_attrs(data={
+                'states_after_shell_session': states,
+                'sent_commands': self._sent_commands
+            })
 
     def _add_to_send_varbinds_attr(self, *args):
 
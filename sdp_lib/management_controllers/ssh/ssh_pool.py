@@ -0,0 +1,166 @@
+import asyncio
+import logging
+import time
+from collections.abc import AsyncIterator
+from contextlib import asynccontextmanager
+
+from sdp_lib.management_controllers.ssh.ssh_core import SwarcoItcUserConnectionsSSH
+
+
+logger = logging.getLogger(__name__)
+
+
+class SwarcoSshPool:
+    """
+    Пул ssh-сессий Swarco ITC.
+    Для каждого хоста хранится одна сессия(SwarcoItcUserConnectionsSSH), доступ к которой
+    выполняется под asyncio.Lock хоста. Фоновая задача с периодичностью keepalive_interval
+    закрывает сессии, которые не использовались дольше idle_timeout, и сессии с разорванным
+    соединением. При превышении max_size закрывается сессия, которая дольше всех не использовалась.
+    """
+
+    def __init__(
+            self,
+            *,
+            max_size: int = 100,
+            idle_timeout: float = 600,
+            keepalive_interval: float = 30
+    ):
+        self._max_size = max_size
+        self._idle_timeout = idle_timeout
+        self._keepalive_interval = keepalive_interval
+        self._sessions: dict[str, SwarcoItcUserConnectionsSSH] = {}
+        self._locks: dict[str, asyncio.Lock] = {}
+        # Количество задач, которые используют или ожидают блокировку хоста
+        self._users: dict[str, int] = {}
+        self._last_used: dict[str, float] = {}
+        self._task: asyncio.Task | None = None
+
+    def __len__(self):
+        return len(self._sessions)
+
+    def __contains__(self, ip: str):
+        return ip in self._sessions
+
+    def get_lock(self, ip: str) -> asyncio.Lock:
+        if ip not in self._locks:
+            self._locks[ip] = asyncio.Lock()
+        return self._locks[ip]
+
+    def _create_session(self, ip: str) -> SwarcoItcUserConnectionsSSH:
+        return SwarcoItcUserConnectionsSSH(ip, keepalive_interval=self._keepalive_interval)
+
+    @asynccontextmanager
+    async def _hold(self, ip: str) -> AsyncIterator[None]:
+        """
+        Захватывает блокировку хоста. Блокировка удаляется из пула, когда её никто
+        не использует и не ожидает, а сессии хоста в пуле нет.
+        """
+        self._users[ip] = self._users.get(ip, 0) + 1
+        try:
+            async with self.get_lock(ip):
+                yield
+        finally:
+            self._users[ip] -= 1
+            if not self._users[ip]:
+                del self._users[ip]
+                if ip not in self._sessions:
+                    self._locks.pop(ip, None)
+
+    def _is_busy(self, ip: str) -> bool:
+        return ip in self._users
+
+    async def _evict_lru_if_full(self) -> None:
+        """
+        Закрывает сессию, которая дольше всех не использовалась, если пул заполнен.
+        Сессии, которые используются или ожидаются в данный момент, не закрываются.
+        """
+        if len(self._sessions) < self._max_size:
+            return
+        for ip in sorted(self._sessions, key=lambda ip: self._last_used.get(ip, 0)):
+            if self._is_busy(ip):
+                continue
+            # Блокировка свободна: захватывается без ожидания
+            async with self._hold(ip):
+                await self.evict(ip)
+            return
+
+    @asynccontextmanager
+    async def acquire(self, ip: str) -> AsyncIterator[SwarcoItcUserConnectionsSSH]:
+        """
+        Возвращает сессию хоста под блокировкой хоста. Если сессии нет, создаёт новую.
+        Соединение не устанавливается: это делает check_connection_and_interactive_session
+        при первом использовании сессии.
+        :param ip: ipv4 хоста.
+        :return: Сессия хоста.
+        """
+        async with self._hold(ip):
+            if ip not in self._sessions:
+                await self._evict_lru_if_full()
+                self._sessions[ip] = self._create_session(ip)
+            try:
+                yield self._sessions[ip]
+            finally:
+                self._last_used[ip] = time.monotonic()
+
+    async def evict(self, ip: str) -> None:
+        """
+        Удаляет сессию хоста из пула и закрывает соединение.
+        Блокировка хоста удаляется, если её никто не использует.
+        :param ip: ipv4 хоста.
+        :return: None
+        """
+        session = self._sessions.pop(ip, None)
+        self._last_used.pop(ip, None)
+        if not self._is_busy(ip):
+            self._locks.pop(ip, None)
+        if session is None:
+            return
+        try:
+            await session.close()
+        except Exception as exc:
+            logger.debug(f'Ошибка закрытия ssh-сессии {ip}: {exc}')
+
+    async def evict_idle_and_dead(self) -> None:
+        """
+        Закрывает сессии, которые не использовались дольше idle_timeout,
+        и сессии с разорванным соединением.
+        """
+        now = time.monotonic()
+        for ip in list(self._sessions):
+            if self._is_busy(ip):
+                continue
+            async with self._hold(ip):
+                session = self._sessions.get(ip)
+                if session is None:
+                    continue
+                if now - self._last_used.get(ip, now) > self._idle_timeout or not session.is_alive:
+                    await self.evict(ip)
+
+    async def _run(self) -> None:
+        while True:
+            await asyncio.sleep(self._keepalive_interval)
+            try:
+                await self.evict_idle_and_dead()
+            except Exception as exc:
+                logger.exception(f'Ошибка обслуживания пула ssh-сессий: {exc}')
+
+    def start(self) -> asyncio.Task:
+        if self._task is None or self._task.done():
+            self._task = asyncio.create_task(self._run(), name='swarco_ssh_pool')
+        return self._task
+
+    async def close(self) -> None:
+        """
+        Останавливает фоновую задачу и закрывает все сессии.
+        """
+        if self._task is not None:
+            self._task.cancel()
+            try:
+                await self._task
+            except asyncio.CancelledError:
+                pass
+            self._task = None
+        for ip in list(self._sessions):
+            await self.evict(ip)
+        self._locks.clear()
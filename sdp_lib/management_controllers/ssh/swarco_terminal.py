@@ -1,4 +1,7 @@
+import functools
 import os
+import re
+from collections.abc import Sequence
 from enum import StrEnum
 
 from dotenv import load_dotenv
@@ -36,6 +39,7 @@ class ItcTerminal(StrEnum):
 
     echo = 'ECHO'
     l2_identifier = '&&>'
+    prompt = '> '
 
 
 
@@ -101,6 +105,18 @@ def process_terminal_stdout(command, content):
 
 login_commands = [ItcTerminal.lang_uk, ItcTerminal.l2_login, ItcTerminal.l2_pass]
 
+# Команды, которые можно отправлять пакетом: только запись входов inpNNN=V.
+# Команды с интерактивным или многострочным выводом(itc, instat ?, SIMULATE DISPLAY, логин)
+# отправляются по одной.
+batch_command_pattern = re.compile(r'inp\d{3}=[01]')
+
+
+def is_batch_command(command: str) -> bool:
+    """
+    Проверяет, может ли команда быть отправлена в пакете команд.
+    """
+    return batch_command_pattern.fullmatch(command) is not None
+
 def get_instat_command(instat):
     try:
         return f'instat{int(instat.split("instat")[-1])} ?'
@@ -137,6 +153,86 @@ instat102_and_display = [
 ]
 
 
+# Приглашения командной строки ITC: уровень 2, уровень 1 и запрос пароля("Enter password for level 2> ")
+itc_prompts = (f'{ItcTerminal.l2_identifier} ', str(ItcTerminal.prompt))
+# Приглашение - последняя строка вывода: буквы, цифры и пробелы, затем одно из itc_prompts в самом конце.
+# Строка вывода команды, которая заканчивается на "> " в середине вывода, приглашением не считается.
+itc_prompt_pattern = re.compile(rf'(?:^|[\r\n])[\w ]*(?:{"|".join(map(re.escape, itc_prompts))})\Z')
+
+
+def ends_with_prompt(stdout: str, pattern: re.Pattern = itc_prompt_pattern) -> bool:
+    """
+    Проверяет, заканчивается ли stdout приглашением командной строки ITC.
+    """
+    return pattern.search(stdout) is not None
+
+
+def get_batch_marker(num: int) -> str:
+    """
+    Возвращает маркер конца вывода команды с номером num в пакете команд.
+    """
+    return f'SDPMARK{num}END'
+
+
+def get_batch_marker_command(num: int) -> str:
+    """
+    Возвращает команду, которая выводит маркер с номером num(ECHO SDPMARK<num>END).
+    """
+    return f'{ItcTerminal.echo} {get_batch_marker(num)}'
+
+
+@functools.lru_cache(maxsize=64)
+def get_batch_marker_pattern(num: int) -> re.Pattern:
+    """
+    Возвращает шаблон строки вывода маркера: строка целиком состоит из маркера.
+    Эхо команды ECHO SDPMARK<num>END и маркер внутри вывода команды шаблону не соответствуют.
+    """
+    return re.compile(rf'(?:^|(?<=[\r\n])){get_batch_marker(num)}(?=\r?\n|\Z)')
+
+
+def create_batch_input(commands: Sequence[str]) -> str:
+    """
+    Формирует данные для записи пакета команд в stdin одной операцией.
+    После каждой команды записывается команда вывода маркера(ECHO SDPMARK<num>END).
+    :param commands: Команды.
+    :return: Строка для записи в stdin.
+    """
+    return ''.join(f'{command}\n{get_batch_marker_command(num)}\n' for num, command in enumerate(commands))
+
+
+def _remove_last_line(stdout: str, line: str) -> str:
+    pos = stdout.rfind(line)
+    if pos == -1:
+        return stdout
+    end = pos + len(line)
+    while end < len(stdout) and stdout[end] in '\r\n':
+        end += 1
+    return stdout[:pos] + stdout[end:]
+
+
+def split_batch_stdout(stdout: str, commands: Sequence[str]) -> list[str]:
+    """
+    Разделяет общий stdout пакета команд на stdout каждой команды по строкам вывода маркеров.
+    Вывод каждой команды начинается с эха команды и заканчивается приглашением командной
+    строки, как при отправке команд по одной: эхо команды вывода маркера удаляется.
+    Если строка маркера не найдена, вывод команды - весь оставшийся stdout,
+    вывод следующих команд - пустые строки.
+    :param stdout: Общий stdout пакета команд.
+    :param commands: Команды пакета в порядке отправки.
+    :return: Список stdout команд в порядке commands.
+    """
+    result = []
+    start = 0
+    for num, command in enumerate(commands):
+        marker = get_batch_marker_pattern(num).search(stdout, start)
+        end, next_start = (len(stdout), len(stdout)) if marker is None else (marker.start(), marker.end())
+        segment = _remove_last_line(stdout[start:end], get_batch_marker_command(num))
+        command_pos = segment.find(command)
+        result.append(segment[command_pos:] if command_pos != -1 else segment)
+        start = next_start
+    return result
+
+
 def is_log_l2(stdout: str) -> bool:
     return ItcTerminal.l2_identifier in stdout
 
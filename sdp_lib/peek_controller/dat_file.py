@@ -0,0 +1,327 @@
+"""
+Чтение и запись конфигурационных файлов .DAT контроллера Peek(EC-X Configurator).
+
+Файл состоит из заголовка и таблиц вида:
+    :TABLE "XSGSG",400,4,3,4,4,3
+    :RECORD
+    "Type",2
+    "Id1",1
+    "Id2",5
+    "Time",30
+    :END
+    :END
+Строка :TABLE содержит имя таблицы, количество записей, количество полей записи и типы полей.
+Поле типа "memo"(12) записывается пустым значением и блоком :MEMO ... :END.
+"""
+
+import functools
+import io
+import itertools
+import mmap
+import pathlib
+from collections.abc import Callable, Iterable, Iterator, Mapping, Sequence
+from typing import Any, NamedTuple, TextIO
+
+
+TABLE_PREFIX = b':TABLE "'
+
+T_record = dict[str, Any]
+# Функция, которая записывает таблицу, начиная со строки :TABLE, в текстовый файл
+T_table_writer = Callable[[TextIO], None]
+
+
+def _to_bool(value: str) -> bool:
+    return value == 'True'
+
+
+def _to_str(value: str) -> str:
+    return value[1:-1] if len(value) > 1 and value[0] == value[-1] == '"' else value
+
+
+# Тип поля из строки :TABLE -> функция преобразования значения поля
+matches_field_types: dict[int, Callable[[str], Any]] = {
+    1: _to_bool,
+    3: int,
+    4: int,
+    6: int,
+    8: _to_str,
+    10: _to_str,
+}
+
+
+FIELD_TYPES_QUOTED = frozenset((8, 10))
+FIELD_TYPE_MEMO = 12
+# Количество записей, которые write_table объединяет в одну запись в файл
+WRITE_CHUNK_RECORDS = 256
+
+
+class TableHeader(NamedTuple):
+    name: str
+    num_records: int
+    field_types: tuple[int, ...]
+
+
+def parse_table_header(line: str) -> TableHeader:
+    """
+    Разбирает строку :TABLE.
+    :param line: Строка вида ':TABLE "XSGSG",400,4,3,4,4,3'.
+    :return: TableHeader с именем таблицы, количеством записей и типами полей.
+    """
+    name, _, params = line.removeprefix(':TABLE ').partition('",')
+    num_records, num_fields, *field_types = (int(p) for p in params.split(','))
+    return TableHeader(name.strip('"'), num_records, tuple(field_types[:num_fields]))
+
+
+def convert_value(value: str, field_type: int | None) -> Any:
+    """
+    Преобразует значение поля к типу поля. Если тип неизвестен или значение
+    не соответствует типу, возвращает значение без изменений.
+    """
+    try:
+        return matches_field_types[field_type](value)
+    except (KeyError, ValueError):
+        return value
+
+
+def parse_records(table: str) -> list[T_record]:
+    """
+    Разбирает записи таблицы.
+    :param table: Таблица, начиная со строки :TABLE.
+    :return: Список записей вида {имя поля: значение}. Значения преобразуются к типам
+             полей из строки :TABLE, значение поля "memo" - строки блока :MEMO.
+    """
+    lines = table.splitlines()
+    field_types = parse_table_header(lines[0]).field_types
+    records, record = [], None
+    lines_iter = iter(lines[1:])
+    for line in lines_iter:
+        if not line:
+            continue
+        if line == ':RECORD':
+            record = {}
+        elif line == ':END':
+            if record is None:
+                break
+            records.append(record)
+            record = None
+        elif line == ':MEMO' and record:
+            record[next(reversed(record))] = _read_memo(lines_iter)
+        elif record is not None:
+            name, _, value = line.partition(',')
+            field_type = field_types[len(record)] if len(record) < len(field_types) else None
+            record[_to_str(name)] = convert_value(value, field_type)
+    return records
+
+
+def _read_memo(lines_iter: Iterator[str]) -> str:
+    memo = []
+    for line in lines_iter:
+        if line == ':END':
+            break
+        memo.append(line)
+    return '\n'.join(memo)
+
+
+class TableField(NamedTuple):
+    name: str
+    field_type: int
+    # Значение поля, одинаковое для всех записей. Записывается в шаблон записи и не передаётся в записях.
+    constant: Any = None
+
+
+@functools.lru_cache(maxsize=64)
+def create_record_template(fields: tuple[TableField, ...]) -> str:
+    """
+    Формирует шаблон(форматирование через %) блока :RECORD ... :END для полей fields.
+    Значения строковых полей записываются в кавычках, значение поля "memo" - блоком :MEMO.
+    :param fields: Поля записи.
+    :return: Шаблон блока записи.
+    """
+    template = [':RECORD\n']
+    for field in fields:
+        name = field.name.replace('%', '%%')
+        value = '%s' if field.constant is None else str(field.constant).replace('%', '%%')
+        if field.field_type in FIELD_TYPES_QUOTED:
+            template.append(f'"{name}","{value}"\n')
+        elif field.field_type == FIELD_TYPE_MEMO:
+            template.append(f'"{name}",\n:MEMO\n{value}\n:END\n')
+        else:
+            template.append(f'"{name}",{value}\n')
+    template.append(':END\n')
+    return ''.join(template)
+
+
+def write_table(
+        file: TextIO,
+        table_name: str,
+        fields: Sequence[TableField],
+        records: Iterable[tuple],
+        num_records: int
+) -> None:
+    """
+    Записывает таблицу в файл по мере получения записей частями по WRITE_CHUNK_RECORDS записей,
+    без формирования всей таблицы в памяти.
+    :param file: Текстовый файл(буфер) для записи.
+    :param table_name: Имя таблицы, например 'XSGSG'.
+    :param fields: Поля записи таблицы.
+    :param records: Кортежи значений полей записей(кроме полей с constant) в порядке fields.
+    :param num_records: Количество записей для строки :TABLE.
+    :return: None
+    """
+    field_types = ','.join(str(field.field_type) for field in fields)
+    file.write(f':TABLE "{table_name}",{num_records},{len(fields)},{field_types}\n')
+    record_template = create_record_template(tuple(fields))
+    records = iter(records)
+    while chunk := [record_template % record for record in itertools.islice(records, WRITE_CHUNK_RECORDS)]:
+        file.write(''.join(chunk))
+    file.write(':END\n')
+
+
+class DatFile:
+    """
+    Файл .DAT, отображённый в память(mmap).
+    При открытии за один проход по файлу строится индекс: имя таблицы -> диапазон байт таблицы
+    (от строки :TABLE до строки :TABLE следующей таблицы). Разбираются только запрошенные таблицы.
+    При записи нового файла с заменёнными таблицами диапазоны остальных таблиц копируются без изменений.
+
+    Пример:
+        with DatFile('CO413.DAT') as dat_file:
+            conflicts = dat_file.read_table('XSGSG')
+            dat_file.write('new_CO413.DAT', {'XSGSG': table_xsgsg})
+    """
+
+    def __init__(self, path: str | pathlib.Path):
+        self._path = pathlib.Path(path)
+        self._file = open(self._path, 'rb')
+        try:
+            self._data = mmap.mmap(self._file.fileno(), 0, access=mmap.ACCESS_READ)
+        except ValueError:
+            # mmap не поддерживает пустые файлы
+            self._data = b''
+        self._index = self._build_index()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc_val, exc_tb):
+        self.close()
+
+    def __contains__(self, table_name: str):
+        return table_name in self._index
+
+    @property
+    def path(self) -> pathlib.Path:
+        return self._path
+
+    @property
+    def index(self) -> dict[str, tuple[int, int]]:
+        return self._index
+
+    @property
+    def table_names(self) -> list[str]:
+        return list(self._index)
+
+    def _build_index(self) -> dict[str, tuple[int, int]]:
+        """
+        Формирует индекс таблиц файла.
+        :return: Словарь вида {имя таблицы: (начало, конец)}, где начало - смещение строки :TABLE,
+                 конец - смещение строки :TABLE следующей таблицы или размер файла.
+        """
+        starts = []
+        pos = self._find_table(0)
+        while pos >= 0:
+            name_start = pos + len(TABLE_PREFIX)
+            starts.append((self._data[name_start:self._data.find(b'"', name_start)].decode(), pos))
+            pos = self._find_table(pos + 1)
+        ends = [start for _, start in starts[1:]] + [len(self._data)]
+        return {name: (start, end) for (name, start), end in zip(starts, ends)}
+
+    def _find_table(self, start: int) -> int:
+        """
+        Ищет строку :TABLE, начиная с позиции start.
+        :param start: Позиция, с которой выполняется поиск.
+        :return: Смещение строки :TABLE или -1, если строка не найдена.
+        """
+        if start == 0 and self._data[:len(TABLE_PREFIX)] == TABLE_PREFIX:
+            return 0
+        pos = self._data.find(b'\n' + TABLE_PREFIX, start)
+        return pos + 1 if pos >= 0 else -1
+
+    def get_header(self) -> bytes:
+        """
+        Возвращает заголовок файла(всё до первой таблицы).
+        """
+        first_table = min((start for start, _ in self._index.values()), default=len(self._data))
+        return self._data[:first_table]
+
+    def get_table_bytes(self, table_name: str) -> bytes:
+        """
+        Возвращает таблицу в исходном виде.
+        :param table_name: Имя таблицы, например 'XSGSG'.
+        :return: Таблица, начиная со строки :TABLE.
+        :raise KeyError: Если таблицы нет в файле.
+        """
+        start, end = self._index[table_name]
+        return self._data[start:end]
+
+    def get_table_header(self, table_name: str) -> TableHeader:
+        start, end = self._index[table_name]
+        line_end = self._data.find(b'\n', start, end)
+        return parse_table_header(self._data[start:end if line_end < 0 else line_end].decode().rstrip('\r'))
+
+    def read_table(self, table_name: str) -> list[T_record]:
+        """
+        Разбирает записи таблицы.
+        :param table_name: Имя таблицы, например 'XSGSG'.
+        :return: Список записей таблицы(см. parse_records).
+        :raise KeyError: Если таблицы нет в файле.
+        """
+        return parse_records(self.get_table_bytes(table_name).decode('utf-8'))
+
+    def write(
+            self,
+            path_to_new_file: str | pathlib.Path,
+            tables: Mapping[str, str | bytes | T_table_writer]
+    ) -> None:
+        """
+        Записывает новый файл .DAT, в котором таблицы tables заменены новыми.
+        Остальные данные копируются из исходного файла без изменений.
+        :param path_to_new_file: Путь к новому файлу. Не должен совпадать с путём исходного файла.
+        :param tables: Новые таблицы вида {имя таблицы: таблица, начиная со строки :TABLE}.
+                       Вместо таблицы можно передать функцию, которая запишет таблицу
+                       в текстовый файл(например, через write_table).
+        :return: None
+        :raise KeyError: Если заменяемой таблицы нет в файле.
+        """
+        for table_name in tables:
+            if table_name not in self._index:
+                raise KeyError(f'Таблица {table_name!r} отсутствует в файле {self._path}')
+        if pathlib.Path(path_to_new_file).resolve() == self._path.resolve():
+            raise ValueError('Путь к новому файлу совпадает с путём исходного файла')
+
+        with open(path_to_new_file, 'wb') as f:
+            text_file = io.TextIOWrapper(f, encoding='utf-8', newline='')
+            try:
+                pos = 0
+                for start, end, table in sorted(
+                        ((*self._index[table_name], table) for table_name, table in tables.items()),
+                        key=lambda item: item[0]
+                ):
+                    f.write(self._data[pos:start])
+                    if isinstance(table, str):
+                        f.write(table.encode('utf-8'))
+                    elif isinstance(table, bytes):
+                        f.write(table)
+                    else:
+                        table(text_file)
+                        text_file.flush()
+                    pos = end
+                f.write(self._data[pos:])
+            finally:
+                text_file.detach()
+
+    def close(self) -> None:
+        if isinstance(self._data, mmap.mmap):
+            self._data.close()
+        self._file.close()
+
@@ -6,7 +6,7 @@
 import os
 from datetime import datetime
 from io import BytesIO
-from typing import Generator
+from typing import Generator, NamedTuple
 import enum
 
 from xml.etree import ElementTree as ET
@@ -25,15 +25,127 @@ class NamesForSwarcoXML(enum.Enum):
     DETECTOR_LOGICS = 'detector-logics'
 
 
+class SwarcoConfigXMLElements(NamedTuple):
+    general: dict[str, str]
+    itcpc_config: str | None
+    intergreen: ET.Element | None
+    definitions: ET.Element | None
+    instructions: ET.Element | None
+
+
+def _get_target_name(el: ET.Element) -> str | None:
+    """
+    Возвращает имя поля SwarcoConfigXMLElements, если el - искомый элемент конфигурации.
+    Матрица F006 - первый тег intergreen без атрибутов.
+    """
+    if el.tag == NamesForSwarcoXML.INTERGREEN.value:
+        return None if el.attrib else NamesForSwarcoXML.INTERGREEN.value
+    if el.tag in (
+            NamesForSwarcoXML.ITC_PC_CONFIG.value,
+            NamesForSwarcoXML.DEFINITIONS.value,
+            NamesForSwarcoXML.INSTRUCTIONS.value
+    ):
+        return el.tag
+    return None
+
+
+def extract_config_elements(source: str | BytesIO) -> SwarcoConfigXMLElements:
+    """
+    Получает данные конфигурации за один проход по xml(iterparse).
+    Атрибуты всех тегов general объединяются. Из тегов itcpc-config, intergreen(без атрибутов),
+    definitions и instructions сохраняется первое вхождение: элемент отсоединяется от родителя
+    и остаётся в памяти целиком. Остальные элементы очищаются и удаляются из дерева сразу после
+    разбора, поэтому расход памяти не зависит от размера конфигурации.
+    Разбор прекращается, когда найдены все элементы.
+    :param source: Путь к itc-config.xml или BytesIO с содержимым файла.
+    :return: SwarcoConfigXMLElements. Поле, элемент которого не найден, равно None.
+    """
+
+    if isinstance(source, (str, os.PathLike)):
+        with open(source, 'rb') as f:
+            return extract_config_elements(f)
+
+    general, found = {}, {}
+    num_targets = 4
+    stack: list[ET.Element] = []
+    # Глубина искомого элемента, который разбирается в данный момент
+    target_depth = None
+    for event, el in ET.iterparse(source, events=('start', 'end')):
+        if event == 'start':
+            if el.tag == NamesForSwarcoXML.GENERAL.value:
+                general |= el.attrib
+            elif target_depth is None:
+                name = _get_target_name(el)
+                if name is not None and name not in found:
+                    found[name] = el
+                    target_depth = len(stack)
+            stack.append(el)
+            continue
+
+        stack.pop()
+        if target_depth is not None:
+            if len(stack) > target_depth:
+                continue
+            target_depth = None
+        else:
+            el.clear()
+        if stack:
+            del stack[-1][-1]
+        if len(found) == num_targets and target_depth is None:
+            break
+
+    itcpc_config = found.get(NamesForSwarcoXML.ITC_PC_CONFIG.value)
+    return SwarcoConfigXMLElements(
+        general=general,
+        itcpc_config=itcpc_config.text if itcpc_config is not None else None,
+        intergreen=found.get(NamesForSwarcoXML.INTERGREEN.value),
+        definitions=found.get(NamesForSwarcoXML.DEFINITIONS.value),
+        instructions=found.get(NamesForSwarcoXML.INSTRUCTIONS.value)
+    )
+
+
 class SwarcoParseConfigXML:
     xml_itc_config_name = 'itc-config.xml'
 
     def __init__(self, source: str | BytesIO):
         self.source = source
-        self.tree = ET.parse(source)
-        self.root = self.tree.getroot()
+        self._tree: ET.ElementTree | None = None
+        self._elements: SwarcoConfigXMLElements | None = None
         self.general_intersection_data = None
 
+    @property
+    def tree(self) -> ET.ElementTree:
+        """
+        Дерево xml целиком. Разбирается при первом обращении, для формирования
+        .PTC2 не используется(см. get_elements).
+        """
+        if self._tree is None:
+            if isinstance(self.source, BytesIO):
+                self.source.seek(0)
+            self._tree = ET.parse(self.source)
+        return self._tree
+
+    @property
+    def root(self) -> ET.Element:
+        return self.tree.getroot()
+
+    def get_elements(self) -> SwarcoConfigXMLElements:
+        """
+        Возвращает данные конфигурации, полученные за один проход по xml(см. extract_config_elements).
+        При первом вызове заполняет self.general_intersection_data.
+        """
+        if self._elements is None:
+            if isinstance(self.source, BytesIO):
+                self.source.seek(0)
+            self._elements = extract_config_elements(self.source)
+            self.general_intersection_data = self._elements.general
+        return self._elements
+
+    def _get_general_intersection_data(self) -> dict[str, str]:
+        if self.general_intersection_data is None:
+            self.get_elements()
+        return self.general_intersection_data
+
     def __eq__(self, other):
         return self.source == other.source
 
@@ -110,12 +222,12 @@ class SwarcoParseConfigXML:
         """
 
         # print(f'--intergreen tag before = {intergreen_tag}')
-        if not intergreen_tag:
-            intergreen_tag = self.parser([NamesForSwarcoXML.CONFLICTS_F006.value])[0]
-            if not intergreen_tag:
+        if intergreen_tag is None:
+            intergreen_tag = self.get_elements().intergreen
+            if intergreen_tag is None:
                 raise ValueError
         # print(f'--intergreen tag after = {intergreen_tag}')
-        num_groups = int(self.general_intersection_data.snmp_get(NamesForSwarcoXML.GROUPS.value))
+        num_groups = int(self._get_general_intersection_data().get(NamesForSwarcoXML.GROUPS.value))
         # print(f'--num_groups after = {num_groups}')
 
         not_confl, matrix_dict = '  -  . ;', None
@@ -157,9 +269,9 @@ class SwarcoParseConfigXML:
         :return: None
         """
 
-        if not definitions_tag:
-            definitions_tag = self.parser([NamesForSwarcoXML.DEFINITIONS.value])[0]
-            if not definitions_tag:
+        if definitions_tag is None:
+            definitions_tag = self.get_elements().definitions
+            if definitions_tag is None:
                 raise ValueError
 
         empty_defin = {'00-000-000', '000'}
@@ -172,9 +284,9 @@ class SwarcoParseConfigXML:
 
     def create_instructions(self, instructions_tag=None, option_put_to_dict=False) -> Generator:
 
-        if not instructions_tag:
-            instructions_tag = self.parser([NamesForSwarcoXML.INSTRUCTIONS.value])[0]
-            if not instructions_tag:
+        if instructions_tag is None:
+            instructions_tag = self.get_elements().instructions
+            if instructions_tag is None:
                 raise ValueError
 
         all_control_blocks = {} if option_put_to_dict else option_put_to_dict
@@ -216,14 +328,12 @@ class SwarcoParseConfigXML:
 
     def create_PTC2(self, filename) -> tuple:
 
-        main_config_elem, matrixF006_elem, definitionsF015_elem, cb_instructionsF016_elem = self.parser(
-            [
-                NamesForSwarcoXML.ITC_PC_CONFIG.value, NamesForSwarcoXML.CONFLICTS_F006.value,
-                NamesForSwarcoXML.DEFINITIONS.value, NamesForSwarcoXML.INSTRUCTIONS.value
-            ]
+        elements = self.get_elements()
+        main_config, matrixF006_elem, definitionsF015_elem, cb_instructionsF016_elem = (
+            elements.itcpc_config, elements.intergreen, elements.definitions, elements.instructions
         )
 
-        filename = f"{filename}/{self.general_intersection_data.snmp_get('intersection')} {self.set_curr_datetime()}.PTC2"
+        filename = f"{filename}/{self.general_intersection_data.get('intersection')} {self.set_curr_datetime()}.PTC2"
         with open(filename, 'w') as file:
             head_Work006 = 'NewSheet  : Work.006'
             head_Work015 = 'NewSheet693  : Work.015'
@@ -231,8 +341,7 @@ class SwarcoParseConfigXML:
             NeXt = 'NeXt'
             Work007, Work012, Work017, Work999 = 'Work.007', 'Work.012', 'Work.017', 'Work.999'
             flag_det_logics = flagWork999 = False
-            # print(main_config_elem.text.splitlines())
-            for line in main_config_elem.text.splitlines(keepends=True):
+            for line in main_config.splitlines(keepends=True):
                 if Work012 in line:
                     flag_det_logics = True
                 if flag_det_logics and NeXt in line:
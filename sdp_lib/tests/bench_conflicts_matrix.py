@@ -0,0 +1,100 @@
+"""
+Сравнение расчёта конфликтов групп(calculate_conflicts_and_stages) на случайных входных данных
+максимального размера(48 групп, 128 фаз):
+прежний перебор всех фаз для каждой группы с проверкой _supervisor_conflicts и
+расчёт битовыми масками(без проверки и в режиме отладки check_conflicts_by_supervisor).
+Перед замером проверяется, что оба способа дают одинаковые свойства групп.
+
+Запуск: python -m sdp_lib.tests.bench_conflicts_matrix
+"""
+
+import random
+import time
+
+from sdp_lib.conflicts.calculate_conflicts import (
+    BaseConflictsAndStagesCalculations,
+    DataFields
+)
+
+
+NUM_GROUPS = 48
+NUM_STAGES = 128
+NUM_CASES = 5
+
+
+class LegacyConflictsAndStagesCalculations(BaseConflictsAndStagesCalculations):
+    """
+    Прежняя реализация calculate_conflicts_and_stages.
+    """
+
+    def calculate_conflicts_and_stages(self) -> None:
+        groups_prop = self.instance_data[DataFields.groups_property.value]
+        for group in self.instance_data.get(DataFields.sorted_all_num_groups.value):
+            groups_prop[group] = self._get_legacy_properties_for_group(group)
+
+    def _get_legacy_properties_for_group(self, num_group: int):
+        group_in_stages = set()
+        conflict_groups = {g for g in self.instance_data[DataFields.all_num_groups.value] if g != num_group}
+        for stage, groups_in_stage in self.instance_data[DataFields.sorted_stages_data.value].items():
+            if num_group in groups_in_stage:
+                group_in_stages.add(stage)
+                for g in groups_in_stage:
+                    conflict_groups.discard(g)
+        assert conflict_groups == self._supervisor_conflicts(num_group)
+        is_always_red: bool = False if group_in_stages else True
+        is_always_green: bool = group_in_stages == set(self.instance_data[DataFields.sorted_stages_data.value].keys())
+        return {
+            DataFields.stages.value: group_in_stages,
+            DataFields.enemy_groups.value: conflict_groups,
+            DataFields.always_red.value: is_always_red,
+            DataFields.always_green.value: is_always_green
+        }
+
+
+class SupervisedConflictsAndStagesCalculations(BaseConflictsAndStagesCalculations):
+    check_conflicts_by_supervisor = True
+
+
+def create_stages(rnd: random.Random) -> dict[str, str]:
+    return {
+        str(stage): ','.join(map(str, rnd.sample(range(1, NUM_GROUPS + 1), rnd.randint(1, NUM_GROUPS // 3))))
+        for stage in range(1, NUM_STAGES + 1)
+    }
+
+
+def calculate(calculation_class: type[BaseConflictsAndStagesCalculations], stages: dict[str, str]):
+    calculation = calculation_class(stages)
+    calculation.processing_data_for_calculation()
+    start_time = time.perf_counter()
+    calculation.calculate_conflicts_and_stages()
+    return time.perf_counter() - start_time, calculation.instance_data[DataFields.groups_property.value]
+
+
+def main():
+    rnd = random.Random(0)
+    total = dict.fromkeys(
+        (LegacyConflictsAndStagesCalculations, BaseConflictsAndStagesCalculations, SupervisedConflictsAndStagesCalculations),
+        0.
+    )
+    for _ in range(NUM_CASES):
+        stages = create_stages(rnd)
+        results = {}
+        for calculation_class in total:
+            elapsed, results[calculation_class] = calculate(calculation_class, stages)
+            total[calculation_class] += elapsed
+        assert (
+            results[LegacyConflictsAndStagesCalculations]
+            == results[BaseConflictsAndStagesCalculations]
+            == results[SupervisedConflictsAndStagesCalculations]
+        )
+    legacy = total[LegacyConflictsAndStagesCalculations]
+    masks = total[BaseConflictsAndStagesCalculations]
+    supervised = total[SupervisedConflictsAndStagesCalculations]
+    print(f'{NUM_GROUPS} групп, {NUM_STAGES} фаз, {NUM_CASES} расчётов:')
+    print(f'прежний расчёт с _supervisor_conflicts: {legacy:.4f} c')
+    print(f'битовые маски: {masks:.4f} c, x{legacy / masks:.1f}')
+    print(f'битовые маски + check_conflicts_by_supervisor: {supervised:.4f} c')
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,163 @@
+"""
+Сравнение формирования таблиц "XSGSG", "YSRM_SA_STG" и "YSRM_UK_STAGE" для DAT файла Peek:
+прежнее накопление строки(str +=) для каждой записи и потоковая запись блоков :RECORD
+по шаблону(write_table) в буферизованный файл.
+Корпус DAT файлов формируется из CO413.DAT заменой таблиц для случайных таблиц фаз
+(до 48 групп, от 2 до 32 фаз). Перед замером проверяется, что оба способа дают побайтово
+одинаковые таблицы и DAT файлы.
+Выводится время формирования таблиц в памяти, время записи DAT файла и пиковый объём
+памяти(tracemalloc) при записи DAT файла для 48 групп.
+
+Запуск: python -m sdp_lib.tests.bench_dat_table_writer
+"""
+
+import io
+import pathlib
+import random
+import tempfile
+import time
+import tracemalloc
+from typing import Tuple
+
+from sdp_lib.conflicts.calculate_conflicts import DataFields, PeekConflictsAndStagesAPI
+from sdp_lib.peek_controller.dat_file import DatFile
+
+
+NUM_CASES = 200
+NUM_REPEATS = 5
+
+path_to_dat = pathlib.Path(__file__).parent.parent / 'peek_controller' / 'CO413.DAT'
+
+
+class LegacyPeekConflictsAndStagesAPI(PeekConflictsAndStagesAPI):
+    """
+    Прежняя реализация формирования таблиц.
+    """
+
+    def get_conflicts_for_write(self) -> str:
+        table_conflicts = f':TABLE "XSGSG",{str(self.instance_data[DataFields.sum_conflicts.value])},4,3,4,4,3\n'
+        for group, properties in self.instance_data[DataFields.groups_property.value].items():
+            for enemy_group in properties[DataFields.enemy_groups.value]:
+                table_conflicts += (
+                    f':RECORD\n'
+                    f'"Type",2\n'
+                    f'"Id1",{group}\n'
+                    f'"Id2",{str(enemy_group)}\n'
+                    f'"Time",30\n'
+                    f':END\n'
+                )
+        return f'{table_conflicts}:END\n'
+
+    def get_ysrm_sa_stage_and_ysrm_uk_stage(self) -> Tuple[str, str]:
+        sum_stages = str(self.instance_data[DataFields.number_of_stages.value])
+        ysrm_sa_stage = f':TABLE "YSRM_SA_STG",{sum_stages},2,4,10\n'
+        ysrm_uk_stage = f':TABLE "YSRM_UK_STAGE",{sum_stages},4,4,4,1,10\n'
+
+        for stage, groups_in_stage in self.instance_data[DataFields.sorted_stages_data.value].items():
+            groups_in_stage = f"{','.join(map(str, groups_in_stage))}"
+            ysrm_sa_stage += (
+                f':RECORD\n'
+                f'"Id",{stage}\n'
+                f'"SGdef","{groups_in_stage}"\n'
+                f':END\n'
+            )
+            ysrm_uk_stage += (
+                f':RECORD\n'
+                f'"ProcessId",1\n'
+                f'"StageId",{stage}\n'
+                f'"StartUpStage",{str(True) if stage == "1" else str(False)}\n'
+                f'"SignalGroups",",{groups_in_stage},"\n'
+                f':END\n'
+            )
+        return f'{ysrm_sa_stage}:END\n', f'{ysrm_uk_stage}:END\n'
+
+
+def create_stages(rnd: random.Random) -> dict[str, str]:
+    num_groups = rnd.randint(2, 48)
+    return {
+        str(stage): ','.join(map(str, rnd.sample(range(1, num_groups + 1), rnd.randint(1, min(num_groups, 6)))))
+        for stage in range(1, rnd.randint(2, 32) + 1)
+    }
+
+
+def create_api(stages: dict[str, str]) -> PeekConflictsAndStagesAPI:
+    api = PeekConflictsAndStagesAPI(stages)
+    api.results_cache = None
+    api.build_data(save_result_json=False)
+    return api
+
+
+def get_legacy_tables(api: PeekConflictsAndStagesAPI) -> dict[str, str]:
+    ysrm_sa_stage, ysrm_uk_stage = LegacyPeekConflictsAndStagesAPI.get_ysrm_sa_stage_and_ysrm_uk_stage(api)
+    return {
+        'XSGSG': LegacyPeekConflictsAndStagesAPI.get_conflicts_for_write(api),
+        'YSRM_SA_STG': ysrm_sa_stage,
+        'YSRM_UK_STAGE': ysrm_uk_stage
+    }
+
+
+def write_tables(api: PeekConflictsAndStagesAPI, file) -> None:
+    api.write_conflicts(file)
+    api.write_ysrm_sa_stage(file)
+    api.write_ysrm_uk_stage(file)
+
+
+def check_equal(apis: list[PeekConflictsAndStagesAPI], tmp_dir: pathlib.Path) -> None:
+    with DatFile(path_to_dat) as dat_file:
+        for api in apis:
+            legacy_tables = get_legacy_tables(api)
+            buffer = io.StringIO()
+            write_tables(api, buffer)
+            assert buffer.getvalue() == ''.join(legacy_tables.values())
+
+            dat_file.write(tmp_dir / 'legacy.DAT', legacy_tables)
+            dat_file.write(tmp_dir / 'new.DAT', get_stream_tables(api))
+            assert (tmp_dir / 'legacy.DAT').read_bytes() == (tmp_dir / 'new.DAT').read_bytes()
+
+
+def get_stream_tables(api: PeekConflictsAndStagesAPI) -> dict:
+    return {
+        'XSGSG': api.write_conflicts,
+        'YSRM_SA_STG': api.write_ysrm_sa_stage,
+        'YSRM_UK_STAGE': api.write_ysrm_uk_stage
+    }
+
+
+def main():
+    rnd = random.Random(0)
+    apis = [create_api(create_stages(rnd)) for _ in range(NUM_CASES)]
+    with tempfile.TemporaryDirectory() as tmp_dir:
+        check_equal(apis, pathlib.Path(tmp_dir))
+    print(f'{NUM_CASES} DAT файлов побайтово совпадают')
+
+    max_api = create_api({str(stage): str(stage) for stage in range(1, 49)})
+    for name, cases in (('корпус', apis), ('48 групп, 2256 конфликтов', [max_api] * 20)):
+        start_time = time.perf_counter()
+        for _ in range(NUM_REPEATS):
+            for api in cases:
+                ''.join(get_legacy_tables(api).values())
+        legacy = time.perf_counter() - start_time
+
+        start_time = time.perf_counter()
+        for _ in range(NUM_REPEATS):
+            for api in cases:
+                write_tables(api, io.StringIO())
+        streaming = time.perf_counter() - start_time
+        print(f'{name}: str += {legacy:.4f} c, write_table {streaming:.4f} c, x{legacy / streaming:.1f}')
+
+    with tempfile.TemporaryDirectory() as tmp_dir, DatFile(path_to_dat) as dat_file:
+        path_to_new_dat = pathlib.Path(tmp_dir) / 'new.DAT'
+        for name, get_tables in (('str +=', get_legacy_tables), ('write_table', get_stream_tables)):
+            start_time = time.perf_counter()
+            for _ in range(NUM_REPEATS * 10):
+                dat_file.write(path_to_new_dat, get_tables(max_api))
+            elapsed = time.perf_counter() - start_time
+            tracemalloc.start()
+            dat_file.write(path_to_new_dat, get_tables(max_api))
+            peak = tracemalloc.get_traced_memory()[1]
+            tracemalloc.stop()
+            print(f'запись DAT, 48 групп, {name}: {elapsed:.4f} c, пик памяти {peak / 1024:.0f} КБ')
+
+
+if __name__ == '__main__':
+    main()
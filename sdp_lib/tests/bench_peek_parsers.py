@@ -0,0 +1,185 @@
+"""
+Сравнение разбора web страниц Peek: прежний построчный разбор(splitlines и поиск
+подстрок в каждой строке) и однопроходный разбор скомпилированным регулярным
+выражением(MainPageParser, InputsPageParser).
+Корпус страниц формируется из примера главной страницы в __main__ parsers_peek_http_new.py:
+разное количество потоков, режимы, фазы, адреса и ошибки, страницы входов с разным
+количеством входов. Перед замером проверяется, что оба способа дают одинаковый результат.
+
+Запуск: python -m sdp_lib.tests.bench_peek_parsers
+"""
+
+import random
+import time
+
+from sdp_lib.management_controllers.fields_names import FieldsNames
+from sdp_lib.management_controllers.parsers.parsers_peek_http_new import (
+    InputsPageParser,
+    MainPageParser
+)
+
+
+NUM_PAGES = 2_000
+NUM_REPEATS = 5
+
+main_page_head = (
+    ':TITLE;##MENU_001a##\n:SUBTITLE;{address}\n:TFT_NAVBAR;10\n:REFRESH_LOCK;1\n\n'
+    ':BEGINTABLE\n:W;;200px;\n\n:D;;##T_PLAN##;{plan} -             \n\n:D;;##T_TIMINGSET##;{plan_param}\n\n'
+    ':D;;##T_TIME##;{time}\n:D;;##T_ALARMS##;{alarms}\n\n\n:ENDTABLE\n\n'
+)
+main_page_stream = (
+    '<b>##T_STREAM## {xp}</b>\n:BEGINTABLE\n:W;;200px;\n:D;;##T_STATE##;{state}\n'
+    ':D;;##T_CYCLE##;0 (0)\n:D;;##T_MODE## (##T_STAGE##);{mode} ({stage})\n:ENDTABLE\n\n'
+)
+main_page_tail = (
+    '\n\n\n\n\n\n\n\n\n\n:BEGIN_TFT_ONLY\n<div id="nav_home">\n<br /><br />\n<ul>\n'
+    '<li><button type=button OnClick=\'top.doDataHref("cell1370.hvi",1)\'>##CELL_1370##</button></li>\n'
+    '<li><button type=button OnClick=\'top.doDataHref("cell1240.hvi",1)\'>##CELL_1240##</button></li>\n'
+    '<li><button type=button OnClick=\'top.doHref("detswico.hvi",1)\'>##T_DETSWICO##</button></li>\n'
+    '</ul>\n</div>\n:END_TFT_ONLY\n'
+)
+inputs_page_head = ':TITLE;##MENU_INPUTS##\n:TFT_NAVBAR;10\n\n:BEGINTABLE\n:W;;50px;50px;200px;50px;100px;50px;\n'
+inputs_page_tail = ':ENDTABLE\n'
+
+
+def create_main_page(rnd: random.Random) -> str:
+    page = [
+        main_page_head.format(
+            address=rnd.choice(('Moscow: Панфиловс пр / Андреевка', 'Moscow: Зеленоград к.1', '')),
+            plan=f'{rnd.randint(0, 32):03}',
+            plan_param=f'{rnd.randint(0, 32):03}',
+            time=f'2025-03-01 16:{rnd.randint(0, 59):02}:{rnd.randint(0, 59):02}',
+            alarms=rnd.choice(('ISWC', '', 'ISWC LAMP'))
+        )
+    ]
+    for xp in range(1, rnd.randint(1, 4) + 1):
+        page.append(
+            main_page_stream.format(
+                xp=xp,
+                state=rnd.choice(('УПРАВЛЕНИЕ', 'ЖМ', 'ОС')),
+                mode=rnd.choice(('FT', 'VA', 'MAN')),
+                stage=rnd.randint(1, 8)
+            )
+        )
+    page.append(main_page_tail)
+    return ''.join(page)
+
+
+def create_inputs_page(rnd: random.Random) -> str:
+    lines = [inputs_page_head]
+    for index in range(1, rnd.randint(20, 120) + 1):
+        lines.append(
+            f':D;{index};{index};{rnd.choice(("MPP_PH", "MPP_MAN", "IN"))}{index};{rnd.randint(0, 1)};'
+            f'{rnd.randint(0, 999)};{rnd.choice(("-", "ВКЛ", "ВЫКЛ"))}\n'
+        )
+    lines.append(inputs_page_tail)
+    return ''.join(lines)
+
+
+def legacy_parse_main_page(content: str) -> dict:
+    """
+    Прежняя реализация MainPageParser.parse(без вызовов методов извлечения данных
+    и без print в parse_xp_data).
+    """
+    address = plan = plan_param = curr_time = alarms = None
+    all_xp_data = []
+    content_as_list = content.splitlines()
+    common_data_is_extracted = False
+    for i, line in enumerate(content_as_list):
+        if not common_data_is_extracted:
+            if ':SUBTITLE;' in line:
+                address = line.split(':SUBTITLE;')[-1]
+            elif ':D;;##T_PLAN##;' in line:
+                try:
+                    plan = line.split(':D;;##T_PLAN##;')[-1].split(maxsplit=1)[0]
+                except IndexError:
+                    plan = None
+            elif '##T_TIMINGSET##;' in line:
+                plan_param = line.split('##T_TIMINGSET##;')[-1]
+            elif ':D;;##T_TIME##;' in line:
+                curr_time = line.split(':D;;##T_TIME##;')[-1]
+            elif ':D;;##T_ALARMS##;' in line:
+                alarms = line.split(':D;;##T_ALARMS##;')[-1]
+            elif ':ENDTABLE' in line:
+                common_data_is_extracted = True
+        elif '<b>##T_STREAM## ' in line:
+            lines = content_as_list[i: i + 7]
+            mode, stage = lines[5].split(':D;;##T_MODE## (##T_STAGE##);')[-1].split()
+            all_xp_data.append(
+                (
+                    lines[0].split('<b>##T_STREAM## ')[-1].replace('</b>', ''),
+                    lines[3].split(':D;;##T_STATE##;')[-1],
+                    mode,
+                    stage.replace('(', '').replace(')', '')
+                )
+            )
+    return {
+        str(FieldsNames.curr_address): address,
+        str(FieldsNames.curr_plan): plan,
+        str(FieldsNames.curr_plan_param): plan_param,
+        str(FieldsNames.curr_time): curr_time,
+        str(FieldsNames.curr_alarms): alarms,
+        str(FieldsNames.num_streams): len(all_xp_data),
+        str(FieldsNames.streams_data): [
+            {
+                str(FieldsNames.curr_xp): xp_data[0],
+                str(FieldsNames.curr_status): xp_data[1],
+                str(FieldsNames.curr_mode): xp_data[2],
+                str(FieldsNames.curr_stage): xp_data[3],
+            }
+            for xp_data in all_xp_data
+        ]
+    }
+
+
+def legacy_parse_inputs_page(content: str) -> dict:
+    """
+    Прежняя реализация InputsPageParser.parse.
+    """
+    inputs = {}
+    for line in content.splitlines():
+        if ':D;' in line:
+            index, num, name, state, _time, actuator = line.split(';')[1:]
+            inputs[name] = (index, num, name, state, _time, actuator)
+    return {str(FieldsNames.inputs): inputs}
+
+
+def measure(parse_func, pages) -> float:
+    best = float('inf')
+    for _ in range(NUM_REPEATS):
+        start_time = time.perf_counter()
+        for page in pages:
+            parse_func(page)
+        best = min(best, time.perf_counter() - start_time)
+    return best
+
+
+def main():
+    rnd = random.Random(0)
+    cases = (
+        (
+            'Главная страница',
+            [create_main_page(rnd) for _ in range(NUM_PAGES)],
+            legacy_parse_main_page,
+            lambda page: MainPageParser().parse(page)
+        ),
+        (
+            'Страница входов',
+            [create_inputs_page(rnd) for _ in range(NUM_PAGES)],
+            legacy_parse_inputs_page,
+            lambda page: InputsPageParser().parse(page)
+        ),
+    )
+    for name, pages, legacy_func, parse_func in cases:
+        for page in pages:
+            assert legacy_func(page) == parse_func(page), page
+        legacy = measure(legacy_func, pages)
+        regex = measure(parse_func, pages)
+        print(
+            f'{name:16}: {NUM_PAGES} страниц, построчный разбор {legacy:.3f} c, '
+            f'регулярное выражение {regex:.3f} c, x{legacy / regex:.2f}'
+        )
+
+
+if __name__ == '__main__':
+    main()
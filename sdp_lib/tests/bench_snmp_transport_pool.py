@@ -0,0 +1,92 @@
+"""
+Сравнение 1000 snmp-get запросов к локальному responder:
+UdpTransportTarget.create на каждый запрос и UdpTransportTarget из UdpTransportTargetsPool.
+
+Запуск: python -m sdp_lib.tests.bench_snmp_transport_pool
+"""
+
+import asyncio
+import time
+
+from pyasn1.codec.ber import decoder, encoder
+from pysnmp.hlapi.v3arch.asyncio import *
+from pysnmp.proto import api, rfc1905
+
+from sdp_lib.management_controllers.snmp.snmp_requests import UdpTransportTargetsPool
+
+
+HOST = '127.0.0.1'
+PORT = 16161
+COMMUNITY = 'public'
+OID = '1.3.6.1.2.1.1.3.0'
+NUM_REQUESTS = 1000
+
+
+class SnmpResponder(asyncio.DatagramProtocol):
+    """
+    Простейший snmp v2c responder: на любой get отвечает значением Integer(1)
+    для каждого оида из запроса.
+    """
+
+    def __init__(self):
+        self.transport = None
+        self.p_mod = api.PROTOCOL_MODULES[api.SNMP_VERSION_2C]
+
+    def connection_made(self, transport):
+        self.transport = transport
+
+    def datagram_received(self, data, addr):
+        req_msg, _ = decoder.decode(data, asn1Spec=self.p_mod.Message())
+        req_pdu = self.p_mod.apiMessage.get_pdu(req_msg)
+        rsp_msg = self.p_mod.apiMessage.get_response(req_msg)
+        rsp_pdu = self.p_mod.apiMessage.get_pdu(rsp_msg)
+        self.p_mod.apiPDU.set_varbinds(
+            rsp_pdu, [(oid, self.p_mod.Integer(1)) for oid, _ in self.p_mod.apiPDU.get_varbinds(req_pdu)]
+        )
+        self.transport.sendto(encoder.encode(rsp_msg), addr)
+
+
+async def get_with_new_target(engine: SnmpEngine):
+    return await get_cmd(
+        engine,
+        CommunityData(COMMUNITY),
+        await UdpTransportTarget.create((HOST, PORT), timeout=1, retries=0),
+        ContextData(),
+        ObjectType(ObjectIdentity(OID), rfc1905.unSpecified)
+    )
+
+
+async def get_with_pool(engine: SnmpEngine, pool: UdpTransportTargetsPool):
+    return await get_cmd(
+        engine,
+        CommunityData(COMMUNITY),
+        await pool.get(HOST, 1, 0),
+        ContextData(),
+        ObjectType(ObjectIdentity(OID), rfc1905.unSpecified)
+    )
+
+
+async def measure(name: str, coro_factory) -> None:
+    start_time = time.perf_counter()
+    for _ in range(NUM_REQUESTS):
+        error_indication, *rest = await coro_factory()
+        assert error_indication is None, error_indication
+    elapsed = time.perf_counter() - start_time
+    print(f'{name:32}: {elapsed:.3f} c, {elapsed / NUM_REQUESTS * 1000:.3f} мс/запрос')
+
+
+async def main():
+    loop = asyncio.get_running_loop()
+    transport, _ = await loop.create_datagram_endpoint(SnmpResponder, local_addr=(HOST, PORT))
+    engine = SnmpEngine()
+    pool = UdpTransportTargetsPool(port=PORT)
+    try:
+        await measure('UdpTransportTarget.create', lambda: get_with_new_target(engine))
+        await measure('UdpTransportTargetsPool', lambda: get_with_pool(engine, pool))
+    finally:
+        engine.close_dispatcher()
+        transport.close()
+
+
+if __name__ == '__main__':
+    asyncio.run(main())
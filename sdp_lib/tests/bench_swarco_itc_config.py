@@ -0,0 +1,165 @@
+"""
+Сравнение получения данных из itc-config.xml Swarco ITC-PC:
+прежний способ(ET.parse всего файла и обход всего дерева SwarcoParseConfigXML.parser
+для каждого create_matrix_F006/create_definitions/create_instructions) и
+однопроходный iterparse(extract_config_elements) с удалением разобранных элементов.
+Конфигурации формируются по структуре, которую ожидает SwarcoParseConfigXML: general,
+itcpc-config, intergreen, definitions, instructions и большое количество других элементов
+(detector-logics, параметры групп с тегами intergreen с атрибутами).
+Перед замером проверяется, что оба способа дают одинаковые данные и одинаковый .PTC2.
+Для каждого размера выводится время и пиковый объём памяти(tracemalloc):
+  - формирование .PTC2(create_PTC2);
+  - отдельные вызовы create_matrix_F006, create_definitions, create_instructions.
+
+Запуск: python -m sdp_lib.tests.bench_swarco_itc_config
+"""
+
+import pathlib
+import random
+import tempfile
+import time
+import tracemalloc
+from xml.sax.saxutils import quoteattr
+
+from sdp_lib.swarco_controller.ITC_PC_config import (
+    NamesForSwarcoXML,
+    SwarcoConfigXMLElements,
+    SwarcoParseConfigXML
+)
+
+
+NUM_GROUPS = 48
+NUM_CONTROL_BLOCKS = 32
+SIZES = (2_000, 20_000, 200_000)
+
+
+class LegacySwarcoParseConfigXML(SwarcoParseConfigXML):
+    """
+    Прежний способ: дерево разбирается целиком при создании экземпляра, каждый вызов
+    get_elements(create_* без элемента) - обход всего дерева.
+    """
+
+    def __init__(self, source):
+        super().__init__(source)
+        self.tree
+
+    def get_elements(self) -> SwarcoConfigXMLElements:
+        main_config, intergreen, definitions, instructions = self.parser(
+            [
+                NamesForSwarcoXML.ITC_PC_CONFIG.value, NamesForSwarcoXML.CONFLICTS_F006.value,
+                NamesForSwarcoXML.DEFINITIONS.value, NamesForSwarcoXML.INSTRUCTIONS.value
+            ]
+        )
+        return SwarcoConfigXMLElements(
+            self.general_intersection_data, main_config.text, intergreen, definitions, instructions
+        )
+
+
+def create_main_config(rnd: random.Random) -> str:
+    lines = []
+    for sheet in ('Work.001', 'Work.007', 'Work.012', 'Work.017', 'Work.999'):
+        lines.append(f'NewSheet693  : {sheet}')
+        for _ in range(rnd.randint(5, 30)):
+            lines.append(';'.join(f'{rnd.randint(0, 999):03}' for _ in range(rnd.randint(2, 6))) + ';')
+        lines.append('NeXt')
+    return '\n'.join(lines) + '\n'
+
+
+def create_filler(rnd: random.Random, num_elements: int) -> list[str]:
+    elements = []
+    for i in range(num_elements // 10):
+        elements.append(f'<logic no="{i}" type="{rnd.randint(0, 9)}">')
+        for j in range(8):
+            elements.append(f'<param no="{j}" value="{rnd.randint(0, 255)}"/>')
+        elements.append(f'<intergreen mode="{rnd.randint(0, 3)}"/></logic>')
+    return elements
+
+
+def create_config(rnd: random.Random, num_elements: int) -> str:
+    parts = [
+        '<?xml version="1.0" encoding="utf-8"?>\n<itc-config>',
+        f'<general intersection="CO{rnd.randint(1000, 9999)}" groups="{NUM_GROUPS}" '
+        f'control-blocks="{NUM_CONTROL_BLOCKS}" detector-logics="{num_elements // 10}"/>',
+        f'<itcpc-config>{create_main_config(rnd)}</itcpc-config>',
+        '<detector-logics>',
+        *create_filler(rnd, num_elements // 2),
+        '</detector-logics>',
+        '<intergreen>',
+    ]
+    for group in range(1, NUM_GROUPS + 1):
+        parts.append(f'<group no="{group:02}">')
+        for enemy in rnd.sample(range(1, NUM_GROUPS + 1), 8):
+            value = f'{enemy:02}-{rnd.randint(0, 9):02}-{rnd.randint(0, 9):02}.0' if enemy != group else '00-00-00.0'
+            parts.append(f'<enemy value="{value}"/>')
+        parts.append('</group>')
+    parts.append('</intergreen><definitions>')
+    for i in range(1, 200):
+        attr = 'input' if i % 7 == 0 else 'value'
+        value = rnd.choice(('00-000-000', '000', f'{i:02}-{rnd.randint(0, 999):03}-{rnd.randint(0, 999):03}'))
+        parts.append(f'<definition no="{i}" {attr}={quoteattr(value)}/>')
+    parts.append('</definitions><instructions>')
+    for block in range(1, NUM_CONTROL_BLOCKS + 1):
+        signal = rnd.choice(('00-000-000', f'{block:02}-001-002'))
+        parts.append(f'<block no="{block}" name="CB{block}" enable="{rnd.randint(0, 1)}" signal="{signal}">')
+        for _ in range(16):
+            parts.append(f'<instruction value="{rnd.choice(("00-00-000", "01-02-003", "10-20-300"))}"/>')
+        parts.append('</block>')
+    parts.append('</instructions><control-blocks>')
+    parts.extend(create_filler(rnd, num_elements // 2))
+    parts.append('</control-blocks></itc-config>\n')
+    return '\n'.join(parts)
+
+
+def get_data(obj: SwarcoParseConfigXML) -> tuple:
+    return (
+        obj.create_matrix_F006()[0],
+        list(obj.create_definitions()),
+        list(obj.create_instructions()),
+        obj.general_intersection_data
+    )
+
+
+def create_ptc2(obj: SwarcoParseConfigXML, path_to_dir: pathlib.Path) -> str:
+    _, (filename, _) = obj.create_PTC2(path_to_dir)
+    return pathlib.Path(filename).read_text()
+
+
+def measure(func) -> tuple[float, float]:
+    tracemalloc.start()
+    start_time = time.perf_counter()
+    func()
+    elapsed = time.perf_counter() - start_time
+    peak = tracemalloc.get_traced_memory()[1]
+    tracemalloc.stop()
+    return elapsed, peak / 1024 / 1024
+
+
+def main():
+    rnd = random.Random(0)
+    with tempfile.TemporaryDirectory() as tmp_dir:
+        tmp_dir = pathlib.Path(tmp_dir)
+        for size in SIZES:
+            path_to_config = tmp_dir / f'{size}.xml'
+            path_to_config.write_text(create_config(rnd, size), encoding='utf-8')
+            (tmp_dir / 'legacy').mkdir(exist_ok=True)
+            (tmp_dir / 'new').mkdir(exist_ok=True)
+            config = str(path_to_config)
+
+            assert get_data(LegacySwarcoParseConfigXML(config)) == get_data(SwarcoParseConfigXML(config))
+            assert (
+                create_ptc2(LegacySwarcoParseConfigXML(config), tmp_dir / 'legacy')
+                == create_ptc2(SwarcoParseConfigXML(config), tmp_dir / 'new')
+            )
+
+            print(f'{size} элементов, {path_to_config.stat().st_size / 1024 / 1024:.1f} МБ:')
+            for name, class_ in (('ET.parse + parser', LegacySwarcoParseConfigXML), ('iterparse', SwarcoParseConfigXML)):
+                ptc2_time, ptc2_peak = measure(lambda: class_(config).create_PTC2(tmp_dir / 'new'))
+                data_time, data_peak = measure(lambda: get_data(class_(config)))
+                print(
+                    f'  {name}: .PTC2 {ptc2_time:.3f} c, {ptc2_peak:.1f} МБ; '
+                    f'create_* {data_time:.3f} c, {data_peak:.1f} МБ'
+                )
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,104 @@
+"""
+Сравнение разбора 10000 синтетических ответов для каждого типа дк:
+прежний BaseSnmpParser.parse(str(oid), удаление scn из строки оида, поиск по строке)
+и VarbindsDecoder(поиск по кортежу оида в общей предкомпилированной таблице).
+Перед замером проверяется, что оба способа дают одинаковый результат.
+
+Запуск: python -m sdp_lib.tests.bench_varbinds_decoder
+"""
+
+import time
+
+from pysnmp.proto.rfc1902 import Integer32, ObjectName, OctetString
+
+from sdp_lib.management_controllers.parsers.snmp_parsers.processing_methods import (
+    build_func_with_remove_scn,
+    get_val_as_str,
+    pretty_print
+)
+from sdp_lib.management_controllers.parsers.snmp_parsers.varbinds_parsers import (
+    BaseSnmpParser,
+    ConfigsParser,
+    ParsersVarbindsSwarco,
+    ParsersVarbindsPotokS,
+    ParsersVarbindsPotokP
+)
+from sdp_lib.management_controllers.snmp.oids import Oids
+from sdp_lib.management_controllers.snmp.snmp_utils import add_scn_to_oids, convert_chars_string_to_ascii_string
+
+
+NUM_RESPONSES = 10_000
+SCN_AS_ASCII = convert_chars_string_to_ascii_string('CO3995')
+
+synthetic_values = {
+    Oids.swarcoUTCTrafftechPhaseStatus: Integer32(3),
+    Oids.swarcoSoftIOStatus: OctetString('0' * 255),
+    Oids.utcReplyGn: OctetString(hexValue='04'),
+}
+
+
+def create_varbinds(parser_class: type[BaseSnmpParser], scn_as_ascii: str = None) -> list:
+    """
+    Формирует ответ с оидами, как в запросе: для ug405 scn добавляется только к оидам из oids_scn_required.
+    """
+    oids = list(parser_class().matches)
+    oids_with_scn = oids if scn_as_ascii is None else add_scn_to_oids(scn_as_ascii, oids)
+    return [
+        (ObjectName(oid_with_scn), synthetic_values.get(oid, Integer32(1)))
+        for oid, oid_with_scn in zip(oids, oids_with_scn)
+    ]
+
+
+def legacy_parse(parser_class: type[BaseSnmpParser], varbinds, config: ConfigsParser) -> dict:
+    """
+    Прежняя реализация BaseSnmpParser.parse(без extras).
+    """
+    parser = parser_class()
+    for oid, val in varbinds:
+        oid, val = config.oid_handler(oid), config.val_oid_handler(val)
+        field_name, cb_fn = parser.matches[oid]
+        parser.parsed_content_as_dict[field_name] = cb_fn(val)
+    return parser.parsed_content_as_dict
+
+
+def decoder_parse(parser_class: type[BaseSnmpParser], varbinds, config: ConfigsParser) -> dict:
+    parser = parser_class()
+    return parser.get_decoder().decode(
+        varbinds,
+        parser.parsed_content_as_dict,
+        oid_handler=config.oid_handler,
+        val_oid_handler=config.val_oid_handler,
+        scn_as_ascii=config.scn_as_ascii
+    )
+
+
+def measure(parse_func, parser_class, responses, config) -> float:
+    start_time = time.perf_counter()
+    for varbinds in responses:
+        parse_func(parser_class, varbinds, config)
+    return time.perf_counter() - start_time
+
+
+def main():
+    stcip_config = ConfigsParser(extras=False, oid_handler=get_val_as_str, val_oid_handler=pretty_print)
+    ug405_config = ConfigsParser(
+        extras=False,
+        oid_handler=build_func_with_remove_scn(SCN_AS_ASCII, get_val_as_str),
+        val_oid_handler=pretty_print,
+        scn_as_ascii=SCN_AS_ASCII
+    )
+    cases = (
+        ('Swarco', ParsersVarbindsSwarco, None, stcip_config),
+        ('Поток (S)', ParsersVarbindsPotokS, None, stcip_config),
+        ('Поток (P)', ParsersVarbindsPotokP, SCN_AS_ASCII, ug405_config),
+    )
+    for name, parser_class, scn_as_ascii, config in cases:
+        responses = [create_varbinds(parser_class, scn_as_ascii) for _ in range(NUM_RESPONSES)]
+        assert legacy_parse(parser_class, responses[0], config) == decoder_parse(parser_class, responses[0], config)
+        legacy = measure(legacy_parse, parser_class, responses, config)
+        decoder = measure(decoder_parse, parser_class, responses, config)
+        print(f'{name:10}: BaseSnmpParser.parse {legacy:.3f} c, VarbindsDecoder {decoder:.3f} c, x{legacy / decoder:.2f}')
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,47 @@
+"""
+Сравнение времени импорта и потребления памяти(RSS) модуля snmp_utils
+при ленивом формировании varbinds Поток(P) и при предварительном
+формировании varbinds для всех CO1..CO9999(прежняя реализация).
+
+Запуск: python -m sdp_lib.tests.bench_varbinds_startup
+"""
+
+import subprocess
+import sys
+
+
+lazy = """
+import resource, time
+start_time = time.perf_counter()
+from sdp_lib.management_controllers.snmp import snmp_utils
+for num_co in range(1, 301):
+    snmp_utils.potok_ug405_varbinds.get_varbinds_current_states(
+        snmp_utils.convert_chars_string_to_ascii_string(f'CO{num_co}')
+    )
+print(time.perf_counter() - start_time, resource.getrusage(resource.RUSAGE_SELF).ru_maxrss)
+"""
+
+eager = """
+import resource, time
+start_time = time.perf_counter()
+from sdp_lib.management_controllers.snmp import snmp_utils, oids
+states_varbinds = snmp_utils.create_varbinds_get_state_with_scn(oids.oids_state_potok_p)
+print(time.perf_counter() - start_time, resource.getrusage(resource.RUSAGE_SELF).ru_maxrss)
+"""
+
+
+def run(code: str) -> tuple[float, int]:
+    """
+    Выполняет code в отдельном процессе.
+    :param code: Код для выполнения.
+    :return: Кортеж из времени выполнения в секундах и максимального RSS в Кб.
+    """
+    out = subprocess.run([sys.executable, '-c', code], capture_output=True, text=True, check=True).stdout
+    elapsed, rss = out.split()
+    return float(elapsed), int(rss)
+
+
+if __name__ == '__main__':
+    for name, code in (('Предварительно CO1..CO9999', eager), ('Лениво, 300 scn', lazy)):
+        elapsed, rss = run(code)
+        print(f'{name:28}: время импорта {elapsed:.3f} c, RSS {rss / 1024:.1f} Мб')
@@ -0,0 +1,59 @@
+import random
+
+import pytest
+
+from sdp_lib.conflicts.calculate_conflicts import (
+    BaseConflictsAndStagesCalculations,
+    DataFields
+)
+
+
+def create_stages(rnd: random.Random, num_groups: int, num_stages: int) -> dict[str, str]:
+    groups = list(range(1, num_groups + 1))
+    return {
+        str(stage): ','.join(map(str, rnd.sample(groups, rnd.randint(1, max(1, num_groups // 3)))))
+        for stage in range(1, num_stages + 1)
+    }
+
+
+def calculate(stages: dict[str, str]) -> BaseConflictsAndStagesCalculations:
+    calculation = BaseConflictsAndStagesCalculations(stages)
+    calculation.processing_data_for_calculation()
+    calculation.calculate_conflicts_and_stages()
+    return calculation
+
+
+def assert_equal_to_supervisor(calculation: BaseConflictsAndStagesCalculations):
+    stages_data = calculation.instance_data[DataFields.sorted_stages_data.value]
+    groups_prop = calculation.instance_data[DataFields.groups_property.value]
+    assert list(groups_prop) == calculation.instance_data[DataFields.sorted_all_num_groups.value]
+    for group, prop in groups_prop.items():
+        group_in_stages = {stage for stage, groups_in_stage in stages_data.items() if group in groups_in_stage}
+        assert prop[DataFields.enemy_groups.value] == calculation._supervisor_conflicts(group)
+        assert prop[DataFields.stages.value] == group_in_stages
+        assert prop[DataFields.always_red.value] is not bool(group_in_stages)
+        assert prop[DataFields.always_green.value] is (group_in_stages == set(stages_data))
+
+
+@pytest.mark.parametrize('seed', range(20))
+def test_masks_equal_to_supervisor_random(seed):
+    rnd = random.Random(seed)
+    stages = create_stages(rnd, rnd.randint(1, 48), rnd.randint(1, 128))
+    assert_equal_to_supervisor(calculate(stages))
+
+
+@pytest.mark.parametrize('stages', [
+    {'1': '1'},
+    {'1': '1,2,3', '2': '1,2,3'},
+    {'1': '1,2', '2': '3,4', '3': '1,4'},
+    # 3, 4, 6 не участвуют в фазах: постоянно красные
+    {'1': '1,2', '2': '5', '3': '2,7'},
+    {'1': '1,2,5.1', '2': '5.1,5.2', '3': '2,5.2'},
+])
+def test_masks_equal_to_supervisor(stages):
+    assert_equal_to_supervisor(calculate(stages))
+
+
+def test_max_size():
+    rnd = random.Random(0)
+    assert_equal_to_supervisor(calculate(create_stages(rnd, 48, 128)))
@@ -0,0 +1,110 @@
+import io
+import pathlib
+
+import pytest
+
+from sdp_lib.conflicts.calculate_conflicts import PeekConflictsAndStagesAPI
+from sdp_lib.peek_controller.dat_file import DatFile, TableField, parse_records, write_table
+
+
+path_to_dat = pathlib.Path(__file__).parent.parent / 'peek_controller' / 'CO413.DAT'
+
+
+@pytest.fixture
+def dat_file():
+    with DatFile(path_to_dat) as dat_file:
+        yield dat_file
+
+
+def test_index(dat_file):
+    assert len(dat_file.table_names) == 42
+    assert dat_file.table_names[0] == 'ABC_C'
+    assert dat_file.table_names[-1] == 'YSRM_WAIT_LAMP'
+    assert dat_file.get_header().endswith(b'END INFORMATION HEADER\n\n')
+    assert dat_file.get_table_bytes('XSGSG').startswith(b':TABLE "XSGSG",400,4,3,4,4,3\n')
+    assert dat_file.get_table_bytes('XSGSG').endswith(b':END\n:END\n')
+
+
+def test_read_all_tables(dat_file):
+    for table_name in dat_file.table_names:
+        header = dat_file.get_table_header(table_name)
+        records = dat_file.read_table(table_name)
+        assert len(records) == header.num_records
+        assert all(len(record) == len(header.field_types) for record in records)
+
+
+def test_typed_records(dat_file):
+    assert dat_file.read_table('XSGSG')[0] == {'Type': 2, 'Id1': 1, 'Id2': 22, 'Time': 30}
+    assert dat_file.read_table('YSRM_UK_STAGE')[0] == {
+        'ProcessId': 1, 'StageId': 1, 'StartUpStage': False, 'SignalGroups': ',61,1,29,34,35,49,20,46,'
+    }
+    memo = dat_file.read_table('History')[0]['Text']
+    assert memo.splitlines()[-1] == 'add confl sg 24 <-> sg 7,8'
+
+
+def test_write_without_changes(dat_file, tmp_path):
+    dat_file.write(tmp_path / 'new.DAT', {})
+    assert (tmp_path / 'new.DAT').read_bytes() == path_to_dat.read_bytes()
+
+
+def test_write_replaced_table(dat_file, tmp_path):
+    table = ':TABLE "XSGSG",1,4,3,4,4,3\n:RECORD\n"Type",2\n"Id1",1\n"Id2",2\n"Time",30\n:END\n:END\n'
+    dat_file.write(tmp_path / 'new.DAT', {'XSGSG': table})
+    with DatFile(tmp_path / 'new.DAT') as new_dat_file:
+        assert new_dat_file.table_names == dat_file.table_names
+        assert new_dat_file.get_header() == dat_file.get_header()
+        for table_name in dat_file.table_names:
+            if table_name == 'XSGSG':
+                assert new_dat_file.get_table_bytes(table_name) == table.encode()
+            else:
+                assert new_dat_file.get_table_bytes(table_name) == dat_file.get_table_bytes(table_name)
+
+    with pytest.raises(KeyError):
+        dat_file.write(tmp_path / 'new.DAT', {'YKLOK': table})
+
+
+def test_write_table(dat_file):
+    fields = (
+        TableField('Id', 4),
+        TableField('Type', 1, constant=True),
+        TableField('Date', 8),
+        TableField('Text', 12),
+    )
+    records = [(i, '09.10.2020', f'line {i}\nline %s') for i in range(1, 601)]
+    buffer = io.StringIO()
+    write_table(buffer, 'History', fields, iter(records), len(records))
+    table = buffer.getvalue()
+
+    assert table.startswith(':TABLE "History",600,4,4,1,8,12\n:RECORD\n"Id",1\n"Type",True\n"Date","09.10.2020"\n')
+    assert table.endswith('"Text",\n:MEMO\nline 600\nline %s\n:END\n:END\n:END\n')
+    assert parse_records(table) == [
+        {'Id': i, 'Type': True, 'Date': date, 'Text': text} for i, date, text in records
+    ]
+
+    history = dat_file.read_table('History')
+    fields = tuple(
+        TableField(name, field_type)
+        for name, field_type in zip(history[0], dat_file.get_table_header('History').field_types)
+    )
+    buffer = io.StringIO()
+    write_table(buffer, 'History', fields, (tuple(record.values()) for record in history), len(history))
+    assert buffer.getvalue().encode() == dat_file.get_table_bytes('History')
+
+
+def test_create_config(dat_file, tmp_path):
+    path_to_src_config = tmp_path / 'CO413.DAT'
+    path_to_src_config.write_bytes(path_to_dat.read_bytes())
+    api = PeekConflictsAndStagesAPI(
+        {'1': '1,2,3', '2': '4,5,6', '3': '7,8,9', '4': '10'}, path_to_src_config=str(path_to_src_config)
+    )
+    api.results_cache = None
+    api.build_data(save_result_json=False)
+
+    with DatFile(tmp_path / 'new_CO413.DAT') as new_dat_file:
+        assert len(new_dat_file.read_table('XSGSG')) == 72
+        assert new_dat_file.read_table('XSGSG') == parse_records(api.get_conflicts_for_write())
+        assert [record['SGdef'] for record in new_dat_file.read_table('YSRM_SA_STG')] == [
+            '1,2,3', '4,5,6', '7,8,9', '10'
+        ]
+        assert len(new_dat_file.read_table('YSRM_UK_STAGE')) == 4
+        assert new_dat_file.get_table_bytes('YSRM_STEP') == dat_file.get_table_bytes('YSRM_STEP')
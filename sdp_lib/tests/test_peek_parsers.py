@@ -0,0 +1,80 @@
+import pathlib
+import random
+
+import pytest
+
+from sdp_lib.management_controllers.fields_names import FieldsNames
+from sdp_lib.management_controllers.parsers.parsers_peek_http_new import InputsPageParser, MainPageParser
+from sdp_lib.tests.bench_peek_parsers import (
+    create_inputs_page,
+    create_main_page,
+    legacy_parse_inputs_page,
+    legacy_parse_main_page
+)
+
+
+path_to_pages = pathlib.Path(__file__).parent / 'peek_pages'
+
+main_page = (path_to_pages / 'main_page.hvi').read_text(encoding='utf-8')
+inputs_page = (path_to_pages / 'inputs_page.hvi').read_text(encoding='utf-8')
+
+
+def get_page_variants(page: str, first_line: str) -> list[str]:
+    """
+    Возвращает страницу, страницу с переводами строк CRLF и страницу,
+    которая начинается со строки first_line(без предшествующего перевода строки).
+    """
+    return [page, page.replace('\n', '\r\n'), page[page.index(first_line):]]
+
+
+rnd = random.Random(0)
+main_pages = get_page_variants(main_page, ':SUBTITLE;') + [create_main_page(rnd) for _ in range(100)]
+inputs_pages = get_page_variants(inputs_page, ':D;') + [create_inputs_page(rnd) for _ in range(100)]
+
+
+@pytest.mark.parametrize('page', main_pages, ids=[f'main_page_{i}' for i in range(len(main_pages))])
+def test_main_page_parser_equals_legacy(page):
+    assert MainPageParser().parse(page) == legacy_parse_main_page(page)
+
+
+@pytest.mark.parametrize('page', inputs_pages, ids=[f'inputs_page_{i}' for i in range(len(inputs_pages))])
+def test_inputs_page_parser_equals_legacy(page):
+    assert InputsPageParser().parse(page) == legacy_parse_inputs_page(page)
+
+
+def test_main_page_parser():
+    assert MainPageParser().parse(main_page) == {
+        str(FieldsNames.curr_address): 'Moscow: Панфиловс пр / Андреевка',
+        str(FieldsNames.curr_plan): '005',
+        str(FieldsNames.curr_plan_param): '005',
+        str(FieldsNames.curr_time): '2025-03-01 16:08:41',
+        str(FieldsNames.curr_alarms): 'ISWC',
+        str(FieldsNames.num_streams): 2,
+        str(FieldsNames.streams_data): [
+            {
+                str(FieldsNames.curr_xp): '1',
+                str(FieldsNames.curr_status): 'УПРАВЛЕНИЕ',
+                str(FieldsNames.curr_mode): 'FT',
+                str(FieldsNames.curr_stage): '3',
+            },
+            {
+                str(FieldsNames.curr_xp): '2',
+                str(FieldsNames.curr_status): 'УПРАВЛЕНИЕ',
+                str(FieldsNames.curr_mode): 'FT',
+                str(FieldsNames.curr_stage): '6',
+            },
+        ]
+    }
+
+
+def test_parsers_first_line():
+    page = ':SUBTITLE;Moscow: Ховрино / Круг\n:D;;##T_PLAN##;007 -  \n:ENDTABLE\n'
+    response = MainPageParser().parse(page)
+    assert response[str(FieldsNames.curr_address)] == 'Moscow: Ховрино / Круг'
+    assert response[str(FieldsNames.curr_plan)] == '007'
+
+    inputs = InputsPageParser().parse(':D;1;1;MPP_MAN;1;0;ВКЛ\n:D;2;2;MPP_PH1;0;0;-')
+    assert inputs[str(FieldsNames.inputs)] == {
+        'MPP_MAN': ('1', '1', 'MPP_MAN', '1', '0', 'ВКЛ'),
+        'MPP_PH1': ('2', '2', 'MPP_PH1', '0', '0', '-'),
+    }
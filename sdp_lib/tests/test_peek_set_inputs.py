@@ -0,0 +1,97 @@
+import pytest
+
+from sdp_lib.management_controllers.fields_names import FieldsNames
+from sdp_lib.management_controllers.http.peek.inputs_cache import PeekInputsCache
+from sdp_lib.management_controllers.http.peek.peek_http import PeekWebHosts
+from sdp_lib.management_controllers.http.peek.varbinds import MPP_MAN
+
+
+pytest_plugins = ('pytest_asyncio', )
+
+
+IP = '10.0.0.1'
+
+inputs_before = {
+    MPP_MAN: ('1', '1', MPP_MAN, '0', '0', '-'),
+    'TEST_IN': ('2', '2', 'TEST_IN', '0', '0', '-'),
+}
+inputs_after = inputs_before | {'TEST_IN': ('2', '2', 'TEST_IN', '1', '0', 'ВКЛ')}
+
+
+def create_host(monkeypatch, read_back: dict) -> tuple[PeekWebHosts, PeekInputsCache, list]:
+    cache = PeekInputsCache()
+    cache.add(IP, inputs_before)
+    host = PeekWebHosts(ipv4=IP)
+    host.inputs_cache = cache
+    posted = []
+
+    async def post_all_pages(page, payload_data):
+        posted.extend(payload_data)
+        return host
+
+    async def get_inputs():
+        host.add_data_to_data_response_attrs(data={str(FieldsNames.inputs): dict(read_back)})
+        return host
+
+    monkeypatch.setattr(host, 'post_all_pages', post_all_pages)
+    monkeypatch.setattr(host, 'get_inputs', get_inputs)
+    return host, cache, posted
+
+
+def get_response_inputs(host: PeekWebHosts) -> dict | None:
+    return host.response_as_dict['data'].get(str(FieldsNames.inputs))
+
+
+@pytest.mark.asyncio
+async def test_verified_inputs_reported(monkeypatch):
+    host, cache, posted = create_host(monkeypatch, read_back=inputs_after)
+    await host.set_inputs_to_web(inps_name_and_vals={'TEST_IN': 'ВКЛ'})
+
+    assert len(posted) == 1
+    assert not host.response_errors
+    assert get_response_inputs(host) == inputs_after
+    assert cache.get(IP) == inputs_after
+
+
+@pytest.mark.asyncio
+async def test_read_back_disagrees(monkeypatch):
+    host, cache, posted = create_host(monkeypatch, read_back=inputs_before)
+    await host.set_inputs_to_web(inps_name_and_vals={'TEST_IN': 'ВКЛ'})
+
+    assert len(posted) == 1
+    assert host.response_errors
+    assert get_response_inputs(host) == inputs_before
+    assert cache.get(IP) is None
+
+
+@pytest.mark.asyncio
+async def test_without_verify(monkeypatch):
+    host, cache, posted = create_host(monkeypatch, read_back=inputs_before)
+    await host.set_inputs_to_web(inps_name_and_vals={'TEST_IN': 'ВКЛ'}, verify=False)
+
+    assert len(posted) == 1
+    assert not host.response_errors
+    assert get_response_inputs(host) is None
+    # Без проверки фактические входы неизвестны: в кэше только прочитанные с web страницы входы
+    assert cache.get(IP) is None
+
+
+@pytest.mark.asyncio
+async def test_nothing_to_change(monkeypatch):
+    host, cache, posted = create_host(monkeypatch, read_back=inputs_after)
+    await host.set_inputs_to_web(inps_name_and_vals={'TEST_IN': '-'})
+
+    assert posted == []
+    assert get_response_inputs(host) == inputs_before
+
+
+@pytest.mark.asyncio
+async def test_without_inputs_cache(monkeypatch):
+    host, cache, posted = create_host(monkeypatch, read_back=inputs_after)
+    host.inputs_cache = None
+    await host.set_inputs_to_web(inps_name_and_vals={'TEST_IN': 'ВКЛ'})
+
+    # Входы до отправки команд прочитаны с web страницы(inputs_after): изменять нечего
+    assert posted == []
+    assert not host.response_errors
+    assert get_response_inputs(host) == inputs_after
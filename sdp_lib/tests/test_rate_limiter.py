@@ -0,0 +1,71 @@
+import asyncio
+import time
+
+import pytest
+
+from sdp_lib.management_controllers.http.rate_limiter import HostsRateLimiter, TokenBucket
+
+
+pytest_plugins = ('pytest_asyncio', )
+
+
+async def acquire_times(bucket: TokenBucket, num: int) -> list[float]:
+    start_time = time.monotonic()
+    times = []
+    for _ in range(num):
+        await bucket.acquire()
+        times.append(time.monotonic() - start_time)
+    return times
+
+
+@pytest.mark.asyncio
+async def test_burst_then_rate():
+    bucket = TokenBucket(burst=3, rate=20, min_rate=1)
+    times = await acquire_times(bucket, 5)
+    assert times[2] < 0.02
+    assert times[3] >= 0.05 * 0.9
+    assert times[4] - times[3] >= 0.05 * 0.9
+
+
+@pytest.mark.asyncio
+async def test_backoff_and_recovery():
+    bucket = TokenBucket(burst=1, rate=20, min_rate=5, backoff_factor=.5, recovery_step=5)
+    bucket.on_timeout()
+    assert bucket.rate == 10
+    bucket.on_timeout()
+    bucket.on_timeout()
+    assert bucket.rate == 5
+
+    # После таймаута токены не накоплены: следующий запрос ждёт пополнения
+    times = await acquire_times(bucket, 1)
+    assert times[0] >= 0.2 * 0.9
+
+    for _ in range(5):
+        bucket.on_success()
+    assert bucket.rate == 20
+
+
+@pytest.mark.asyncio
+async def test_limit_max_concurrent():
+    bucket = TokenBucket(burst=10, rate=1000, min_rate=1, max_concurrent=2)
+    in_flight = max_in_flight = 0
+
+    async def request():
+        nonlocal in_flight, max_in_flight
+        async with bucket.limit():
+            in_flight += 1
+            max_in_flight = max(max_in_flight, in_flight)
+            await asyncio.sleep(.01)
+            in_flight -= 1
+
+    await asyncio.gather(*(request() for _ in range(6)))
+    assert max_in_flight == 2
+
+
+def test_hosts_rate_limiter():
+    limiter = HostsRateLimiter(burst=1, rate=1, max_concurrent=1)
+    assert limiter.get('10.0.0.1') is limiter.get('10.0.0.1')
+    assert limiter.get('10.0.0.1') is not limiter.get('10.0.0.2')
+    assert len(limiter) == 2
+    limiter.clear()
+    assert len(limiter) == 0
@@ -0,0 +1,108 @@
+import pytest
+
+from sdp_lib.management_controllers.exceptions import BadControllerType
+from sdp_lib.management_controllers.snmp import snmp_utils
+from sdp_lib.management_controllers.snmp.snmp_core import PotokP, Ug405Hosts
+from sdp_lib.management_controllers.snmp.snmp_utils import ScnCache
+
+
+pytest_plugins = ('pytest_asyncio', )
+
+
+ip = '10.179.108.129'
+scn_response = (None, 0, 0, [('1.3.6.1.4.1.13267.3.2.4.1', 'CO3995')])
+timeout_response = ('No SNMP response received before timeout', 0, 0, [])
+bad_controller_response = (None, 2, 1, [])
+
+
+class FakeRequests:
+    """ Подменяет SnmpRequests хоста: отдает ответы по порядку и считает запросы. """
+
+    def __init__(self, *responses):
+        self._responses = list(responses)
+        self.requests = []
+
+    async def snmp_get(self, varbinds):
+        self.requests.append(varbinds)
+        return self._responses.pop(0)
+
+
+@pytest.fixture
+def scn_cache(monkeypatch):
+    cache = ScnCache(ttl=60)
+    monkeypatch.setattr(Ug405Hosts, 'scn_cache', cache)
+    return cache
+
+
+def create_host(*responses) -> PotokP:
+    host = PotokP(ipv4=ip)
+    host._request_sender = FakeRequests(*responses)
+    return host
+
+
+def test_scn_cache_ttl(monkeypatch):
+    now = 1000.
+    monkeypatch.setattr(snmp_utils.time, 'monotonic', lambda: now)
+    cache = ScnCache(ttl=60)
+    cache.add(ip, 'CO3995', '.1.6.67.79.51.57.57.53')
+    now += 60
+    assert cache.get(ip) == ('CO3995', '.1.6.67.79.51.57.57.53')
+    now += .1
+    assert cache.get(ip) is None
+    assert len(cache) == 0
+
+
+@pytest.mark.asyncio
+async def test_scn_request_result_cached(scn_cache):
+    host = create_host(scn_response)
+    await host._get_dependency_data_and_add_error_if_has()
+    assert len(host._request_sender.requests) == 1
+    assert scn_cache.get(ip) == ('CO3995', '.1.6.67.79.51.57.57.53')
+
+
+@pytest.mark.asyncio
+async def test_scn_cache_hit_skips_scn_request(scn_cache):
+    scn_cache.add(ip, 'CO3995', '.1.6.67.79.51.57.57.53')
+    host = create_host()
+    await host._get_dependency_data_and_add_error_if_has()
+    assert host._request_sender.requests == []
+    assert host.scn_as_chars == 'CO3995'
+    assert host.scn_as_ascii_string == '.1.6.67.79.51.57.57.53'
+    assert not host.response_errors
+
+
+@pytest.mark.asyncio
+async def test_scn_not_cached_on_error(scn_cache):
+    host = create_host(timeout_response)
+    await host.get_states()
+    assert host.response_errors
+    assert len(scn_cache) == 0
+
+
+@pytest.mark.asyncio
+async def test_scn_invalidated_on_timeout(scn_cache):
+    scn_cache.add(ip, 'CO3995', '.1.6.67.79.51.57.57.53')
+    host = create_host(timeout_response)
+    await host.get_states()
+    # Запрос scn не отправлялся, отправлен только запрос состояния
+    assert len(host._request_sender.requests) == 1
+    assert host.response_errors
+    assert scn_cache.get(ip) is None
+
+
+@pytest.mark.asyncio
+async def test_scn_invalidated_on_bad_controller_type(scn_cache):
+    scn_cache.add(ip, 'CO3995', '.1.6.67.79.51.57.57.53')
+    host = create_host(bad_controller_response)
+    await host.get_states()
+    assert any(isinstance(err, BadControllerType) for err in host.response_errors)
+    assert scn_cache.get(ip) is None
+
+
+@pytest.mark.asyncio
+async def test_scn_not_cached_without_cache(monkeypatch):
+    monkeypatch.setattr(Ug405Hosts, 'scn_cache', None)
+    host = create_host(scn_response, scn_response)
+    await host._get_dependency_data_and_add_error_if_has()
+    await host._get_dependency_data_and_add_error_if_has()
+    assert len(host._request_sender.requests) == 2
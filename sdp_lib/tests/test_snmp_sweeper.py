@@ -0,0 +1,146 @@
+import asyncio
+import time
+
+import pytest
+
+from sdp_lib.management_controllers.snmp.snmp_sweeper import BulkSnmpSweeper, SubnetRateLimiter
+
+
+pytest_plugins = ('pytest_asyncio', )
+
+
+class FakeHost:
+
+    in_flight = 0
+    max_in_flight = 0
+
+    def __init__(self, ip_v4: str, duration: float = .01):
+        self.ip_v4 = ip_v4
+        self.duration = duration
+        self.start_time = self.finish_time = None
+        self.cancelled = False
+        self.errors = []
+
+    async def get_states(self):
+        cls = type(self)
+        self.start_time = time.monotonic()
+        cls.in_flight += 1
+        cls.max_in_flight = max(cls.max_in_flight, cls.in_flight)
+        try:
+            await asyncio.sleep(self.duration)
+            if self.duration < 0:
+                raise TimeoutError()
+        except asyncio.CancelledError:
+            self.cancelled = True
+            raise
+        finally:
+            cls.in_flight -= 1
+        self.finish_time = time.monotonic()
+        return self
+
+    def add_data_to_data_response_attrs(self, error):
+        self.errors.append(error)
+
+
+def create_fake_hosts(ips: list[str], duration: float = .01) -> list[FakeHost]:
+    FakeHost.in_flight = FakeHost.max_in_flight = 0
+    return [FakeHost(ip, duration) for ip in ips]
+
+
+def create_sweeper(max_concurrent: int, subnet_rate: float = 1000) -> BulkSnmpSweeper:
+    return BulkSnmpSweeper(engine=None, max_concurrent=max_concurrent, subnet_rate=subnet_rate)
+
+
+async def get_start_times(limiter: SubnetRateLimiter, hosts: list[str]) -> dict[str, float]:
+    start_times = {}
+
+    async def wait(ipv4: str):
+        await limiter.wait(ipv4)
+        start_times[ipv4] = time.monotonic()
+
+    await asyncio.gather(*(wait(ipv4) for ipv4 in hosts))
+    return start_times
+
+
+@pytest.mark.asyncio
+async def test_subnet_rate_spacing():
+    limiter = SubnetRateLimiter(rate=20)
+    hosts = [f'10.0.0.{i}' for i in range(1, 6)]
+    start_time = time.monotonic()
+    start_times = await get_start_times(limiter, hosts)
+
+    # Запрос i к подсети начинается не раньше, чем через i интервалов(задержка пробуждения не учитывается)
+    assert all(start_times[ipv4] - start_time >= i * 0.05 * 0.9 for i, ipv4 in enumerate(hosts))
+    assert start_times[hosts[-1]] - start_times[hosts[0]] >= 0.2 * 0.9
+
+
+@pytest.mark.asyncio
+async def test_subnets_are_independent():
+    limiter = SubnetRateLimiter(rate=1)
+    start_time = time.monotonic()
+    await get_start_times(limiter, [f'10.0.{i}.1' for i in range(10)])
+    assert time.monotonic() - start_time < 0.5
+    assert len(limiter) == 10
+
+
+@pytest.mark.asyncio
+async def test_prune_idle_subnets():
+    limiter = SubnetRateLimiter(rate=100, prune_interval=0.05)
+    await get_start_times(limiter, [f'10.0.{i}.1' for i in range(10)])
+    assert len(limiter) == 10
+
+    await asyncio.sleep(0.1)
+    await limiter.wait('10.1.0.1')
+    assert len(limiter) == 1
+
+    limiter.prune(time.monotonic() + 1)
+    assert len(limiter) == 0
+
+
+@pytest.mark.asyncio
+async def test_sweeper_concurrency_cap():
+    hosts = create_fake_hosts([f'10.0.{i}.1' for i in range(50)])
+    swept = [host async for host in create_sweeper(max_concurrent=5).get_states(iter(hosts))]
+    assert len(swept) == 50
+    assert FakeHost.max_in_flight == 5
+
+
+@pytest.mark.asyncio
+async def test_sweeper_subnet_spacing_under_saturation():
+    # Слоты семафора заняты хостами других подсетей: хосты подсети 10.0.0.0/24 начинают
+    # запросы после их освобождения, но не одновременно, а с интервалом подсети
+    hosts = create_fake_hosts([f'10.1.{i}.1' for i in range(3)], duration=.15)
+    hosts += create_fake_hosts([f'10.0.0.{i}' for i in range(1, 4)])
+    sweeper = create_sweeper(max_concurrent=3, subnet_rate=20)
+    [host async for host in sweeper.get_states(hosts)]
+
+    start_times = sorted(host.start_time for host in hosts[3:])
+    assert all(start_times[i] - start_times[0] >= i * 0.05 * 0.9 for i in range(len(start_times)))
+
+
+@pytest.mark.asyncio
+async def test_sweeper_streams_completed_hosts():
+    hosts = create_fake_hosts(['10.0.0.1'], duration=.3) + create_fake_hosts(['10.0.1.1', '10.0.2.1'])
+    sweep = create_sweeper(max_concurrent=3).get_states(hosts)
+    first = await anext(sweep)
+    assert first.ip_v4 in ('10.0.1.1', '10.0.2.1')
+    assert hosts[0].finish_time is None
+    assert [host.ip_v4 async for host in sweep][-1] == '10.0.0.1'
+
+
+@pytest.mark.asyncio
+async def test_sweeper_request_errors():
+    hosts = create_fake_hosts(['10.0.0.1'], duration=-1) + create_fake_hosts(['10.0.1.1'])
+    swept = [host async for host in create_sweeper(max_concurrent=2).get_states(hosts)]
+    assert {host.ip_v4 for host in swept} == {'10.0.0.1', '10.0.1.1'}
+    assert isinstance(hosts[0].errors[0], TimeoutError)
+
+
+@pytest.mark.asyncio
+async def test_sweeper_cancellation():
+    hosts = create_fake_hosts(['10.0.0.1']) + create_fake_hosts([f'10.0.{i}.1' for i in range(1, 4)], duration=5)
+    sweep = create_sweeper(max_concurrent=4).get_states(hosts)
+    assert (await anext(sweep)).ip_v4 == '10.0.0.1'
+    await sweep.aclose()
+    assert all(host.cancelled for host in hosts[1:])
+    assert FakeHost.in_flight == 0
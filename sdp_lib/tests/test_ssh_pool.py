@@ -0,0 +1,107 @@
+import asyncio
+
+import pytest
+
+from sdp_lib.management_controllers.ssh.ssh_pool import SwarcoSshPool
+
+
+pytest_plugins = ('pytest_asyncio', )
+
+
+class FakeSession:
+
+    def __init__(self, ip: str):
+        self.ip = ip
+        self.is_alive = True
+        self.closed = False
+
+    async def close(self):
+        await asyncio.sleep(0)
+        self.closed = True
+
+
+def create_pool(**kwargs) -> tuple[SwarcoSshPool, dict[str, FakeSession]]:
+    pool = SwarcoSshPool(**kwargs)
+    sessions = {}
+
+    def create_session(ip: str) -> FakeSession:
+        sessions[ip] = FakeSession(ip)
+        return sessions[ip]
+
+    pool._create_session = create_session
+    return pool, sessions
+
+
+async def use(pool: SwarcoSshPool, ip: str, release: asyncio.Event = None) -> None:
+    async with pool.acquire(ip):
+        if release is not None:
+            await release.wait()
+
+
+@pytest.mark.asyncio
+async def test_lru_eviction_skips_busy_sessions():
+    pool, sessions = create_pool(max_size=2)
+    await use(pool, '10.0.0.1')
+    await use(pool, '10.0.0.2')
+
+    release = asyncio.Event()
+    busy = asyncio.create_task(use(pool, '10.0.0.1', release))
+    await asyncio.sleep(0)
+
+    await use(pool, '10.0.0.3')
+    assert sessions['10.0.0.2'].closed and not sessions['10.0.0.1'].closed
+    assert '10.0.0.1' in pool and '10.0.0.3' in pool and '10.0.0.2' not in pool
+
+    release.set()
+    await busy
+    assert sorted(pool._locks) == sorted(pool._last_used) == ['10.0.0.1', '10.0.0.3']
+
+
+@pytest.mark.asyncio
+async def test_lru_eviction_all_busy():
+    pool, sessions = create_pool(max_size=1)
+    release = asyncio.Event()
+    busy = asyncio.create_task(use(pool, '10.0.0.1', release))
+    await asyncio.sleep(0)
+
+    await use(pool, '10.0.0.2')
+    assert not sessions['10.0.0.1'].closed
+    assert len(pool) == 2
+
+    release.set()
+    await busy
+
+
+@pytest.mark.asyncio
+async def test_evict_idle_prunes_locks():
+    pool, sessions = create_pool(idle_timeout=0)
+    for i in range(5):
+        await use(pool, f'10.0.0.{i}')
+    await asyncio.sleep(0.01)
+
+    await pool.evict_idle_and_dead()
+    assert len(pool) == 0
+    assert all(session.closed for session in sessions.values())
+    assert pool._locks == pool._last_used == pool._users == {}
+
+
+@pytest.mark.asyncio
+async def test_waiter_keeps_lock_during_evict():
+    pool, sessions = create_pool(idle_timeout=0)
+    await use(pool, '10.0.0.1')
+    await asyncio.sleep(0.01)
+    closing = asyncio.Event()
+    sessions['10.0.0.1'].close = closing.wait
+
+    evict = asyncio.create_task(pool.evict_idle_and_dead())
+    await asyncio.sleep(0)
+    lock = pool._locks['10.0.0.1']
+    waiter = asyncio.create_task(use(pool, '10.0.0.1'))
+    await asyncio.sleep(0)
+    assert pool._users == {'10.0.0.1': 2}
+
+    closing.set()
+    await evict
+    await waiter
+    assert pool._locks['10.0.0.1'] is lock
+    assert '10.0.0.1' in pool and pool._users == {}
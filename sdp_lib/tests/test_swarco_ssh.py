@@ -0,0 +1,171 @@
+import asyncio
+
+import pytest
+
+from sdp_lib.management_controllers.ssh.ssh_core import SwarcoSSH, read_until_prompt
+from sdp_lib.management_controllers.ssh.swarco_terminal import (
+    create_batch_input,
+    ends_with_prompt,
+    get_batch_marker_pattern,
+    get_commands_set_stage,
+    instat102_and_display,
+    is_batch_command,
+    login_commands,
+    split_batch_stdout
+)
+
+
+pytest_plugins = ('pytest_asyncio', )
+
+
+class FakeStream:
+
+    def __init__(self, chunks: list[str], delay: float = 0):
+        self._chunks = list(chunks)
+        self._delay = delay
+
+    async def read(self, bufsize: int) -> str:
+        await asyncio.sleep(self._delay)
+        if not self._chunks:
+            await asyncio.sleep(3600)
+        return self._chunks.pop(0)
+
+
+class FakeDriver:
+
+    def __init__(self):
+        self.sent = []
+
+    async def write_and_read_shell(self, command: str) -> str:
+        self.sent.append(command)
+        return f'{command}\r\nITC&&> '
+
+    async def write_and_read_shell_batch(self, commands: list[str]) -> list[str]:
+        self.sent.append(list(commands))
+        return [f'{command}\r\nITC&&> ' for command in commands]
+
+
+instat102_stdout = [
+    'instat102 ?\r\n',
+    '\r\n     1111111111\r\n 68: 0000000000\r\n\r\n',
+    'ITC&&> ',
+]
+
+batch_commands = ['instat102 ?', 'lang']
+
+batch_stdout = (
+    'instat102 ?\r\n 68: 0000000000\r\n\r\nITC&&> '
+    'ECHO SDPMARK0END\r\nSDPMARK0END\r\nITC&&> '
+    'lang\r\nlang = en, instat102 ?\r\nITC&&> '
+    'ECHO SDPMARK1END\r\nSDPMARK1END\r\nITC&&> '
+)
+
+
+@pytest.mark.parametrize('stdout, expected', [
+    ('instat102 ?\r\n 68: 0000000000\r\n\r\nITC&&> ', True),
+    ('Enter password for level 2> ', True),
+    ('> ', True),
+    ('SIMULATE DISPLAY --poll\r\nSG 1..8: RRGG > ', False),
+    ('ITC&&> instat102 ?\r\n', False),
+])
+def test_ends_with_prompt(stdout, expected):
+    assert ends_with_prompt(stdout) is expected
+
+
+@pytest.mark.asyncio
+async def test_read_until_prompt():
+    stream = FakeStream(instat102_stdout + ['not read'])
+    assert await read_until_prompt(stream, timeout=1) == ''.join(instat102_stdout)
+
+
+@pytest.mark.asyncio
+async def test_read_until_prompt_ignores_prompt_inside_output():
+    chunks = ['SIMULATE DISPLAY --poll\r\nSG 1..8: RRGG > ', 'SG2\r\n', 'ITC&&> ']
+    assert await read_until_prompt(FakeStream(chunks), timeout=1) == ''.join(chunks)
+
+
+@pytest.mark.asyncio
+async def test_read_until_prompt_timeout():
+    stream = FakeStream(['instat102 ?\r\n'])
+    assert await read_until_prompt(stream, timeout=.05) == 'instat102 ?\r\n'
+
+
+@pytest.mark.asyncio
+async def test_read_until_prompt_cancelled():
+    task = asyncio.create_task(read_until_prompt(FakeStream([], delay=1), timeout=5))
+    await asyncio.sleep(.01)
+    task.cancel()
+    with pytest.raises(asyncio.CancelledError):
+        await task
+
+
+@pytest.mark.asyncio
+async def test_read_until_prompt_batch_sentinel():
+    # Эхо команды маркера и приглашение до строки маркера чтение не завершают
+    chunks = [batch_stdout[:112], batch_stdout[112:150], batch_stdout[150:], 'not read']
+    stdout = await read_until_prompt(FakeStream(chunks), timeout=1, sentinel=get_batch_marker_pattern(1))
+    assert stdout == batch_stdout
+
+
+def test_create_batch_input():
+    assert create_batch_input(batch_commands) == 'instat102 ?\nECHO SDPMARK0END\nlang\nECHO SDPMARK1END\n'
+
+
+def test_split_batch_stdout():
+    assert split_batch_stdout(batch_stdout, batch_commands) == [
+        'instat102 ?\r\n 68: 0000000000\r\n\r\nITC&&> ',
+        'lang\r\nlang = en, instat102 ?\r\nITC&&> ',
+    ]
+
+
+def test_split_batch_stdout_command_inside_output():
+    stdout = (
+        'lang = en\r\nITC&&> ECHO SDPMARK0END\r\nSDPMARK0END\r\nITC&&> '
+        'instat102 ?\r\n lang\r\nITC&&> ECHO SDPMARK1END\r\nSDPMARK1END\r\nITC&&> '
+    )
+    assert split_batch_stdout(stdout, ['lang', 'instat102 ?']) == [
+        'lang = en\r\nITC&&> ',
+        'instat102 ?\r\n lang\r\nITC&&> ',
+    ]
+
+
+def test_split_batch_stdout_missing_markers():
+    stdout = 'instat102 ?\r\n 68: 0000000000\r\nITC&&> ECHO SDPMARK0END\r\nlang\r\nlang = en'
+    assert split_batch_stdout(stdout, batch_commands) == [
+        'instat102 ?\r\n 68: 0000000000\r\nITC&&> lang\r\nlang = en', '',
+    ]
+    assert split_batch_stdout('', batch_commands) == ['', '']
+
+
+@pytest.mark.parametrize('command, expected', [
+    ('inp102=1', True),
+    ('inp104=0', True),
+    ('inp102=1\nitc', False),
+    ('instat102 ?', False),
+    ('itc', False),
+    ('SIMULATE DISPLAY --poll', False),
+    ('lang UK', False),
+])
+def test_is_batch_command(command, expected):
+    assert is_batch_command(command) is expected
+
+
+@pytest.mark.asyncio
+async def test_send_group_commands_batches_inputs():
+    host = SwarcoSSH(ip='10.0.0.1', driver=FakeDriver())
+    commands = get_commands_set_stage(2, '0000001010')
+    stdouts = await host._send_group_commands([(command, None) for command in commands])
+    assert host.driver.sent == [commands]
+    assert len(stdouts) == len(commands)
+
+
+@pytest.mark.asyncio
+@pytest.mark.parametrize('group_commands', [
+    instat102_and_display,
+    [(command, None) for command in login_commands],
+    [('inp102=1', None), ('instat102 ?', None)],
+])
+async def test_send_group_commands_one_by_one(group_commands):
+    host = SwarcoSSH(ip='10.0.0.1', driver=FakeDriver())
+    await host._send_group_commands(group_commands)
+    assert host.driver.sent == [command for command, _ in group_commands]
@@ -0,0 +1,100 @@
+import pytest
+from pysnmp.proto.rfc1902 import Integer32, ObjectName, OctetString
+
+from sdp_lib.management_controllers.fields_names import FieldsNames
+from sdp_lib.management_controllers.parsers.snmp_parsers.processing_methods import (
+    build_func_with_remove_scn,
+    get_val_as_str,
+    pretty_print
+)
+from sdp_lib.management_controllers.parsers.snmp_parsers.varbinds_parsers import (
+    BaseSnmpParser,
+    ConfigsParser,
+    ParsersVarbindsPeek,
+    ParsersVarbindsPotokP,
+    ParsersVarbindsPotokS,
+    ParsersVarbindsSwarco
+)
+from sdp_lib.management_controllers.snmp.oids import Oids, oids_state_potok_p
+from sdp_lib.management_controllers.snmp.snmp_utils import (
+    StageConverterMixinUg405,
+    add_scn_to_oids,
+    convert_chars_string_to_ascii_string
+)
+
+
+SCN_AS_ASCII = convert_chars_string_to_ascii_string('CO3995')
+
+# Ответ Поток (P) на запрос get_states: оиды в порядке и виде запроса(scn только у oids_scn_required)
+potok_p_values = {
+    Oids.utcType2OperationMode: Integer32(3),
+    Oids.potokP_utcReplyDarkStatus: Integer32(0),
+    Oids.utcReplyFR: Integer32(0),
+    Oids.utcReplyGn: OctetString(hexValue='04'),
+    Oids.potokP_utcReplyPlanStatus: Integer32(5),
+    Oids.potokP_utcReplyLocalAdaptiv: Integer32(1),
+    Oids.utcType2ScootDetectorCount: Integer32(8),
+    Oids.utcReplyDF: Integer32(0),
+    Oids.utcReplyMC: Integer32(0),
+}
+
+
+def create_potok_p_response() -> list:
+    return [
+        (ObjectName(oid_with_scn), potok_p_values[oid])
+        for oid, oid_with_scn in zip(oids_state_potok_p, add_scn_to_oids(SCN_AS_ASCII, oids_state_potok_p))
+    ]
+
+
+def parse_potok_p(varbinds: list) -> dict:
+    parser = ParsersVarbindsPotokP()
+    parser.parse(
+        varbinds=varbinds,
+        config=ConfigsParser(
+            extras=True,
+            oid_handler=build_func_with_remove_scn(SCN_AS_ASCII, get_val_as_str),
+            val_oid_handler=pretty_print,
+            host_protocol=FieldsNames.protocol_ug405,
+            scn_as_ascii=SCN_AS_ASCII
+        )
+    )
+    return parser.data_for_response
+
+
+def test_operation_mode_without_scn():
+    varbinds = create_potok_p_response()
+    assert str(varbinds[0][0]) == Oids.utcType2OperationMode
+    assert str(varbinds[2][0]) == f'{Oids.utcReplyFR}{SCN_AS_ASCII}'
+
+
+def test_decode_potok_p_response():
+    response = parse_potok_p(create_potok_p_response())
+
+    assert response[FieldsNames.operation_mode] == '3'
+    assert response[FieldsNames.curr_plan] == '5'
+    assert response[FieldsNames.num_detectors] == '8'
+    assert response[FieldsNames.curr_stage] == StageConverterMixinUg405.get_num_stage_from_oid_val(
+        pretty_print(potok_p_values[Oids.utcReplyGn])
+    )
+    fields = {str(field_name) for field_name, _ in ParsersVarbindsPotokP().matches.values()}
+    assert fields <= set(response)
+    assert not [field for field in response if field.startswith('1.')]
+
+
+def test_decoder_slots_with_scn():
+    decoder = ParsersVarbindsPotokP.get_decoder()
+    slots = decoder.get_slots(SCN_AS_ASCII)
+    oid_with_scn = tuple(
+        int(num) for num in add_scn_to_oids(SCN_AS_ASCII, oids_state_potok_p)[0].strip('.').split('.')
+    )
+    assert slots[oid_with_scn][0] == FieldsNames.operation_mode
+    assert len(slots) == len(decoder.get_slots())
+
+
+@pytest.mark.parametrize(
+    'parser_class', [ParsersVarbindsSwarco, ParsersVarbindsPotokS, ParsersVarbindsPotokP, ParsersVarbindsPeek]
+)
+def test_decoder_slots_not_bound_to_instance(parser_class):
+    # Декодер общий для класса: функции обработки не должны ссылаться на экземпляр парсера
+    for _, cb_fn in parser_class.get_decoder().get_slots().values():
+        assert not isinstance(getattr(cb_fn, '__self__', None), BaseSnmpParser)